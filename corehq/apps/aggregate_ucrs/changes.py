@@ -0,0 +1,206 @@
+"""
+This module records which rows of aggregate tables are affected by changes
+to the data sources they aggregate, so that ingestion can update only
+those rows.
+
+When the UCR pillow writes to a data source that an aggregate table uses,
+it reads the aggregate keys of the written rows, before and after writing:
+
+- for the primary data source, the value of its key column
+- for a secondary data source, the value of its join column, and the
+  aggregation window of its time window column
+
+Keys are stored in a Redis set per aggregate table until ingestion pops
+them.
+"""
+import json
+import uuid
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+
+import sqlalchemy
+from dateutil.parser import parse as parse_datetime
+
+from dimagi.utils.chunked import chunked
+from dimagi.utils.couch import get_redis_client
+
+from corehq.apps.aggregate_ucrs.aggregations import (
+    TimePeriodAggregationWindow,
+    get_time_period_class,
+)
+from corehq.apps.aggregate_ucrs.models import AggregateTableDefinition
+from corehq.util.quickcache import quickcache
+
+PRIMARY = 'primary'
+SECONDARY = 'secondary'
+
+# How an aggregate table uses a data source.
+# For the primary data source, key_column is the data source column that
+# identifies aggregate rows. For a secondary data source, key_column is the
+# column joined to the primary table's join_column_primary.
+AggregateSource = namedtuple(
+    'AggregateSource',
+    'table_definition_id role key_column join_column_primary time_window_column aggregation_unit'
+)
+AggregateChanges = namedtuple('AggregateChanges', 'primary_keys secondary_keys_by_window')
+
+
+@quickcache(['data_source_id'], timeout=5 * 60)
+def get_aggregate_sources(data_source_id):
+    try:
+        uuid.UUID(data_source_id)
+    except ValueError:
+        # static data sources can't be used in aggregate tables
+        return []
+
+    sources = []
+    for definition in AggregateTableDefinition.objects.filter(primary_data_source_id=data_source_id):
+        sources.append(AggregateSource(
+            table_definition_id=definition.id,
+            role=PRIMARY,
+            key_column=definition.primary_data_source_key,
+            join_column_primary=None,
+            time_window_column=None,
+            aggregation_unit=None,
+        ))
+    definitions = AggregateTableDefinition.objects.filter(
+        secondary_tables__data_source_id=data_source_id
+    ).distinct().select_related('time_aggregation').prefetch_related('secondary_tables')
+    for definition in definitions:
+        aggregation_unit = (
+            definition.time_aggregation.aggregation_unit if definition.time_aggregation else None
+        )
+        for secondary_table in definition.secondary_tables.all():
+            if secondary_table.data_source_id.hex != uuid.UUID(data_source_id).hex:
+                continue
+            sources.append(AggregateSource(
+                table_definition_id=definition.id,
+                role=SECONDARY,
+                key_column=secondary_table.join_column_secondary,
+                join_column_primary=secondary_table.join_column_primary,
+                time_window_column=secondary_table.time_window_column if aggregation_unit else None,
+                aggregation_unit=aggregation_unit,
+            ))
+    return sources
+
+
+def _get_client():
+    return get_redis_client().client.get_client()
+
+
+def _get_changes_key(table_definition_id):
+    return 'aggregate-ucr-changes-{}'.format(table_definition_id)
+
+
+def _get_window_start(aggregation_unit, value):
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    window = TimePeriodAggregationWindow(get_time_period_class(aggregation_unit), value)
+    return window.start_param
+
+
+def _get_change(source, row):
+    """
+    :return: the aggregate key of the row as a string, or None if the row
+    is not aggregated
+    """
+    key = row[source.key_column]
+    if key is None:
+        return None
+    if source.role == PRIMARY:
+        return json.dumps([PRIMARY, key], default=str)
+
+    window_start = None
+    if source.time_window_column:
+        time_window_value = row[source.time_window_column]
+        if time_window_value is None:
+            return None
+        try:
+            window_start = _get_window_start(source.aggregation_unit, time_window_value)
+        except (ValueError, OverflowError):
+            # not a date, so never in an aggregation window
+            return None
+    return json.dumps([SECONDARY, source.join_column_primary, key, window_start], default=str)
+
+
+def _get_changes(adapter, sources, doc_ids):
+    """
+    :return: a dict of the aggregate keys of the rows of doc_ids in the
+    adapter's table, by aggregate table definition id
+    """
+    table = adapter.get_table()
+    column_ids = {source.key_column for source in sources}
+    column_ids.update(source.time_window_column for source in sources if source.time_window_column)
+    columns = [table.c[column_id] for column_id in sorted(column_ids)]
+
+    changes = defaultdict(set)
+    with adapter.session_context() as session:
+        for chunk in chunked(doc_ids, 1000):
+            query = sqlalchemy.select(columns).distinct().where(table.c.doc_id.in_(chunk))
+            for row in session.execute(query):
+                for source in sources:
+                    change = _get_change(source, row)
+                    if change is not None:
+                        changes[source.table_definition_id].add(change)
+    return changes
+
+
+@contextmanager
+def record_aggregate_changes(adapter, doc_ids):
+    """
+    Records the aggregate rows affected by writing the rows of doc_ids
+    to the adapter's table within this context
+    """
+    sources = get_aggregate_sources(adapter.config._id)
+    doc_ids = list(doc_ids)
+    if not sources or not doc_ids:
+        yield
+        return
+
+    before = _get_changes(adapter, sources, doc_ids)
+    yield
+    after = _get_changes(adapter, sources, doc_ids)
+
+    pipeline = _get_client().pipeline(transaction=False)
+    for table_definition_id in set(before) | set(after):
+        changes = before.get(table_definition_id, set()) | after.get(table_definition_id, set())
+        if changes:
+            pipeline.sadd(_get_changes_key(table_definition_id), *changes)
+    pipeline.execute()
+
+
+@contextmanager
+def pop_aggregate_changes(table_definition_id):
+    """
+    Pops the changes recorded for an aggregate table. If the context
+    raises an exception, the changes are restored.
+
+    Yields AggregateChanges, where primary_keys is a set of primary key
+    values, and secondary_keys_by_window is a dict of the values of
+    primary join columns, by (join column, window start)
+    """
+    key = _get_changes_key(table_definition_id)
+    pipeline = _get_client().pipeline()
+    pipeline.smembers(key)
+    pipeline.delete(key)
+    members, __ = pipeline.execute()
+
+    primary_keys = set()
+    secondary_keys_by_window = defaultdict(set)
+    for member in members:
+        change = json.loads(member)
+        if change[0] == PRIMARY:
+            primary_keys.add(change[1])
+        else:
+            __, join_column_primary, value, window_start = change
+            if window_start is not None:
+                window_start = datetime.strptime(window_start, '%Y-%m-%d')
+            secondary_keys_by_window[(join_column_primary, window_start)].add(value)
+
+    try:
+        yield AggregateChanges(primary_keys, secondary_keys_by_window)
+    except Exception:
+        if members:
+            _get_client().sadd(key, *members)
+        raise
@@ -7,12 +7,15 @@ from datetime import datetime
 import sqlalchemy
 from sqlalchemy.dialects.postgresql import insert
 
+from dimagi.utils.chunked import chunked
+
 from corehq.apps.aggregate_ucrs.aggregations import (
     AGG_WINDOW_END_PARAM,
     AGG_WINDOW_START_PARAM,
     TimePeriodAggregationWindow,
     get_time_period_class,
 )
+from corehq.apps.aggregate_ucrs.changes import pop_aggregate_changes
 from corehq.apps.userreports.util import get_indicator_adapter
 
 AggregationParam = namedtuple('AggregationParam', 'name value mapped_column_id')
@@ -32,6 +35,43 @@ def populate_aggregate_table_data(aggregate_table_adapter):
         )
 
 
+def populate_aggregate_table_data_for_changes(aggregate_table_adapter):
+    """
+    Updates the rows of the aggregate table affected by the changes to its
+    data sources that were recorded by the UCR pillow.
+
+    All the windows of changed rows of the primary data source are updated.
+    Changed rows of secondary data sources only update their window.
+    """
+    aggregate_table_definition = aggregate_table_adapter.config
+    primary_table = get_indicator_adapter(aggregate_table_definition.data_source).get_table()
+    primary_key_column_id = aggregate_table_definition.primary_data_source_key
+
+    def _populate_all_windows(primary_filter):
+        windows = get_time_aggregation_windows(aggregate_table_definition, None, primary_filter)
+        for window in windows:
+            populate_aggregate_table_data_for_time_period(aggregate_table_adapter, window, primary_filter)
+
+    with pop_aggregate_changes(aggregate_table_definition.id) as changes:
+        for keys in chunked(changes.primary_keys, 1000):
+            _populate_all_windows(primary_table.c[primary_key_column_id].in_(keys))
+
+        for (join_column_primary, window_start), keys in changes.secondary_keys_by_window.items():
+            if join_column_primary == primary_key_column_id:
+                # all their windows have been updated already
+                keys = keys - changes.primary_keys
+            for chunk in chunked(keys, 1000):
+                primary_filter = primary_table.c[join_column_primary].in_(chunk)
+                if aggregate_table_definition.time_aggregation is None:
+                    populate_aggregate_table_data_for_time_period(aggregate_table_adapter, None, primary_filter)
+                elif window_start is None:
+                    # recorded before the table had time aggregation
+                    _populate_all_windows(primary_filter)
+                else:
+                    window = _get_aggregation_window(aggregate_table_definition, window_start)
+                    populate_aggregate_table_data_for_time_period(aggregate_table_adapter, window, primary_filter)
+
+
 def get_last_aggregate_checkpoint(aggregate_table_definition):
     """
     Checkpoints indicate the last time the aggregation script successfully ran.
@@ -41,47 +81,62 @@ def get_last_aggregate_checkpoint(aggregate_table_definition):
     return None
 
 
-def get_time_aggregation_windows(aggregate_table_definition, last_update):
+def get_time_aggregation_windows(aggregate_table_definition, last_update, primary_filter=None):
     if aggregate_table_definition.time_aggregation is None:
         # if there is no time aggregation just include a single window with no value
         yield None
     else:
-        start_time = get_aggregation_start_period(aggregate_table_definition, last_update)
-        end_time = get_aggregation_end_period(aggregate_table_definition, last_update)
+        start_time = get_aggregation_start_period(aggregate_table_definition, last_update, primary_filter)
+        if start_time is None:
+            # no rows to aggregate
+            return
+        end_time = get_aggregation_end_period(aggregate_table_definition, last_update, primary_filter)
         period_class = get_time_period_class(aggregate_table_definition.time_aggregation.aggregation_unit)
         current_window = TimePeriodAggregationWindow(period_class, start_time)
         end_window = TimePeriodAggregationWindow(period_class, end_time)
         while current_window <= end_window:
-            yield AggregationWindow(
-                start=AggregationParam(
-                    name=AGG_WINDOW_START_PARAM,
-                    value=current_window.start_param,
-                    mapped_column_id=aggregate_table_definition.time_aggregation.start_column
-                ),
-                end=AggregationParam(
-                    name=AGG_WINDOW_END_PARAM,
-                    value=current_window.end_param,
-                    mapped_column_id=aggregate_table_definition.time_aggregation.end_column
-                )
-            )
+            yield _get_aggregation_window(aggregate_table_definition, current_window.start)
             current_window = current_window.next_window()
 
 
-def get_aggregation_start_period(aggregate_table_definition, last_update=None):
+def _get_aggregation_window(aggregate_table_definition, window_datetime):
+    """
+    :return: the AggregationWindow that includes window_datetime
+    """
+    time_aggregation = aggregate_table_definition.time_aggregation
+    period_class = get_time_period_class(time_aggregation.aggregation_unit)
+    window = TimePeriodAggregationWindow(period_class, window_datetime)
+    return AggregationWindow(
+        start=AggregationParam(
+            name=AGG_WINDOW_START_PARAM,
+            value=window.start_param,
+            mapped_column_id=time_aggregation.start_column
+        ),
+        end=AggregationParam(
+            name=AGG_WINDOW_END_PARAM,
+            value=window.end_param,
+            mapped_column_id=time_aggregation.end_column
+        )
+    )
+
+
+def get_aggregation_start_period(aggregate_table_definition, last_update=None, primary_filter=None):
     return _get_aggregation_from_primary_table(
         aggregate_table_definition=aggregate_table_definition,
         column_id=aggregate_table_definition.time_aggregation.start_column,
         sqlalchemy_agg_fn=sqlalchemy.func.min,
         last_update=last_update,
+        primary_filter=primary_filter,
     )
 
 
-def get_aggregation_end_period(aggregate_table_definition, last_update=None):
+def get_aggregation_end_period(aggregate_table_definition, last_update=None, primary_filter=None):
     value_from_db = _get_aggregation_from_primary_table(
         aggregate_table_definition=aggregate_table_definition,
         column_id=aggregate_table_definition.time_aggregation.end_column,
         sqlalchemy_agg_fn=sqlalchemy.func.max,
         last_update=last_update,
+        primary_filter=primary_filter,
     )
     if not value_from_db:
         return datetime.utcnow()
@@ -89,20 +144,26 @@ def get_aggregation_end_period(aggregate_table_definition, last_update=None):
         return max(value_from_db, datetime.utcnow())
 
 
-def _get_aggregation_from_primary_table(aggregate_table_definition, column_id, sqlalchemy_agg_fn, last_update):
+def _get_aggregation_from_primary_table(aggregate_table_definition, column_id, sqlalchemy_agg_fn, last_update,
+                                        primary_filter=None):
     primary_data_source = aggregate_table_definition.data_source
     primary_data_source_adapter = get_indicator_adapter(primary_data_source)
     with primary_data_source_adapter.session_helper.session_context() as session:
         primary_table = primary_data_source_adapter.get_table()
         aggregation_sql_column = primary_table.c[column_id]
         query = session.query(sqlalchemy_agg_fn(aggregation_sql_column))
+        if primary_filter is not None:
+            query = query.filter(primary_filter)
         return session.execute(query).scalar()
 
 
-def populate_aggregate_table_data_for_time_period(aggregate_table_adapter, window):
+def populate_aggregate_table_data_for_time_period(aggregate_table_adapter, window, primary_filter=None):
     """
     For a given period (start/end) - populate all data in the aggregate table associated
     with that period.
+
+    :param primary_filter: A filter on the primary table, to populate only
+    the data of some of its rows
     """
     doing_time_aggregation = window is not None
     if doing_time_aggregation:
@@ -158,6 +219,9 @@ def populate_aggregate_table_data_for_time_period(aggregate_table_adapter, windo
             sqlalchemy.or_(primary_table.c[window.end.mapped_column_id] == None,  # noqa this is sqlalchemy
                            primary_table.c[window.end.mapped_column_id] >= window.start.value))
 
+    if primary_filter is not None:
+        select_statement = select_statement.where(primary_filter)
+
     for primary_column_adapter in primary_column_adapters:
         if primary_column_adapter.is_groupable():
             select_statement = select_statement.group_by(
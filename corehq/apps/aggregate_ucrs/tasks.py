@@ -1,6 +1,12 @@
-from celery.task import task
+from django.conf import settings
 
-from corehq.apps.aggregate_ucrs.ingestion import populate_aggregate_table_data
+from celery.schedules import crontab
+from celery.task import periodic_task, task
+
+from corehq.apps.aggregate_ucrs.ingestion import (
+    populate_aggregate_table_data,
+    populate_aggregate_table_data_for_changes,
+)
 from corehq.apps.aggregate_ucrs.models import AggregateTableDefinition
 from corehq.apps.userreports.const import UCR_CELERY_QUEUE
 from corehq.apps.userreports.util import get_indicator_adapter
@@ -10,3 +16,15 @@ from corehq.apps.userreports.util import get_indicator_adapter
 def populate_aggregate_table_data_task(aggregate_table_id):
     definition = AggregateTableDefinition.objects.get(id=aggregate_table_id)
     return populate_aggregate_table_data(get_indicator_adapter(definition))
+
+
+@task(serializer='pickle', queue=UCR_CELERY_QUEUE, ignore_result=True)
+def populate_aggregate_table_data_for_changes_task(aggregate_table_id):
+    definition = AggregateTableDefinition.objects.get(id=aggregate_table_id)
+    return populate_aggregate_table_data_for_changes(get_indicator_adapter(definition))
+
+
+@periodic_task(run_every=crontab(minute=0, hour=0), queue=settings.CELERY_PERIODIC_QUEUE)
+def populate_aggregate_tables_for_changes():
+    for aggregate_table_id in AggregateTableDefinition.objects.values_list('id', flat=True):
+        populate_aggregate_table_data_for_changes_task.delay(aggregate_table_id)
@@ -12,6 +12,10 @@ from casexml.apps.case.util import post_case_blocks
 from corehq.apps.aggregate_ucrs.aggregations import (
     AGGREGATION_UNIT_CHOICE_WEEK,
 )
+from corehq.apps.aggregate_ucrs.changes import (
+    pop_aggregate_changes,
+    record_aggregate_changes,
+)
 from corehq.apps.aggregate_ucrs.importer import (
     import_aggregation_models_from_spec,
 )
@@ -19,6 +23,7 @@ from corehq.apps.aggregate_ucrs.ingestion import (
     get_aggregation_end_period,
     get_aggregation_start_period,
     populate_aggregate_table_data,
+    populate_aggregate_table_data_for_changes,
 )
 from corehq.apps.aggregate_ucrs.models import AggregateTableDefinition
 from corehq.apps.aggregate_ucrs.tests.base import AggregationBaseTestMixin
@@ -312,6 +317,24 @@ class UCRAggregationTest(TestCase, AggregationBaseTestMixin):
         populate_aggregate_table_data(aggregate_table_adapter)
         self._check_monthly_results()
 
+    def test_monthly_aggregation_for_changes(self):
+        aggregate_table_adapter = self.monthly_adapter
+        aggregate_table_adapter.rebuild_table()
+
+        # record all rows of the primary and secondary data sources as changed
+        for adapter in [self.case_adapter, self.form_adapter, self.parent_case_adapter]:
+            doc_ids = [row.doc_id for row in adapter.get_query_object()]
+            with record_aggregate_changes(adapter, doc_ids):
+                pass
+
+        populate_aggregate_table_data_for_changes(aggregate_table_adapter)
+        self._check_monthly_results()
+
+        # the changes are only aggregated once
+        with pop_aggregate_changes(self.monthly_aggregate_table_definition.id) as changes:
+            self.assertEqual(set(), changes.primary_keys)
+            self.assertEqual({}, changes.secondary_keys_by_window)
+
     def _check_monthly_results(self):
         aggregate_table_adapter = self.monthly_adapter
         aggregate_table = aggregate_table_adapter.get_table()
@@ -86,3 +86,7 @@ REGISTRATION_FORM_WORFLOWS = [
     WORKFLOW_DEFAULT,
     WORKFLOW_CASE_LIST,
 ]
+
+# Build profiles missing from a build are generated in parallel celery
+# tasks, each generating this many profiles
+BUILD_PROFILES_PER_TASK = 2
@@ -161,7 +161,10 @@ from corehq.apps.linked_domain.applications import (
     get_master_app_briefs,
 )
 from corehq.apps.linked_domain.exceptions import ActionNotPermitted
-from corehq.apps.locations.models import SQLLocation
+from corehq.apps.locations.models import (
+    LocationFixtureConfiguration,
+    SQLLocation,
+)
 from corehq.apps.reports.daterange import (
     get_daterange_start_end_dates,
     get_simple_dateranges,
@@ -198,6 +201,28 @@ ANDROID_LOGO_PROPERTY_MAPPING = {
 LATEST_APK_VALUE = 'latest'
 LATEST_APP_VALUE = 0
 
+# Rendered xforms are cached between builds, keyed by a hash of everything
+# they are generated from. Increment this when the code that renders
+# xforms changes, to stop using xforms rendered by the old code.
+XFORM_BUILD_CACHE_VERSION = 1
+XFORM_BUILD_CACHE_TIMEOUT = 24 * 60 * 60
+# App properties that change from build to build, but that are not used
+# to render xforms
+_BUILD_STRUCTURE_IGNORED_KEYS = (
+    '_id', '_rev', '_attachments', 'external_blobs', 'version', 'copy_of',
+    'built_on', 'built_with', 'date_created', 'last_modified', 'build_comment',
+    'comment_from', 'is_released', 'multimedia_map', 'short_url', 'short_odk_url',
+    'short_odk_media_url', 'recipients',
+)
+# Toggles that change how xforms are rendered
+_XFORM_BUILD_TOGGLES = (
+    toggles.DONT_INDEX_SAME_CASETYPE,
+    toggles.MM_CASE_PROPERTIES,
+    toggles.MOBILE_UCR,
+    toggles.HIERARCHICAL_LOCATION_FIXTURE,
+    toggles.RELATED_LOCATIONS,
+)
+
 
 def jsonpath_update(datum_context, value):
     field = datum_context.path.fields[0]
@@ -4757,6 +4782,62 @@ class Application(ApplicationBase, ApplicationMediaMixin, ApplicationIntegration
             form = self.get_module(module_id).get_form(form_id)
         return form.validate_form().render_xform(build_profile_id)
 
+    def _get_build_structure_hash(self):
+        """
+        Returns a hash of the app, ignoring the properties that change from
+        build to build, and form versions, which are set while building.
+        Form sources are attachments, and are not included.
+
+        The domain's toggles and settings that change how xforms are
+        rendered are included.
+        """
+        app_json = {
+            key: value for key, value in self.to_json().items()
+            if key not in _BUILD_STRUCTURE_IGNORED_KEYS
+        }
+        app_json['_domain_settings'] = {
+            'toggles': {toggle.slug: toggle.enabled(self.domain) for toggle in _XFORM_BUILD_TOGGLES},
+            'sync_flat_location_fixture': LocationFixtureConfiguration.for_domain(self.domain).sync_flat_fixture,
+        }
+        app_json['modules'] = [
+            dict(module, forms=[
+                {key: value for key, value in form.items() if key != 'version'}
+                for form in module.get('forms', [])
+            ])
+            for module in app_json.get('modules', [])
+        ]
+        return hashlib.md5(json.dumps(app_json, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _get_xform_build_cache_key(self, form, build_profile_id, structure_hash):
+        key = json.dumps([
+            XFORM_BUILD_CACHE_VERSION,
+            self.domain,
+            structure_hash,
+            form.unique_id,
+            form.get_version(),
+            build_profile_id,
+            hashlib.md5(form.source.encode('utf-8')).hexdigest(),
+        ])
+        return 'app-build-xform-{}'.format(hashlib.md5(key.encode('utf-8')).hexdigest())
+
+    def fetch_xform_for_build(self, form, build_profile_id=None, structure_hash=None):
+        """
+        Like fetch_xform(), but reuses the xform rendered by an earlier
+        build if the form, its app and its version have not changed
+
+        :param structure_hash: The result of _get_build_structure_hash(),
+        if the caller is fetching more than one xform
+        """
+        form.validate_form()
+        if structure_hash is None:
+            structure_hash = self._get_build_structure_hash()
+        cache_key = self._get_xform_build_cache_key(form, build_profile_id, structure_hash)
+        xform = cache.get(cache_key)
+        if xform is None:
+            xform = form.render_xform(build_profile_id)
+            cache.set(cache_key, xform, XFORM_BUILD_CACHE_TIMEOUT)
+        return xform
+
     def set_form_versions(self):
         """
         Set the 'version' property on each form as follows to the current app version if the form is new
@@ -4769,6 +4850,7 @@ class Application(ApplicationBase, ApplicationMediaMixin, ApplicationIntegration
         if not latest_build:
             return
         force_new_version = self.build_profiles != latest_build.build_profiles
+        structure_hash = self._get_build_structure_hash()
         for form_stuff in self.get_forms(bare=False):
             filename = 'files/%s' % self.get_form_filename(**form_stuff)
             form = form_stuff["form"]
@@ -4787,7 +4869,7 @@ class Application(ApplicationBase, ApplicationMediaMixin, ApplicationIntegration
                     # so that that's not treated as the diff
                     previous_form_version = previous_form.get_version()
                     form.version = previous_form_version
-                    my_hash = _hash(self.fetch_xform(form=form))
+                    my_hash = _hash(self.fetch_xform_for_build(form, structure_hash=structure_hash))
                     if previous_hash != my_hash:
                         form.version = None
             else:
@@ -5018,13 +5100,25 @@ class Application(ApplicationBase, ApplicationMediaMixin, ApplicationIntegration
     @time_method()
     def _make_language_files(self, prefix, build_profile_id):
         return {
-            "{}{}/app_strings.txt".format(prefix, lang): self.create_app_strings(lang, build_profile_id).encode('utf-8')
+            "{}{}/app_strings.txt".format(prefix, lang): self._create_app_strings_for_build(lang, build_profile_id)
             for lang in ['default'] + self.get_build_langs(build_profile_id)
         }
 
+    def _create_app_strings_for_build(self, lang, build_profile_id):
+        # Only the default strings depend on the build profile. The others
+        # are shared by all the build profiles of a build.
+        if lang != 'default':
+            build_profile_id = None
+        return self._get_app_strings_for_build(lang, build_profile_id)
+
+    @memoized
+    def _get_app_strings_for_build(self, lang, build_profile_id):
+        return self.create_app_strings(lang, build_profile_id).encode('utf-8')
+
     @time_method()
     def _get_form_files(self, prefix, build_profile_id):
         files = {}
+        structure_hash = self._get_build_structure_hash()
         for form_stuff in self.get_forms(bare=False):
             def exclude_form(form):
                 return isinstance(form, ShadowForm) or form.is_a_disabled_release_form()
@@ -5033,7 +5127,7 @@ class Application(ApplicationBase, ApplicationMediaMixin, ApplicationIntegration
                 filename = prefix + self.get_form_filename(**form_stuff)
                 form = form_stuff['form']
                 try:
-                    files[filename] = self.fetch_xform(form=form, build_profile_id=build_profile_id)
+                    files[filename] = self.fetch_xform_for_build(form, build_profile_id, structure_hash)
                 except XFormValidationFailed:
                     raise XFormException(_('Unable to validate the forms due to a server error. '
                                            'Please try again later.'))
@@ -1,8 +1,14 @@
 from django.utils.translation import ugettext as _
 
+from celery import group
 from celery.task import task
 from celery.utils.log import get_task_logger
+from couchdbkit.exceptions import ResourceConflict
 
+from dimagi.utils.chunked import chunked
+from dimagi.utils.couch import CriticalSection
+
+from corehq.apps.app_manager.const import BUILD_PROFILES_PER_TASK
 from corehq.apps.app_manager.dbaccessors import (
     get_app,
     get_auto_generated_built_apps,
@@ -55,14 +61,55 @@ def autogenerate_build_task(app_id, domain, version, comment):
 @task(serializer='pickle', queue='background_queue', ignore_result=True)
 def create_build_files_for_all_app_profiles(domain, build_id):
     app = get_app(domain, build_id)
-    build_profiles = app.build_profiles
-    save_app = False
-    for profile in build_profiles:
-        if not app.has_attachment('files/{id}/profile.xml'.format(id=profile)):
-            app.create_build_files(build_profile_id=profile)
-            save_app = True
-    if save_app:
+    build_profile_ids = [
+        profile for profile in app.build_profiles
+        if not app.has_attachment('files/{id}/profile.xml'.format(id=profile))
+    ]
+    if len(build_profile_ids) <= BUILD_PROFILES_PER_TASK:
+        for build_profile_id in build_profile_ids:
+            app.create_build_files(build_profile_id=build_profile_id)
+        if build_profile_ids:
+            app.save()
+        return
+
+    # Each build profile is generated independently of the others, so
+    # generate them in parallel
+    group(
+        create_build_files_for_app_profiles.s(domain, build_id, list(chunk))
+        for chunk in chunked(build_profile_ids, BUILD_PROFILES_PER_TASK)
+    ).delay()
+
+
+@task(serializer='pickle', queue='background_queue', ignore_result=True)
+def create_build_files_for_app_profiles(domain, build_id, build_profile_ids):
+    """
+    Generates the build files of build_profile_ids, and saves them to the
+    build. Tasks for other build profiles of the same build save theirs
+    in turn.
+    """
+    app = get_app(domain, build_id)
+    files = {}
+    for build_profile_id in build_profile_ids:
+        for filepath, content in app.create_all_files(build_profile_id).items():
+            files['files/%s' % filepath] = content
+    with CriticalSection(['create_build_files_for_app_profiles_' + build_id], timeout=5 * 60):
+        _save_build_files(domain, build_id, files)
+
+
+def _save_build_files(domain, build_id, files, is_retry=False):
+    app = get_app(domain, build_id)
+    # Form and media versions are set as a side effect of creating build
+    # files. Set them here too, so that they are saved with the files.
+    app.set_form_versions()
+    app.set_media_versions()
+    for name, content in files.items():
+        app.lazy_put_attachment(content, name)
+    try:
         app.save()
+    except ResourceConflict:
+        if is_retry:
+            raise
+        _save_build_files(domain, build_id, files, is_retry=True)
 
 
 @task(serializer='pickle', queue='background_queue')
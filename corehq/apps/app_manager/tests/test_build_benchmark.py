@@ -0,0 +1,94 @@
+"""
+Benchmark for building the files of a large app.
+
+The test checks that a build that reuses cached xforms gives the same
+files as a build that renders every xform, and that only changed forms
+are rendered again. To see timings, run ``run_benchmark()`` from
+``./manage.py shell``:
+
+    from corehq.apps.app_manager.tests.test_build_benchmark import run_benchmark
+    run_benchmark()
+"""
+import timeit
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from mock import patch
+
+from corehq.apps.app_manager.models import Application, Form
+from corehq.apps.app_manager.tests.app_factory import AppFactory
+from corehq.apps.app_manager.xform_builder import XFormBuilder
+from corehq.util.test_utils import flag_enabled
+
+
+def _get_app(num_modules=80, forms_per_module=5, questions_per_form=20):
+    factory = AppFactory(build_version='2.40.0', domain='build-benchmark')
+    for m in range(num_modules):
+        module, form = factory.new_basic_module('module{}'.format(m), 'case{}'.format(m))
+        forms = [form] + [factory.new_form(module) for f in range(forms_per_module - 1)]
+        for f, form in enumerate(forms):
+            builder = XFormBuilder('Form {} {}'.format(m, f))
+            for q in range(questions_per_form):
+                builder.new_question(name='q{}'.format(q), label='Question {}'.format(q))
+            form.source = builder.tostring(pretty_print=True).decode('utf-8')
+            if f == 0:
+                factory.form_opens_case(form)
+            else:
+                factory.form_requires_case(form)
+    return factory.app
+
+
+def _build(app):
+    # create_all_files is memoized, so build from a fresh copy
+    copy = Application.wrap(app.to_json())
+    copy._LAZY_ATTACHMENTS = dict(app._LAZY_ATTACHMENTS)
+    return copy.create_all_files()
+
+
+def _uncached_build(app):
+    with patch('corehq.apps.app_manager.models.cache.get', return_value=None):
+        return _build(app)
+
+
+def run_benchmark(num_modules=80, forms_per_module=5):
+    app = _get_app(num_modules, forms_per_module)
+    with patch('corehq.apps.app_manager.models.validate_xform', return_value=None):
+        uncached = timeit.timeit(lambda: _uncached_build(app), number=1)
+        _build(app)
+        cached = timeit.timeit(lambda: _build(app), number=1)
+    print("{} modules, {} forms".format(num_modules, num_modules * forms_per_module))
+    print("render every xform: {:.3f}s".format(uncached))
+    print("cached xforms:      {:.3f}s".format(cached))
+
+
+@patch('corehq.apps.app_manager.models.validate_xform', return_value=None)
+class BuildBenchmarkTest(TestCase):
+
+    def setUp(self):
+        self.app = _get_app(num_modules=3, forms_per_module=2, questions_per_form=3)
+        self.addCleanup(cache.clear)
+
+    def test_cached_build_matches(self, *args):
+        uncached = _uncached_build(self.app)
+        _build(self.app)
+        self.assertEqual(_build(self.app), uncached)
+
+    def test_only_changed_forms_are_rendered(self, *args):
+        _build(self.app)
+        form = self.app.get_module(1).get_form(0)
+        builder = XFormBuilder(source=form.source)
+        builder.new_question(name='changed', label='Changed')
+        form.source = builder.tostring(pretty_print=True).decode('utf-8')
+
+        with patch.object(Form, 'render_xform', autospec=True, side_effect=Form.render_xform) as render_xform:
+            files = _build(self.app)
+        self.assertEqual([call[0][0].unique_id for call in render_xform.call_args_list], [form.unique_id])
+        self.assertIn(b'changed', files['modules-1/forms-0.xml'])
+
+    def test_toggle_change_renders_again(self, *args):
+        _build(self.app)
+        with flag_enabled('MM_CASE_PROPERTIES'), \
+                patch.object(Form, 'render_xform', autospec=True, side_effect=Form.render_xform) as render_xform:
+            _build(self.app)
+        self.assertEqual(render_xform.call_count, len(list(self.app.get_forms())))
@@ -0,0 +1,60 @@
+from collections import OrderedDict
+
+from django.test import TestCase
+
+from mock import patch
+
+from corehq.apps.app_manager.dbaccessors import get_app
+from corehq.apps.app_manager.models import BuildProfile
+from corehq.apps.app_manager.tasks import create_build_files_for_all_app_profiles
+
+from .app_factory import AppFactory
+from .util import TestXmlMixin
+
+
+@patch('corehq.apps.app_manager.models.ApplicationBase.get_latest_build', lambda _: None)
+@patch('corehq.apps.app_manager.models.validate_xform', return_value=None)
+class CreateBuildFilesForAllAppProfilesTest(TestCase, TestXmlMixin):
+    file_path = ('data',)
+    domain = 'build-profiles-task'
+
+    def setUp(self):
+        factory = AppFactory(build_version='2.40.0', domain=self.domain)
+        for slug in ['register', 'followup']:
+            module, form = factory.new_basic_module(slug, 'case')
+            form.source = self.get_xml('very_simple_form').decode('utf-8')
+        self.app = factory.app
+        self.app.langs = ['en', 'fra', 'hin']
+        self.app.build_profiles = OrderedDict([
+            ('en', BuildProfile(langs=['en'], name='en-profile')),
+            ('fra', BuildProfile(langs=['fra'], name='fra-profile')),
+            ('hin', BuildProfile(langs=['hin'], name='hin-profile')),
+            ('all', BuildProfile(langs=['en', 'fra', 'hin'], name='all-profile')),
+            ('en-fra', BuildProfile(langs=['en', 'fra'], name='en-fra-profile')),
+        ])
+        self.app.save()
+        self.addCleanup(self.app.delete)
+
+    def _get_files(self, app):
+        return {
+            name: app.lazy_fetch_attachment(name)
+            for name in app.blobs
+            if name.startswith('files/')
+        }
+
+    def test_matches_sequential_build(self, *args):
+        expected = get_app(self.domain, self.app._id)
+        expected_files = {
+            'files/%s' % name: content
+            for build_profile_id in expected.build_profiles
+            for name, content in expected.create_all_files(build_profile_id).items()
+        }
+
+        create_build_files_for_all_app_profiles(self.domain, self.app._id)
+
+        files = self._get_files(get_app(self.domain, self.app._id))
+        self.assertEqual(set(files), set(expected_files))
+        for name, content in expected_files.items():
+            if isinstance(content, str):
+                content = content.encode('utf-8')
+            self.assertEqual(files[name], content, name)
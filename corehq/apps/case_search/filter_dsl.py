@@ -1,9 +1,16 @@
 import re
+from functools import lru_cache
 
 from django.utils.translation import ugettext as _
 
 from eulxml.xpath import parse as parse_xpath
-from eulxml.xpath.ast import FunctionCall, Step, UnaryExpression, serialize
+from eulxml.xpath.ast import (
+    BinaryExpression,
+    FunctionCall,
+    Step,
+    UnaryExpression,
+    serialize,
+)
 
 from corehq.apps.case_search.xpath_functions import (
     XPATH_FUNCTIONS,
@@ -68,6 +75,67 @@ NEQ = "!="
 
 ALL_OPERATORS = [EQ, NEQ] + list(OPERATOR_MAPPING.keys()) + list(COMPARISON_MAPPING.keys())
 
+# Number of parsed XPath templates to keep per process
+XPATH_TEMPLATE_CACHE_SIZE = 1000
+
+# XPath string literals can't contain escaped quotes
+STRING_LITERAL = re.compile(r"'[^']*'|\"[^\"]*\"")
+
+
+def parse_xpath_with_cache(xpath):
+    """Parse an XPath expression, reusing the parsed AST of earlier expressions
+    that differ only in their string literals
+
+    Case searches from the same app repeat the same expression with different
+    values, e.g. ``name = 'farid'`` and ``name = 'leila'``. The string literals
+    are replaced by numbered slots, the resulting template is parsed once and
+    the values are put back into a copy of the template AST.
+    """
+    values = []
+
+    def _make_slot(match):
+        values.append(match.group()[1:-1])
+        return "'{}'".format(len(values) - 1)
+
+    try:
+        template_ast = _parse_xpath_template(STRING_LITERAL.sub(_make_slot, xpath))
+    except (TypeError, RuntimeError):
+        # parse the original expression so that errors refer to it
+        return parse_xpath(xpath)
+
+    filled_slots = set()
+    node = _fill_slots(template_ast, values, filled_slots)
+    if len(filled_slots) != len(values):
+        # literals in parts of the expression that aren't copied, e.g. predicates
+        return parse_xpath(xpath)
+    return node
+
+
+@lru_cache(maxsize=XPATH_TEMPLATE_CACHE_SIZE)
+def _parse_xpath_template(template):
+    return parse_xpath(template)
+
+
+def _fill_slots(node, values, filled_slots):
+    """Returns a copy of the template AST with the slots replaced by their values
+    """
+    if isinstance(node, str):
+        filled_slots.add(node)
+        return values[int(node)]
+    if isinstance(node, BinaryExpression):
+        return BinaryExpression(
+            _fill_slots(node.left, values, filled_slots),
+            node.op,
+            _fill_slots(node.right, values, filled_slots),
+        )
+    if isinstance(node, UnaryExpression):
+        return UnaryExpression(node.op, _fill_slots(node.right, values, filled_slots))
+    if isinstance(node, FunctionCall):
+        return FunctionCall(node.prefix, node.name, [
+            _fill_slots(arg, values, filled_slots) for arg in node.args
+        ])
+    return node
+
 
 def build_filter_from_ast(domain, node):
     """Builds an ES filter from an AST provided by eulxml.xpath.parse
@@ -165,13 +233,15 @@ def build_filter_from_ast(domain, node):
         except XPathFunctionException as e:
             raise CaseFilterError(str(e), serialize(node))
 
+    def _is_property_equality(node):
+        acceptable_rhs_types = (int, str, float, FunctionCall, UnaryExpression)
+        return isinstance(node.left, Step) and isinstance(node.right, acceptable_rhs_types)
+
     def _equality(node):
         """Returns the filter for an equality operation (=, !=)
 
         """
-        acceptable_rhs_types = (int, str, float, FunctionCall, UnaryExpression)
-        if isinstance(node.left, Step) and (
-                isinstance(node.right, acceptable_rhs_types)):
+        if _is_property_equality(node):
             # This is a leaf node
             case_property_name = serialize(node.left)
             value = _unwrap_function(node.right)
@@ -209,6 +279,71 @@ def build_filter_from_ast(domain, node):
                 serialize(node),
             )
 
+    def _cost(node):
+        """Rough relative cost of the filter for a node. Cheaper filters are
+        evaluated first so that ES can skip the more expensive ones.
+        """
+        if not hasattr(node, 'op'):
+            return 0
+        if _is_related_case_lookup(node):
+            return 3
+        if node.op in [EQ, NEQ]:
+            return 0
+        if node.op in COMPARISON_MAPPING:
+            return 1
+        if node.op in ['and', 'or']:
+            return max(_cost(node.left), _cost(node.right))
+        return 2
+
+    def _operands(node):
+        """Returns the operands of a chain of the same boolean operator
+
+        e.g. `a = 1 and (b = 2 and c = 3)` has operands `a = 1`, `b = 2` and `c = 3`
+        """
+        for child in [node.left, node.right]:
+            if getattr(child, 'op', None) == node.op:
+                yield from _operands(child)
+            else:
+                yield child
+
+    def _fold_equalities(nodes):
+        """Folds `prop = 'a' or prop = 'b'` into a single nested query for `prop`
+        with either value
+        """
+        values_by_property = {}
+        folded = []
+        for node in nodes:
+            if getattr(node, 'op', None) == EQ and _is_property_equality(node):
+                case_property_name = serialize(node.left)
+                value = _unwrap_function(node.right)
+                if value != '':
+                    if case_property_name not in values_by_property:
+                        values_by_property[case_property_name] = []
+                        folded.append((node, case_property_name))
+                    values_by_property[case_property_name].append(value)
+                    continue
+            folded.append((node, None))
+
+        filters_ = []
+        for node, case_property_name in folded:
+            if case_property_name and len(values_by_property[case_property_name]) > 1:
+                filters_.append(exact_case_property_text_query(
+                    case_property_name, values_by_property[case_property_name]
+                ))
+            else:
+                filters_.append(visit(node))
+        return filters_
+
+    def _boolean(node):
+        operands = sorted(_operands(node), key=_cost)
+        if node.op == 'or':
+            filters_ = _fold_equalities(operands)
+        else:
+            filters_ = [visit(operand) for operand in operands]
+        if len(filters_) == 1:
+            return filters_[0]
+        return OPERATOR_MAPPING[node.op](*filters_)
+
     def visit(node):
         if not hasattr(node, 'op'):
             raise CaseFilterError(
@@ -230,8 +365,11 @@ def build_filter_from_ast(domain, node):
             # This node is a leaf
             return _comparison(node)
 
-        if node.op in list(OPERATOR_MAPPING.keys()):
+        if node.op in ['and', 'or']:
             # This is another branch in the tree
+            return _boolean(node)
+
+        if node.op in list(OPERATOR_MAPPING.keys()):
             return OPERATOR_MAPPING[node.op](visit(node.left), visit(node.right))
 
         raise CaseFilterError(
@@ -249,7 +387,7 @@ def build_filter_from_xpath(domain, xpath):
         "The operators we accept are: {}"
     )
     try:
-        return build_filter_from_ast(domain, parse_xpath(xpath))
+        return build_filter_from_ast(domain, parse_xpath_with_cache(xpath))
     except TypeError as e:
         text_error = re.search(r"Unknown text '(.+)'", str(e))
         if text_error:
@@ -289,4 +427,4 @@ def get_properties_from_ast(node):
 
 
 def get_properties_from_xpath(xpath):
-    return get_properties_from_ast(parse_xpath(xpath))
+    return get_properties_from_ast(parse_xpath_with_cache(xpath))
@@ -2,16 +2,24 @@ from django.test import SimpleTestCase, TestCase
 
 from corehq.util.es.elasticsearch import ConnectionError
 from eulxml.xpath import parse as parse_xpath
+from eulxml.xpath.ast import serialize
 
 from casexml.apps.case.mock import CaseFactory, CaseIndex, CaseStructure
 from pillowtop.es_utils import initialize_index_and_mapping
 
 from corehq.apps.case_search.filter_dsl import (
     CaseFilterError,
+    _parse_xpath_template,
     build_filter_from_ast,
+    build_filter_from_xpath,
     get_properties_from_ast,
+    parse_xpath_with_cache,
+)
+from corehq.apps.es import CaseSearchES, filters
+from corehq.apps.es.case_search import (
+    case_property_range_query,
+    exact_case_property_text_query,
 )
-from corehq.apps.es import CaseSearchES
 from corehq.apps.es.tests.utils import es_test
 from corehq.elastic import get_es_new, send_to_elasticsearch
 from corehq.form_processor.tests.utils import FormProcessorTestUtils
@@ -222,62 +230,31 @@ class TestFilterDsl(SimpleTestCase):
         expected_filter = {
             "and": (
                 {
-                    "or": (
-                        {
-                            "nested": {
-                                "path": "case_properties",
+                    "nested": {
+                        "path": "case_properties",
+                        "query": {
+                            "filtered": {
                                 "query": {
-                                    "filtered": {
-                                        "query": {
-                                            "match_all": {
-                                            }
-                                        },
-                                        "filter": {
-                                            "and": (
-                                                {
-                                                    "term": {
-                                                        "case_properties.key.exact": "name"
-                                                    }
-                                                },
-                                                {
-                                                    "term": {
-                                                        "case_properties.value.exact": "farid"
-                                                    }
-                                                }
-                                            )
-                                        }
+                                    "match_all": {
                                     }
-                                }
-                            }
-                        },
-                        {
-                            "nested": {
-                                "path": "case_properties",
-                                "query": {
-                                    "filtered": {
-                                        "query": {
-                                            "match_all": {
+                                },
+                                "filter": {
+                                    "and": (
+                                        {
+                                            "term": {
+                                                "case_properties.key.exact": "name"
                                             }
                                         },
-                                        "filter": {
-                                            "and": (
-                                                {
-                                                    "term": {
-                                                        "case_properties.key.exact": "name"
-                                                    }
-                                                },
-                                                {
-                                                    "term": {
-                                                        "case_properties.value.exact": "leila"
-                                                    }
-                                                }
-                                            )
+                                        {
+                                            "terms": {
+                                                "case_properties.value.exact": ["farid", "leila"]
+                                            }
                                         }
-                                    }
+                                    )
                                 }
                             }
                         }
-                    )
+                    }
                 },
                 {
                     "nested": {
@@ -306,6 +283,28 @@ class TestFilterDsl(SimpleTestCase):
         built_filter = build_filter_from_ast("domain", parsed)
         self.assertEqual(expected_filter, built_filter)
 
+    def test_cheapest_filters_first(self):
+        parsed = parse_xpath("dob <= '2017-02-11' and name = 'farid' and age > 3")
+        self.assertEqual(
+            filters.AND(
+                exact_case_property_text_query('name', 'farid'),
+                case_property_range_query('dob', lte='2017-02-11'),
+                case_property_range_query('age', gt=3),
+            ),
+            build_filter_from_ast("domain", parsed),
+        )
+
+    def test_fold_equalities(self):
+        parsed = parse_xpath("name = 'farid' or age > 3 or name = 'leila' or name = ''")
+        self.assertEqual(
+            filters.OR(
+                exact_case_property_text_query('name', ['farid', 'leila']),
+                build_filter_from_ast("domain", parse_xpath("name = ''")),
+                case_property_range_query('age', gt=3),
+            ),
+            build_filter_from_ast("domain", parsed),
+        )
+
     def test_self_reference(self):
         with self.assertRaises(CaseFilterError):
             build_filter_from_ast(None, parse_xpath("name = other_property"))
@@ -317,6 +316,26 @@ class TestFilterDsl(SimpleTestCase):
             build_filter_from_ast(None, parse_xpath("parent/name > other_property"))
 
 
+class TestParseXpathWithCache(SimpleTestCase):
+
+    def test_reuse_parsed_template(self):
+        _parse_xpath_template.cache_clear()
+        for xpath in [
+            "name = 'farid' and dob > date('2017-02-11')",
+            'name = "leila" and dob > date("2019-01-01")',
+        ]:
+            self.assertEqual(serialize(parse_xpath(xpath)), serialize(parse_xpath_with_cache(xpath)))
+        self.assertEqual(_parse_xpath_template.cache_info().hits, 1)
+
+    def test_literals_in_predicates(self):
+        xpath = "subcase[type = 'child'] = 'value'"
+        self.assertEqual(serialize(parse_xpath(xpath)), serialize(parse_xpath_with_cache(xpath)))
+
+    def test_syntax_error(self):
+        with self.assertRaises(CaseFilterError):
+            build_filter_from_xpath("domain", "name = 'it's'")
+
+
 @es_test
 class TestFilterDslLookups(TestCase):
     maxDiff = None
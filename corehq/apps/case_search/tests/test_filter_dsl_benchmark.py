@@ -0,0 +1,72 @@
+"""
+Benchmark for building case search filters from XPath expressions.
+
+The corpus is shaped like the searches sent by apps: the same expressions
+are repeated with different values. The test checks that the cached parse
+gives the same AST as parsing every expression. To see timings, run
+``run_benchmark()`` from ``./manage.py shell``:
+
+    from corehq.apps.case_search.tests.test_filter_dsl_benchmark import run_benchmark
+    run_benchmark()
+"""
+import random
+import timeit
+
+from django.test import SimpleTestCase
+
+from eulxml.xpath import parse as parse_xpath
+from eulxml.xpath.ast import serialize
+
+from corehq.apps.case_search.filter_dsl import (
+    _parse_xpath_template,
+    build_filter_from_ast,
+    parse_xpath_with_cache,
+)
+
+QUERY_TEMPLATES = [
+    "name = '{name}'",
+    "first_name = '{name}' and last_name = '{surname}'",
+    "dob >= '{date}' and dob <= '{date}'",
+    "age >= {number} and height < 1.25",
+    "(village = '{village}' or village = '{village}' or village = '{village}') and status != 'closed'",
+    "phone_number = '{number}' or alt_phone_number = '{number}'",
+    "dob > date('{date}') and household_id != ''",
+    "name = '{name}' and (sex = 'male' or sex = 'female') and dob <= '{date}' and consent = 'yes'",
+]
+
+
+def _get_corpus(size=1000, seed=0):
+    rand = random.Random(seed)
+
+    def _fill(template):
+        return template.format(
+            name=rand.choice(['farid', 'leila', 'dolores', 'maeve', 'bernard']),
+            surname=rand.choice(['abernathy', 'millay', 'lowe']),
+            date='20{:02}-{:02}-{:02}'.format(rand.randint(0, 19), rand.randint(1, 12), rand.randint(1, 28)),
+            number=rand.randint(0, 100000),
+            village=rand.choice(['kisumu', 'nakuru', 'eldoret', 'thika']),
+        )
+
+    return [_fill(rand.choice(QUERY_TEMPLATES)) for i in range(size)]
+
+
+def run_benchmark(size=1000):
+    corpus = _get_corpus(size)
+    _parse_xpath_template.cache_clear()
+
+    uncached = timeit.timeit(
+        lambda: [build_filter_from_ast('domain', parse_xpath(xpath)) for xpath in corpus], number=1
+    )
+    cached = timeit.timeit(
+        lambda: [build_filter_from_ast('domain', parse_xpath_with_cache(xpath)) for xpath in corpus], number=1
+    )
+    print("{} queries, {} templates".format(len(corpus), len(QUERY_TEMPLATES)))
+    print("parse every query: {:.3f}s".format(uncached))
+    print("cached templates:  {:.3f}s".format(cached))
+
+
+class FilterDslBenchmarkTest(SimpleTestCase):
+
+    def test_cached_parse_matches(self):
+        for xpath in _get_corpus(50):
+            self.assertEqual(serialize(parse_xpath(xpath)), serialize(parse_xpath_with_cache(xpath)))
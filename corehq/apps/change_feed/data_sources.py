@@ -78,20 +78,25 @@ def get_document_store(data_source_type, data_source_name, domain, load_source="
     return DocStoreLoadTracker(store, track_load)
 
 
-def get_document_store_for_doc_type(domain, doc_type, case_type_or_xmlns=None, load_source="unknown"):
+def get_document_store_for_doc_type(domain, doc_type, case_type_or_xmlns=None, load_source="unknown",
+                                    modified_since=None):
     """Only applies to documents that have a document type:
     * forms
     * cases
     * locations
     * leddgers (V2 only)
     * all couch models
+
+    ``modified_since`` is only supported for SQL cases.
     """
     from corehq.apps.change_feed import document_types
+    if modified_since is not None and doc_type not in document_types.CASE_DOC_TYPES:
+        raise ValueError("modified_since is not supported for {}".format(doc_type))
     if doc_type in all_known_formlike_doc_types():
         store = FormDocumentStore(domain, xmlns=case_type_or_xmlns)
         load_counter = form_load_counter
     elif doc_type in document_types.CASE_DOC_TYPES:
-        store = CaseDocumentStore(domain, case_type=case_type_or_xmlns)
+        store = CaseDocumentStore(domain, case_type=case_type_or_xmlns, modified_since=modified_since)
         load_counter = case_load_counter
     elif doc_type == LOCATION_DOC_TYPE:
         return LocationDocumentStore(domain)
@@ -25,6 +25,7 @@ from corehq.form_processor.document_stores import (
     LedgerV1DocumentStore,
     LedgerV2DocumentStore,
 )
+from corehq.form_processor.models import CommCareCaseSQL
 from corehq.form_processor.tests.utils import (
     FormProcessorTestUtils,
     use_sql_backend,
@@ -261,7 +262,20 @@ class DocumentStoreDbTests(TestCase):
 
 @use_sql_backend
 class DocumentStoreDbTestsSQL(TestCase):
-    pass
+
+    def test_case_document_store_modified_since(self):
+        with case_data() as case_ids:
+            modified_since = datetime.utcnow()
+            self.assertEqual(
+                [], list(CaseDocumentStore('domain', modified_since=modified_since).iter_document_ids())
+            )
+            CommCareCaseSQL.objects.partitioned_query(case_ids[0]).filter(
+                case_id=case_ids[0]
+            ).update(server_modified_on=datetime.utcnow())
+            self.assertEqual(
+                [case_ids[0]],
+                list(CaseDocumentStore('domain', modified_since=modified_since).iter_document_ids())
+            )
 
 
 def _test_document_store(self, doc_store_cls, doc_store_args, data_context, id_field):
@@ -52,15 +52,14 @@ from corehq.messaging.scheduling.models import (
     AlertSchedule,
     TimedSchedule,
 )
-from corehq.messaging.scheduling.scheduling_partitioned.dbaccessors import (
-    get_case_alert_schedule_instances_for_schedule_id,
-    get_case_timed_schedule_instances_for_schedule_id,
-)
 from corehq.messaging.scheduling.scheduling_partitioned.models import (
+    CaseAlertScheduleInstance,
     CaseScheduleInstanceMixin,
+    CaseTimedScheduleInstance,
 )
 from corehq.messaging.scheduling.tasks import (
     delete_case_alert_schedule_instances,
+    delete_case_schedule_instances_for_schedule_id,
     delete_case_timed_schedule_instances,
     refresh_case_alert_schedule_instances,
     refresh_case_timed_schedule_instances,
@@ -1131,10 +1130,14 @@ class CreateScheduleInstanceActionDefinition(CaseRuleActionDefinition):
 
     def delete_schedule_instances(self, case):
         if self.alert_schedule_id:
-            get_case_alert_schedule_instances_for_schedule_id(case.case_id, self.alert_schedule_id).delete()
+            delete_case_schedule_instances_for_schedule_id(
+                CaseAlertScheduleInstance, case.case_id, self.alert_schedule_id
+            )
 
         if self.timed_schedule_id:
-            get_case_timed_schedule_instances_for_schedule_id(case.case_id, self.timed_schedule_id).delete()
+            delete_case_schedule_instances_for_schedule_id(
+                CaseTimedScheduleInstance, case.case_id, self.timed_schedule_id
+            )
 
     def get_scheduler_module_info(self):
         return self.SchedulerModuleInfo(**self.scheduler_module_info)
@@ -59,9 +59,11 @@ from corehq.messaging.scheduling.tests.util import (
     delete_alert_schedules,
     delete_timed_schedules,
 )
+from corehq.messaging.scheduling.scheduling_partitioned import dbaccessors
 from corehq.messaging.tasks import (
     run_messaging_rule,
     run_messaging_rule_for_shard,
+    sync_case_chunk_for_messaging_rule,
     sync_case_for_messaging,
     sync_case_for_messaging_rule,
 )
@@ -750,6 +752,57 @@ class CaseRuleSchedulingIntegrationTest(TestCase):
         instances = get_case_timed_schedule_instances_for_schedule(case.case_id, schedule)
         self.assertEqual(instances.count(), 0)
 
+    @run_with_all_backends
+    @patch('corehq.messaging.scheduling.util.utcnow')
+    def test_sync_case_chunk_for_messaging_rule(self, utcnow_patch):
+        schedule = AlertSchedule.create_simple_alert(
+            self.domain,
+            SMSContent(message={'en': 'Hello'})
+        )
+        rule = create_empty_rule(self.domain, AutomaticUpdateRule.WORKFLOW_SCHEDULING)
+        rule.add_criteria(
+            MatchPropertyDefinition,
+            property_name='start_sending',
+            property_value='Y',
+            match_type=MatchPropertyDefinition.MATCH_EQUAL,
+        )
+        rule.add_action(
+            CreateScheduleInstanceActionDefinition,
+            alert_schedule_id=schedule.schedule_id,
+            recipients=(('CommCareUser', self.user.get_id),)
+        )
+        AutomaticUpdateRule.clear_caches(self.domain, AutomaticUpdateRule.WORKFLOW_SCHEDULING)
+        utcnow_patch.return_value = datetime(2017, 5, 1, 7, 0)
+
+        get_instances = dbaccessors.get_case_schedule_instances_for_schedule_id_and_cases
+
+        def sync_chunk(case_ids):
+            with patch('corehq.messaging.scheduling.tasks.get_case_schedule_instances_for_schedule_id_and_cases',
+                       side_effect=get_instances) as get_instances_patch, \
+                    patch('corehq.messaging.scheduling.tasks.bulk_create_schedule_instances',
+                          side_effect=dbaccessors.bulk_create_schedule_instances) as bulk_create_patch:
+                sync_case_chunk_for_messaging_rule(self.domain, case_ids + ('missing-case-id',), rule.pk)
+            # the instances of the whole chunk are read and written together
+            self.assertEqual(get_instances_patch.call_count, 1)
+            self.assertEqual(bulk_create_patch.call_count, 1)
+
+        def get_instance_counts(cases):
+            return [get_case_alert_schedule_instances_for_schedule(case.case_id, schedule).count()
+                    for case in cases]
+
+        # Don't sync the cases when they change, so that the chunk does the work
+        with patch('corehq.messaging.signals.sync_case_for_messaging.delay'), \
+                create_case(self.domain, 'person', update={'start_sending': 'Y'}) as case1, \
+                create_case(self.domain, 'person', update={'start_sending': 'Y'}) as case2:
+            self.assertEqual(get_instance_counts([case1, case2]), [0, 0])
+
+            sync_chunk((case1.case_id, case2.case_id))
+            self.assertEqual(get_instance_counts([case1, case2]), [1, 1])
+
+            update_case(self.domain, case2.case_id, case_properties={'start_sending': 'N'})
+            sync_chunk((case1.case_id, case2.case_id))
+            self.assertEqual(get_instance_counts([case1, case2]), [1, 0])
+
     @run_with_all_backends
     @patch('corehq.messaging.scheduling.util.utcnow')
     def test_timed_schedule_case_property_timed_event(self, utcnow_patch):
@@ -24,8 +24,8 @@ from corehq.apps.export.models.new import (
     FormExportInstance,
     SMSExportInstance,
 )
-from corehq.elastic import iter_es_docs_from_query
-from corehq.toggles import PAGINATED_EXPORTS
+from corehq.elastic import iter_es_docs, iter_es_docs_from_query
+from corehq.toggles import PAGINATED_EXPORTS, STREAMING_EXCEL_EXPORTS
 from corehq.util.metrics.load_counters import load_counter
 from corehq.util.files import TransientTempfile, safe_filename
 from soil.progress import TaskProgressManager
@@ -279,7 +279,11 @@ def get_export_writer(export_instances, temp_path, allow_pagination=True):
         format = export_instances[0].export_format
         format_data_in_excel = export_instances[0].format_data_in_excel
 
-    legacy_writer = get_writer(format, use_formatted_cells=format_data_in_excel)
+    legacy_writer = get_writer(
+        format,
+        use_formatted_cells=format_data_in_excel,
+        streaming=STREAMING_EXCEL_EXPORTS.enabled(export_instances[0].domain),
+    )
 
     if allow_pagination and PAGINATED_EXPORTS.enabled(export_instances[0].domain):
         writer = _PaginatedExportWriter(legacy_writer, temp_path)
@@ -325,6 +329,14 @@ def get_export_documents(export_instance, filters):
     return iter_es_docs_from_query(query)
 
 
+def get_export_document_ids(export_instance, filters):
+    return _get_export_query(export_instance, filters).scroll_ids()
+
+
+def get_export_documents_by_id(export_instance, doc_ids):
+    return iter_es_docs(_get_base_query(export_instance).index, doc_ids)
+
+
 def _get_export_query(export_instance, filters):
     query = _get_base_query(export_instance)
     for filter in filters:
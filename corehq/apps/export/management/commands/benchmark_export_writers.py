@@ -0,0 +1,75 @@
+import multiprocessing
+import resource
+import tempfile
+import time
+
+from django.core.management import BaseCommand
+
+from couchexport.export import FormattedRow
+from couchexport.writers import (
+    CsvExportWriter,
+    Excel2007ExportWriter,
+    StreamingExcel2007ExportWriter,
+)
+
+WRITERS = {
+    'xlsx': Excel2007ExportWriter,
+    'xlsx-streaming': StreamingExcel2007ExportWriter,
+    'csv': CsvExportWriter,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Write a synthetic export with each export writer and report rows/sec "
+        "and peak RSS. Each writer runs in its own process so peak memory is "
+        "measured independently."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--columns', type=int, default=20)
+        parser.add_argument('--formatted', action='store_true', default=False,
+                            help='Use formatted cells for the Excel writers')
+        parser.add_argument('--writer', dest='writers', action='append', choices=sorted(WRITERS),
+                            help='Writer to benchmark. Can be repeated. Defaults to all writers.')
+
+    def handle(self, rows, columns, formatted, writers, **options):
+        print("{:<16} {:>10} {:>12} {:>14}".format('writer', 'seconds', 'rows/sec', 'peak RSS (MB)'))
+        for name in writers or sorted(WRITERS):
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(
+                target=_benchmark_writer, args=(queue, name, rows, columns, formatted)
+            )
+            process.start()
+            seconds, peak_rss_kb = queue.get()
+            process.join()
+            print("{:<16} {:>10.1f} {:>12.0f} {:>14.1f}".format(
+                name, seconds, rows / seconds, peak_rss_kb / 1024
+            ))
+
+
+def _benchmark_writer(queue, name, rows, columns, formatted):
+    writer_class = WRITERS[name]
+    if writer_class is CsvExportWriter:
+        writer = writer_class()
+    else:
+        writer = writer_class(use_formatted_cells=formatted)
+
+    headers = FormattedRow(['column_{}'.format(i) for i in range(columns)])
+    start = time.time()
+    with tempfile.TemporaryFile() as file_:
+        writer.open([('forms', [headers])], file_)
+        writer.write([('forms', _synthetic_rows(rows, columns))])
+        writer.close()
+    seconds = time.time() - start
+    queue.put((seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+def _synthetic_rows(rows, columns):
+    values = ['value {}', '{}', '2020-01-{:02}', '{}.5', 'http://example.com/{}']
+    for i in range(rows):
+        yield FormattedRow([
+            values[col % len(values)].format(i % 28 + 1 if col % len(values) == 2 else i)
+            for col in range(columns)
+        ])
@@ -453,6 +453,65 @@ class DocRow(namedtuple("DocRow", ["doc", "row"])):
     """
 
 
+class RowExtractionPlan(object):
+    """
+    Everything TableConfiguration.get_rows needs to know about its selected
+    columns, worked out once rather than for every row of every document.
+
+    Columns that use the default ExportColumn.get_value are resolved together
+    by walking a trie of their paths (relative to the table path), so each
+    key in a sub document is looked up once no matter how many columns share
+    it. Columns with their own get_value are still asked for their value.
+    """
+
+    def __init__(self, table, split_columns):
+        self.columns = table.selected_columns
+        self.is_row_number = [isinstance(col, RowNumberColumn) for col in self.columns]
+        self.headers = [col.get_headers(split_column=split_columns) for col in self.columns]
+        self.hyperlink_column_indices = table.get_hyperlink_column_indices(split_columns)
+
+        base_path = table.path
+        self.path_trie = {}
+        self.uses_path_trie = []
+        for index, col in enumerate(self.columns):
+            uses_path_trie = type(col).get_value is ExportColumn.get_value
+            self.uses_path_trie.append(uses_path_trie)
+            if not uses_path_trie:
+                continue
+            assert base_path == col.item.path[:len(base_path)], \
+                "ExportItem's path doesn't start with the base_path"
+            path = [node.name for node in col.item.path[len(base_path):]]
+            if not path:
+                # matches NestedDictGetter, which finds nothing at an empty path
+                continue
+            children = self.path_trie
+            for name in path[:-1]:
+                children = children.setdefault(name, ([], {}))[1]
+            children.setdefault(path[-1], ([], {}))[0].append(index)
+
+    def get_path_values(self, doc):
+        """
+        Return the raw value at each column's path in doc, or None for columns
+        whose path is missing or that don't use the path trie
+        """
+        values = [None] * len(self.columns)
+        if isinstance(doc, dict):
+            self._fill_path_values(self.path_trie, doc, values)
+        return values
+
+    @classmethod
+    def _fill_path_values(cls, trie, doc, values):
+        for name, (column_indices, children) in trie.items():
+            try:
+                value = doc[name]
+            except KeyError:
+                continue
+            for index in column_indices:
+                values[index] = value
+            if children and isinstance(value, dict):
+                cls._fill_path_values(children, value, values)
+
+
 class TableConfiguration(DocumentSchema, ReadablePathMixin):
     """
     The TableConfiguration represents one excel sheet in an export.
@@ -502,27 +561,32 @@ class TableConfiguration(DocumentSchema, ReadablePathMixin):
         assert domain is not None, 'Form or Case must be associated with domain'
         assert document_id is not None, 'Form or Case must have an id'
 
+        plan = self._get_extraction_plan(split_columns)
         rows = []
         for doc_row in sub_documents:
             doc, row_index = doc_row.doc, doc_row.row
+            path_values = plan.get_path_values(doc)
 
             row_data = {} if as_json else []
             col_index = 0
             skip_excel_formatting = []
-            for col in self.selected_columns:
-                val = col.get_value(
-                    domain,
-                    document_id,
-                    doc,
-                    self.path,
-                    row_index=row_index,
-                    split_column=split_columns,
-                    transform_dates=transform_dates,
-                )
+            for index, col in enumerate(plan.columns):
+                if plan.uses_path_trie[index]:
+                    val = col._transform(path_values[index], doc, transform_dates)
+                else:
+                    val = col.get_value(
+                        domain,
+                        document_id,
+                        doc,
+                        self.path,
+                        row_index=row_index,
+                        split_column=split_columns,
+                        transform_dates=transform_dates,
+                    )
                 if as_json:
-                    for index, header in enumerate(col.get_headers(split_column=split_columns)):
+                    for header_index, header in enumerate(plan.headers[index]):
                         if isinstance(val, list):
-                            row_data[header] = "{}".format(val[index])
+                            row_data[header] = "{}".format(val[header_index])
                         else:
                             row_data[header] = "{}".format(val)
                 elif isinstance(val, list):
@@ -531,7 +595,7 @@ class TableConfiguration(DocumentSchema, ReadablePathMixin):
                     # we never want to auto-format RowNumberColumn
                     # (always treat as text)
                     next_col_index = col_index + len(val)
-                    if isinstance(col, RowNumberColumn):
+                    if plan.is_row_number[index]:
                         skip_excel_formatting.extend(
                             list(range(col_index, next_col_index))
                         )
@@ -541,7 +605,7 @@ class TableConfiguration(DocumentSchema, ReadablePathMixin):
 
                     # we never want to auto-format RowNumberColumn
                     # (always treat as text)
-                    if isinstance(col, RowNumberColumn):
+                    if plan.is_row_number[index]:
                         skip_excel_formatting.append(col_index)
                     col_index += 1
             if as_json:
@@ -549,11 +613,15 @@ class TableConfiguration(DocumentSchema, ReadablePathMixin):
             else:
                 rows.append(ExportRow(
                     data=row_data,
-                    hyperlink_column_indices=self.get_hyperlink_column_indices(split_columns),
+                    hyperlink_column_indices=plan.hyperlink_column_indices,
                     skip_excel_formatting=skip_excel_formatting
                 ))
         return rows
 
+    @memoized
+    def _get_extraction_plan(self, split_columns):
+        return RowExtractionPlan(self, split_columns)
+
     def get_column(self, item_path, item_doc_type, column_transform):
         """
         Given a path and transform, will return the column and its index. If not found, will
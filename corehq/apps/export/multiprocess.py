@@ -10,24 +10,30 @@ You can also use the MultiprocessExporter class to have more control over the pr
 See the 'process_skipped_pages' management command for an example.
 
 The export works as follows:
-  * Dump raw docs from ES into files of size N docs
+  * Dump matching doc IDs from ES into files of size N IDs
   * Once each file is complete add it to a multiprocessing Queue
-  * Pool of X processes listen to queue and process the dump file
+  * Pool of X processes listen to queue and process the dump file:
+    each process fetches its own docs from ES and writes its own export file
   * Results returned back to the main process
     * Unsuccessful results can be retried
-  * Add successful pages to final ZIP archive
+  * Stream successful pages into final ZIP archive
   * Add raw data dumps for unsuccessful pages to final ZIP archive
+
+Dump files are gzipped JSON lines. Each line is either a full document or
+just a document ID, so pages dumped by older versions can still be processed.
 """
 import gzip
 import json
 import logging
 import multiprocessing
 import os
+import shutil
 import tempfile
 import time
 import zipfile
 from collections import namedtuple
 from datetime import timedelta
+from itertools import groupby
 
 from six.moves.queue import Empty
 
@@ -36,13 +42,14 @@ from couchexport.writers import ZippedExportWriter
 
 from corehq.apps.export.dbaccessors import get_properly_wrapped_export_instance
 from corehq.apps.export.export import (
-    get_export_documents,
+    get_export_document_ids,
+    get_export_documents_by_id,
     get_export_size,
     get_export_writer,
     save_export_payload,
     write_export_instance,
 )
-from corehq.elastic import ScanResult
+from corehq.elastic import ScanResult, get_es_export, get_es_new
 from corehq.util.files import safe_filename
 
 TEMP_FILE_PREFIX = 'cchq_export_dump_'
@@ -92,15 +99,20 @@ class OutputPaginator(object):
         self._new_file()
 
     def _new_file(self):
+        self._close_file()
+        prefix = '{}{}_'.format(TEMP_FILE_PREFIX, self.export_id)
+        self._fileobj = tempfile.NamedTemporaryFile(prefix=prefix, mode='wb', delete=False)
+        self.path = self._fileobj.name
+        self.file = gzip.GzipFile(fileobj=self._fileobj, mode='wb')
+
+    def _close_file(self):
+        # GzipFile doesn't close a file object it was given
         if self.file:
             self.file.close()
-        prefix = '{}{}_'.format(TEMP_FILE_PREFIX, self.export_id)
-        fileobj = tempfile.NamedTemporaryFile(prefix=prefix, mode='wb', delete=False)
-        self.path = fileobj.name
-        self.file = gzip.GzipFile(fileobj=fileobj)
+            self._fileobj.close()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.file.close()
+        self._close_file()
         if exc_type is not None:
             os.remove(self.path)
         self.file = None
@@ -113,9 +125,11 @@ class OutputPaginator(object):
 
     def write(self, doc):
         self.page_size += 1
-        self.file.write('{}\n'.format(json.dumps(doc)))
+        self.file.write('{}\n'.format(json.dumps(doc)).encode('utf-8'))
 
     def get_result(self):
+        # make sure the page is completely on disk before handing it to a worker
+        self._close_file()
         return RetryResult(self.page, self.path, self.page_size, 0)
 
 
@@ -137,8 +151,8 @@ def run_multiprocess_exporter(exporter, filters, paginator, page_size):
         logger.info('  Dump page {} complete: {} docs'.format(paginator.page, paginator.page_size))
 
     with exporter, paginator:
-        for doc in get_export_documents(exporter.export_instance, filters):
-            paginator.write(doc)
+        for doc_id in get_export_document_ids(exporter.export_instance, filters):
+            paginator.write(doc_id)
             if paginator.page_size == page_size:
                 _log_page_dumped(paginator)
                 exporter.process_page(paginator.get_result())
@@ -171,19 +185,30 @@ def run_export_with_logging(export_instance, page_number, dump_path, doc_count,
 
 
 def run_export(export_instance, page_number, dump_path, doc_count, progress_tracker=None):
-    docs = _get_export_documents_from_file(dump_path, doc_count)
+    docs = _get_export_documents_from_file(export_instance, dump_path, doc_count)
     export_file_path = _get_export_file_path(export_instance, docs, progress_tracker)
     return SuccessResult(page_number, export_file_path, doc_count)
 
 
-def _get_export_documents_from_file(dump_path, doc_count):
-    """Mimic the results of an ES scroll query but get results from jsonlines file"""
-    def _doc_iter():
+def _get_export_documents_from_file(export_instance, dump_path, doc_count):
+    """Mimic the results of an ES scroll query but get results from jsonlines file.
+
+    Lines holding a doc ID rather than a full doc are fetched from ES here,
+    in the process that handles the page.
+    """
+    def _line_iter():
         with gzip.open(dump_path) as file:
             for line in file:
                 yield json.loads(line.decode())
         os.remove(dump_path)
 
+    def _doc_iter():
+        for is_doc_id, items in groupby(_line_iter(), key=lambda item: isinstance(item, str)):
+            if is_doc_id:
+                yield from get_export_documents_by_id(export_instance, items)
+            else:
+                yield from items
+
     return ScanResult(doc_count, _doc_iter())
 
 
@@ -237,14 +262,18 @@ class MultiprocessExporter(object):
 
         self.export_function = run_export_with_logging
 
-        def _set_queue(queue):
+        def _init_worker(queue):
             """Set the progress queue as an attribute on the function
             You can't pass this as an arg"""
             self.export_function.queue = queue
+            # Don't share the parent's ES connections: the parent keeps
+            # scrolling on them while the workers fetch their docs
+            get_es_new.reset_cache()
+            get_es_export.reset_cache()
 
         self.pool = multiprocessing.Pool(
             processes=num_processes,
-            initializer=_set_queue,
+            initializer=_init_worker,
             initargs=[self.progress_queue]
         )
 
@@ -375,11 +404,14 @@ class MultiprocessExporter(object):
 
 def _add_compressed_page_to_zip(zip_file, page_number, zip_path_to_add):
     with zipfile.ZipFile(zip_path_to_add, 'r') as page_file:
-        for path in page_file.namelist():
-            prefix, suffix = path.rsplit('/', 1)
-            zip_file.writestr('{}/{}_{}'.format(
-                prefix, page_number, suffix), page_file.open(path).read()
-            )
+        for page_info in page_file.infolist():
+            prefix, suffix = page_info.filename.rsplit('/', 1)
+            info = zipfile.ZipInfo('{}/{}_{}'.format(prefix, page_number, suffix), page_info.date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            # lets the archive decide up front whether the entry needs zip64
+            info.file_size = page_info.file_size
+            with page_file.open(page_info) as source, zip_file.open(info, 'w') as destination:
+                shutil.copyfileobj(source, destination)
 
 
 def _output_progress(queue, total_docs):
@@ -0,0 +1,101 @@
+"""
+Microbenchmark for TableConfiguration.get_rows on a wide repeat-group table.
+
+The test checks that rows built from the compiled RowExtractionPlan match
+rows built by asking every column for its value. To see timings, run
+``run_benchmark()`` from ``./manage.py shell``:
+
+    from corehq.apps.export.tests.test_get_rows_benchmark import run_benchmark
+    run_benchmark()
+"""
+import timeit
+
+from django.test import SimpleTestCase
+
+from corehq.apps.export.models import (
+    ExportColumn,
+    PathNode,
+    RowNumberColumn,
+    ScalarItem,
+    TableConfiguration,
+)
+
+
+def _get_table(num_groups=20, questions_per_group=10):
+    repeat_path = [PathNode(name='form'), PathNode(name='repeat', is_repeat=True)]
+    columns = [
+        RowNumberColumn(
+            label='number',
+            item=ScalarItem(path=[PathNode(name='number')]),
+            selected=True,
+        )
+    ]
+    for group in range(num_groups):
+        for question in range(questions_per_group):
+            columns.append(ExportColumn(
+                item=ScalarItem(path=repeat_path + [
+                    PathNode(name='group{}'.format(group)),
+                    PathNode(name='q{}'.format(question)),
+                ]),
+                selected=True,
+            ))
+    return TableConfiguration(path=repeat_path, columns=columns, selected=True)
+
+
+def _get_form(num_repeats=50, num_groups=20, questions_per_group=10):
+    return {
+        'domain': 'bench',
+        '_id': 'form-id',
+        'form': {
+            'repeat': [
+                {
+                    'group{}'.format(group): {
+                        'q{}'.format(question): '{}-{}-{}'.format(repeat, group, question)
+                        # leave some questions unanswered
+                        for question in range(questions_per_group) if (repeat + question) % 7
+                    }
+                    for group in range(num_groups)
+                }
+                for repeat in range(num_repeats)
+            ]
+        }
+    }
+
+
+def _get_rows_per_column(table, document, row_number):
+    """Build rows the way get_rows did before extraction plans"""
+    rows = []
+    for doc_row in table._get_sub_documents(document, row_number, document_id=document['_id']):
+        row = []
+        for col in table.selected_columns:
+            val = col.get_value(document['domain'], document['_id'], doc_row.doc, table.path,
+                                row_index=doc_row.row)
+            if isinstance(val, list):
+                row.extend(val)
+            else:
+                row.append(val)
+        rows.append(row)
+    return rows
+
+
+def run_benchmark(number=20):
+    table = _get_table()
+    form = _get_form()
+    per_column = timeit.timeit(lambda: _get_rows_per_column(table, form, 0), number=number)
+    planned = timeit.timeit(lambda: table.get_rows(form, 0), number=number)
+    print("{} columns x {} repeats, {} runs".format(
+        len(table.selected_columns), len(form['form']['repeat']), number
+    ))
+    print("per column lookups: {:.3f}s".format(per_column))
+    print("extraction plan:    {:.3f}s".format(planned))
+
+
+class GetRowsBenchmarkTest(SimpleTestCase):
+
+    def test_plan_matches_per_column_values(self):
+        table = _get_table(num_groups=3, questions_per_group=4)
+        form = _get_form(num_repeats=5, num_groups=3, questions_per_group=4)
+        self.assertEqual(
+            [row.data for row in table.get_rows(form, 3)],
+            _get_rows_per_column(table, form, 3),
+        )
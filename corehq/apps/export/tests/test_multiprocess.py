@@ -0,0 +1,59 @@
+import gzip
+import json
+import os
+import tempfile
+import zipfile
+
+from django.test import SimpleTestCase
+from mock import patch
+
+from corehq.apps.export.multiprocess import (
+    OutputPaginator,
+    _add_compressed_page_to_zip,
+    _get_export_documents_from_file,
+)
+
+
+class MultiprocessExportPageTest(SimpleTestCase):
+
+    def _dump_page(self, lines):
+        paginator = OutputPaginator('abc')
+        with paginator:
+            for line in lines:
+                paginator.write(line)
+            path = paginator.path
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        return path
+
+    def test_page_of_docs(self):
+        docs = [{'_id': 'a'}, {'_id': 'b'}]
+        path = self._dump_page(docs)
+        with gzip.open(path) as page:
+            self.assertEqual([json.loads(line.decode()) for line in page], docs)
+
+        result = _get_export_documents_from_file(None, path, 2)
+        self.assertEqual(list(result), docs)
+        self.assertFalse(os.path.exists(path))
+
+    def test_page_of_doc_ids(self):
+        path = self._dump_page(['a', 'b', 'c'])
+
+        def _get_docs(export_instance, doc_ids):
+            return [{'_id': doc_id} for doc_id in doc_ids]
+
+        with patch('corehq.apps.export.multiprocess.get_export_documents_by_id', _get_docs):
+            result = _get_export_documents_from_file(None, path, 3)
+            self.assertEqual(list(result), [{'_id': 'a'}, {'_id': 'b'}, {'_id': 'c'}])
+
+    def test_add_compressed_page_to_zip(self):
+        with tempfile.NamedTemporaryFile(suffix='.zip') as page, tempfile.TemporaryFile() as final:
+            with zipfile.ZipFile(page, 'w', zipfile.ZIP_DEFLATED) as page_zip:
+                page_zip.writestr('Export/Forms.csv', 'a,b\n1,2\n')
+            page.flush()
+
+            with zipfile.ZipFile(final, 'w', zipfile.ZIP_DEFLATED) as final_zip:
+                _add_compressed_page_to_zip(final_zip, 3, page.name)
+
+            with zipfile.ZipFile(final) as final_zip:
+                self.assertEqual(final_zip.namelist(), ['Export/3_Forms.csv'])
+                self.assertEqual(final_zip.read('Export/3_Forms.csv'), b'a,b\n1,2\n')
@@ -1,3 +1,4 @@
+import hashlib
 from collections import defaultdict
 from functools import partial
 from operator import attrgetter
@@ -8,13 +9,16 @@ from casexml.apps.phone.utils import (
     GLOBAL_USER_ID,
     get_or_cache_global_fixture,
 )
+from dimagi.utils.couch.cache.cache_core import get_redis_default_cache
 
 from corehq.apps.fixtures.dbaccessors import iter_fixture_items_for_data_type
 from corehq.apps.fixtures.models import FIXTURE_BUCKET, FixtureDataType
 from corehq.apps.products.fixtures import product_fixture_generator_json
 from corehq.apps.programs.fixtures import program_fixture_generator_json
 
-from .utils import get_index_schema_node
+from .utils import get_index_schema_node, get_user_fixture_version
+
+USER_FIXTURE_CACHE_TIMEOUT = 24 * 60 * 60
 
 
 def item_lists_by_domain(domain):
@@ -64,7 +68,7 @@ class ItemListsProvider(FixtureProvider):
         if global_types:
             items.extend(self.get_global_items(global_types, restore_state))
         if user_types:
-            items.extend(self.get_user_items(user_types, restore_user))
+            items.extend(self.get_user_items(user_types, restore_state))
         return items
 
     def get_global_items(self, global_types, restore_state):
@@ -80,7 +84,58 @@ class ItemListsProvider(FixtureProvider):
 
         return self._get_fixtures(global_types, get_items_by_type, GLOBAL_USER_ID)
 
-    def get_user_items(self, user_types, restore_user):
+    def get_user_items(self, user_types, restore_state):
+        """Get the serialized user fixtures, one byte string per element
+
+        The serialized elements are cached per data type for the set of
+        owners (user, groups and locations) the items are assigned to.
+        Cache entries are invalidated by a new version of the data type or
+        by clearing the domain's user fixture version when items or their
+        ownership change.
+        """
+        restore_user = restore_state.restore_user
+        owner_ids = restore_user.get_fixture_owner_ids()
+        cache_keys = {
+            data_type_id: self._get_user_cache_key(restore_user.domain, owner_ids, data_type)
+            for data_type_id, data_type in user_types.items()
+        }
+        cache = get_redis_default_cache()
+        cached = {} if restore_state.overwrite_cache else cache.get_many(list(cache_keys.values()))
+        missing_types = {
+            data_type_id: data_type
+            for data_type_id, data_type in user_types.items()
+            if cache_keys[data_type_id] not in cached
+        }
+        if missing_types:
+            payloads = {
+                cache_keys[data_type_id]: payload
+                for data_type_id, payload in self._get_user_payloads(missing_types, restore_user).items()
+            }
+            cache.set_many(payloads, timeout=USER_FIXTURE_CACHE_TIMEOUT)
+            cached.update(payloads)
+
+        global_id = GLOBAL_USER_ID.encode('utf-8')
+        b_user_id = restore_user.user_id.encode('utf-8')
+        return [
+            element.replace(global_id, b_user_id)
+            for data_type in sorted(user_types.values(), key=attrgetter('tag'))
+            for element in cached[cache_keys[data_type._id]]
+        ]
+
+    def _get_user_cache_key(self, domain, owner_ids, data_type):
+        owners = ','.join(
+            '{}:{}'.format(owner_type, ' '.join(sorted(ids)))
+            for owner_type, ids in owner_ids
+        )
+        return 'user-fixture-items:{}'.format(hashlib.md5(','.join([
+            domain,
+            get_user_fixture_version(domain),
+            data_type._id,
+            data_type._rev,
+            owners,
+        ]).encode('utf-8')).hexdigest())
+
+    def _get_user_payloads(self, user_types, restore_user):
         items_by_type = defaultdict(list)
         for item in restore_user.get_fixture_data_items():
             data_type = user_types.get(item.data_type_id)
@@ -92,7 +147,11 @@ class ItemListsProvider(FixtureProvider):
             return sorted(items_by_type.get(data_type, []),
                           key=attrgetter('sort_key'))
 
-        return self._get_fixtures(user_types, get_items_by_type, restore_user.user_id)
+        payloads = {}
+        for data_type_id, data_type in user_types.items():
+            elements = self._get_fixtures({data_type_id: data_type}, get_items_by_type, GLOBAL_USER_ID)
+            payloads[data_type_id] = [ElementTree.tostring(element, encoding='utf-8') for element in elements]
+        return payloads
 
     def _set_cached_type(self, item, data_type):
         # set the cached version used by the object so that it doesn't
@@ -33,6 +33,7 @@ from corehq.apps.fixtures.exceptions import (
 from corehq.apps.fixtures.utils import (
     clean_fixture_field_name,
     get_fields_without_attributes,
+    get_user_fixture_version,
     remove_deleted_ownerships,
 )
 from corehq.apps.groups.models import Group
@@ -242,11 +243,20 @@ class FixtureDataItem(Document):
             self._data_type = FixtureDataType.get(self.data_type_id)
         return self._data_type
 
+    def save(self, *args, **kwargs):
+        super(FixtureDataItem, self).save(*args, **kwargs)
+        get_user_fixture_version.clear(self.domain)
+
+    def delete(self, *args, **kwargs):
+        super(FixtureDataItem, self).delete(*args, **kwargs)
+        get_user_fixture_version.clear(self.domain)
+
     def add_owner(self, owner, owner_type, transaction=None):
         assert(owner.domain == self.domain)
         with transaction or CouchTransaction() as transaction:
             o = FixtureOwnership(domain=self.domain, owner_type=owner_type, owner_id=owner.get_id, data_item_id=self.get_id)
             transaction.save(o)
+        get_user_fixture_version.clear(self.domain)
         return o
 
     def remove_owner(self, owner, owner_type):
@@ -270,6 +280,7 @@ class FixtureDataItem(Document):
                     data_type_id=self.data_type_id,
                     domain=self.domain
                 ))
+        get_user_fixture_version.clear(self.domain)
 
     def add_user(self, user, transaction=None):
         return self.add_owner(user, 'user', transaction=transaction)
@@ -375,18 +386,13 @@ class FixtureDataItem(Document):
 
     @classmethod
     def by_user(cls, user, wrap=True):
-        group_ids = Group.by_user_id(user.user_id, wrap=False)
-        loc_ids = user.sql_location.path if user.sql_location else []
-
-        def make_keys(owner_type, ids):
-            return [[user.domain, 'data_item by {}'.format(owner_type), id_]
-                    for id_ in ids]
-
         fixture_ids = set(
             FixtureOwnership.get_db().view('fixtures/ownership',
-                keys=(make_keys('user', [user.user_id]) +
-                      make_keys('group', group_ids) +
-                      make_keys('location', loc_ids)),
+                keys=[
+                    [user.domain, 'data_item by {}'.format(owner_type), id_]
+                    for owner_type, ids in get_fixture_owner_ids(user)
+                    for id_ in ids
+                ],
                 reduce=False,
                 wrapper=lambda r: r['value'],
             )
@@ -474,6 +480,20 @@ class FixtureDataItem(Document):
         transaction.delete(self)
 
 
+def get_fixture_owner_ids(user):
+    """Get the owners of the fixture items that are synced to a mobile worker
+
+    :returns: list of ``(owner_type, owner_ids)`` tuples
+    """
+    group_ids = Group.by_user_id(user.user_id, wrap=False)
+    loc_ids = user.sql_location.path if user.sql_location else []
+    return [
+        ('user', [user.user_id]),
+        ('group', group_ids),
+        ('location', loc_ids),
+    ]
+
+
 def _id_from_doc(doc_or_doc_id):
     if isinstance(doc_or_doc_id, str):
         doc_id = doc_or_doc_id
@@ -488,6 +508,14 @@ class FixtureOwnership(Document):
     owner_id = StringProperty()
     owner_type = StringProperty(choices=['user', 'group', 'location'])
 
+    def save(self, *args, **kwargs):
+        super(FixtureOwnership, self).save(*args, **kwargs)
+        get_user_fixture_version.clear(self.domain)
+
+    def delete(self, *args, **kwargs):
+        super(FixtureOwnership, self).delete(*args, **kwargs)
+        get_user_fixture_version.clear(self.domain)
+
     @classmethod
     def by_item_id(cls, item_id, domain):
         ownerships = cls.view('fixtures/ownership',
@@ -16,6 +16,7 @@ from corehq.apps.fixtures.models import (
     FixtureDataType,
     FixtureTypeField,
 )
+from corehq.apps.fixtures.utils import get_user_fixture_version
 from corehq.apps.users.models import Permissions
 
 
@@ -199,6 +200,7 @@ class LookupTableItemResource(CouchResourceMixin, HqBaseResource):
             raise NotFound('Lookup table item not found')
         with CouchTransaction() as transaction:
             data_item.recursive_delete(transaction)
+        get_user_fixture_version.clear(data_item.domain)
         return ImmediateHttpResponse(response=HttpAccepted())
 
     def obj_create(self, bundle, request=None, **kwargs):
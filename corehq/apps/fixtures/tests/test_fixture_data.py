@@ -2,6 +2,8 @@ from xml.etree import cElementTree as ElementTree
 
 from django.test import TestCase
 
+from mock import patch
+
 from casexml.apps.case.tests.util import check_xml_line_by_line
 from casexml.apps.phone.tests.utils import \
     call_fixture_generator as call_fixture_generator_raw
@@ -178,6 +180,23 @@ class FixtureDataTest(TestCase):
 
         self.fixture_ownership = self.data_item.add_user(self.user)
 
+    def test_cached_user_fixture(self):
+        restore_user = self.user.to_ota_restore_user()
+        fixture, = call_fixture_generator(restore_user)
+        self.assertEqual(1, len(fixture.findall('district_list/district')))
+
+        with patch.object(type(restore_user), 'get_fixture_data_items') as get_items:
+            fixture, = call_fixture_generator(restore_user)
+        get_items.assert_not_called()
+        self.assertEqual(self.user.user_id, fixture.attrib['user_id'])
+        self.assertEqual(1, len(fixture.findall('district_list/district')))
+
+        self.data_item.remove_user(self.user)
+        fixture, = call_fixture_generator(restore_user)
+        self.assertEqual(0, len(fixture.findall('district_list/district')))
+
+        self.fixture_ownership = self.data_item.add_user(self.user)
+
     def test_get_indexed_items(self):
         with self.assertRaises(FixtureVersionError):
             fixtures = FixtureDataItem.get_indexed_items(
@@ -1,4 +1,5 @@
 import re
+from datetime import datetime
 from xml.etree import cElementTree as ElementTree
 
 from celery.task import task
@@ -6,6 +7,7 @@ from celery.task import task
 from dimagi.utils.chunked import chunked
 
 from corehq.blobs import get_blob_db
+from corehq.util.quickcache import quickcache
 
 BAD_SLUG_PATTERN = r"([/\\<>\s])"
 
@@ -64,6 +66,16 @@ def get_index_schema_node(fixture_id, attrs_to_index):
 def clear_fixture_cache(domain):
     from corehq.apps.fixtures.models import FIXTURE_BUCKET
     get_blob_db().delete(key=FIXTURE_BUCKET + '/' + domain)
+    get_user_fixture_version.clear(domain)
+
+
+@quickcache(['domain'], timeout=60 * 24 * 60 * 60)
+def get_user_fixture_version(domain):
+    """Freshness token for the cached user fixture payloads of a domain
+
+    Clearing this invalidates every cached user fixture in the domain.
+    """
+    return datetime.utcnow().isoformat()
 
 
 @task(queue='background_queue')
@@ -14,7 +14,7 @@ from two_factor.models import PhoneDevice
 import settings
 from corehq.messaging.smsbackends.twilio.models import SQLTwilioBackend
 from corehq.project_limits.rate_limiter import RateLimiter, get_dynamic_rate_definition, \
-    RateDefinition
+    RateDefinition, allow_usage_many, report_usage_many
 from corehq.util.decorators import run_only_when, silence_and_report_error
 from corehq.util.global_request import get_request
 from corehq.util.metrics import metrics_counter, metrics_gauge
@@ -115,12 +115,13 @@ def rate_limit_two_factor_setup(device):
     method = device.method if isinstance(device, PhoneDevice) else None
 
     if ip_address and username and method:
-        if two_factor_setup_rate_limiter.allow_usage('ip:{}'.format(ip_address)) \
-                and two_factor_setup_rate_limiter.allow_usage('user:{}'.format(username)) \
-                and global_two_factor_setup_rate_limiter.allow_usage():
-            two_factor_setup_rate_limiter.report_usage('ip:{}'.format(ip_address))
-            two_factor_setup_rate_limiter.report_usage('user:{}'.format(username))
-            global_two_factor_setup_rate_limiter.report_usage()
+        rate_limiters_and_scopes = [
+            (two_factor_setup_rate_limiter, 'ip:{}'.format(ip_address)),
+            (two_factor_setup_rate_limiter, 'user:{}'.format(username)),
+            (global_two_factor_setup_rate_limiter, None),
+        ]
+        if allow_usage_many(rate_limiters_and_scopes):
+            report_usage_many(rate_limiters_and_scopes)
             status = _status_accepted
         else:
             status = _status_rate_limited
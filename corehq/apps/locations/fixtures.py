@@ -1,6 +1,8 @@
+import hashlib
 from collections import defaultdict
+from datetime import datetime
 from itertools import groupby
-from xml.etree.cElementTree import Element, SubElement
+from xml.etree.cElementTree import Element, SubElement, tostring
 
 from django.contrib.postgres.fields.array import ArrayField
 from django.db.models import IntegerField, Q
@@ -9,6 +11,8 @@ from django_cte import With
 from django_cte.raw import raw_cte_sql
 
 from casexml.apps.phone.fixtures import FixtureProvider
+from casexml.apps.phone.utils import GLOBAL_USER_ID
+from dimagi.utils.couch.cache.cache_core import get_redis_default_cache
 
 from corehq import toggles
 from corehq.apps.app_manager.const import (
@@ -24,6 +28,9 @@ from corehq.apps.locations.models import (
     LocationType,
     SQLLocation,
 )
+from corehq.util.quickcache import quickcache
+
+LOCATION_FIXTURE_CACHE_TIMEOUT = 24 * 60 * 60
 
 
 class LocationSet(object):
@@ -123,7 +130,106 @@ class LocationFixtureProvider(FixtureProvider):
             return []
 
         data_fields = _get_location_data_fields(restore_user.domain)
-        return self.serializer.get_xml_nodes(self.id, restore_user, locations_queryset, data_fields)
+        cache = get_redis_default_cache()
+        cache_key = _get_location_fixture_cache_key(self.id, restore_user, data_fields)
+        payload = None if restore_state.overwrite_cache else cache.get(cache_key)
+        if payload is None:
+            nodes = self.serializer.get_xml_nodes(self.id, restore_user, locations_queryset, data_fields)
+            payload = [_serialize_without_user_id(node) for node in nodes]
+            cache.set(cache_key, payload, timeout=LOCATION_FIXTURE_CACHE_TIMEOUT)
+
+        global_id = GLOBAL_USER_ID.encode('utf-8')
+        b_user_id = restore_user.user_id.encode('utf-8')
+        return [node.replace(global_id, b_user_id) for node in payload]
+
+
+def _serialize_without_user_id(node):
+    # users with the same assigned locations get the same fixture, so the
+    # cached payload uses a placeholder that is replaced on every restore
+    if 'user_id' in node.attrib:
+        node.set('user_id', GLOBAL_USER_ID)
+    return tostring(node, encoding='utf-8')
+
+
+def _get_location_fixture_cache_key(fixture_id, restore_user, data_fields):
+    """Cache key for the location fixture of users with the same assigned locations
+
+    The key changes when any location type in the domain changes. It also
+    changes when a location changes in one of the location trees that the
+    user is assigned to. If the fixture can include locations from other
+    trees, any location change in the domain changes the key.
+    """
+    domain = restore_user.domain
+    versions = [_get_location_types_version(domain)]
+    if toggles.SYNC_ALL_LOCATIONS.enabled(domain):
+        location_ids = ['*']
+        versions.append(_get_locations_version(domain))
+    else:
+        location_ids = sorted(restore_user.get_location_ids(domain))
+        if toggles.RELATED_LOCATIONS.enabled(domain) or _syncs_across_location_trees(domain):
+            versions.append(_get_locations_version(domain))
+        elif location_ids:
+            versions.extend(
+                _get_location_subtree_version(domain, root_id) for root_id in
+                sorted(_get_root_location_ids(Q(domain=domain, location_id__in=location_ids)))
+            )
+    hashable_key = ','.join([fixture_id, domain] + location_ids + versions + [
+        field.slug for field in data_fields
+    ])
+    return 'location-fixture:{}'.format(hashlib.md5(hashable_key.encode('utf-8')).hexdigest())
+
+
+def _get_root_location_ids(where):
+    return set(
+        SQLLocation.objects.get_ancestors(where)
+        .filter(parent_id__isnull=True)
+        .values_list('location_id', flat=True)
+    )
+
+
+def _get_new_version():
+    return datetime.utcnow().isoformat()
+
+
+@quickcache(['domain'], timeout=30 * 24 * 60 * 60)
+def _get_location_types_version(domain):
+    return _get_new_version()
+
+
+@quickcache(['domain'], timeout=30 * 24 * 60 * 60)
+def _get_locations_version(domain):
+    return _get_new_version()
+
+
+@quickcache(['domain', 'root_location_id'], timeout=30 * 24 * 60 * 60)
+def _get_location_subtree_version(domain, root_location_id):
+    return _get_new_version()
+
+
+@quickcache(['domain'], timeout=30 * 24 * 60 * 60)
+def _syncs_across_location_trees(domain):
+    # a type with include_without_expanding adds all locations of some
+    # level to the fixture, and a type that expands from root adds every
+    # location tree, regardless of the user's location tree
+    return LocationType.objects.filter(
+        Q(include_without_expanding__isnull=False) | Q(_expand_from_root=True),
+        domain=domain,
+    ).exists()
+
+
+def clear_location_fixture_cache(domain, where):
+    """Invalidate cached location fixtures that may include the locations
+    matching ``where``, a Q object. Call this before the locations are deleted.
+    """
+    for root_id in _get_root_location_ids(where):
+        _get_location_subtree_version.clear(domain, root_id)
+    _get_locations_version.clear(domain)
+
+
+def clear_location_type_fixture_cache(domain):
+    """Invalidate all cached location fixtures in the domain"""
+    _get_location_types_version.clear(domain)
+    _syncs_across_location_trees.clear(domain)
 
 
 class HierarchicalLocationSerializer(object):
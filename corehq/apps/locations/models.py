@@ -173,8 +173,15 @@ class LocationType(models.Model):
         if is_not_first_save:
             self.sync_administrative_status()
 
+        from .fixtures import clear_location_type_fixture_cache
+        clear_location_type_fixture_cache(self.domain)
         return saved
 
+    def delete(self, *args, **kwargs):
+        from .fixtures import clear_location_type_fixture_cache
+        super(LocationType, self).delete(*args, **kwargs)
+        clear_location_type_fixture_cache(self.domain)
+
     def sync_administrative_status(self, sync_supply_points=True):
         from .tasks import sync_administrative_status
         if self._administrative_old != self.administrative:
@@ -218,8 +225,10 @@ class LocationType(models.Model):
         if not objects:
             return []
 
+        from .fixtures import clear_location_type_fixture_cache
         cls._pre_bulk_save(objects)
         cls.objects.bulk_create(objects)
+        clear_location_type_fixture_cache(objects[0].domain)
         return list(objects)
 
     @classmethod
@@ -232,15 +241,20 @@ class LocationType(models.Model):
         for o in objects:
             o.last_modified = now
         # the caller should call 'sync_administrative_status' for individual objects
+        from .fixtures import clear_location_type_fixture_cache
         bulk_update_helper(objects)
+        if objects:
+            clear_location_type_fixture_cache(objects[0].domain)
 
     @classmethod
     def bulk_delete(cls, objects):
         # Given a list of existing SQL objects, bulk delete them
         if not objects:
             return
+        from .fixtures import clear_location_type_fixture_cache
         ids = [o.id for o in objects]
         cls.objects.filter(id__in=ids).delete()
+        clear_location_type_fixture_cache(objects[0].domain)
 
 
 class LocationQueriesMixin(object):
@@ -260,7 +274,14 @@ class LocationQueriesMixin(object):
 
     def delete(self, *args, **kwargs):
         from .document_store import publish_location_saved
-        for domain, location_id in self.values_list('domain', 'location_id'):
+        from .fixtures import clear_location_fixture_cache
+        locations = list(self.values_list('domain', 'id', 'location_id'))
+        for domain in {domain for domain, pk, location_id in locations}:
+            clear_location_fixture_cache(domain, Q(
+                domain=domain,
+                id__in=[pk for loc_domain, pk, location_id in locations if loc_domain == domain],
+            ))
+        for domain, pk, location_id in locations:
             publish_location_saved(domain, location_id, is_deletion=True)
         return super(LocationQueriesMixin, self).delete(*args, **kwargs)
 
@@ -373,6 +394,11 @@ class SQLLocation(AdjListModel):
     # This should really be the default location manager
     active_objects = OnlyUnarchivedLocationManager()
 
+    def __init__(self, *args, **kwargs):
+        super(SQLLocation, self).__init__(*args, **kwargs)
+        # don't trigger a query if parent_id was deferred
+        self._parent_id_old = self.__dict__.get('parent_id')
+
     def get_ancestor_of_type(self, type_code):
         """
         Returns the ancestor of given location_type_code of the location
@@ -390,6 +416,7 @@ class SQLLocation(AdjListModel):
     def save(self, *args, **kwargs):
         from corehq.apps.commtrack.models import sync_supply_point
         from .document_store import publish_location_saved
+        from .fixtures import clear_location_fixture_cache
 
         if not self.location_id:
             self.location_id = uuid.uuid4().hex
@@ -399,6 +426,11 @@ class SQLLocation(AdjListModel):
             sync_supply_point(self)
             super(SQLLocation, self).save(*args, **kwargs)
 
+        # the location tree it was moved out of also changes
+        clear_location_fixture_cache(self.domain, Q(domain=self.domain, id__in=[
+            pk for pk in [self.id, self._parent_id_old] if pk is not None
+        ]))
+        self._parent_id_old = self.parent_id
         publish_location_saved(self.domain, self.location_id)
 
     def delete(self, *args, **kwargs):
@@ -408,10 +440,12 @@ class SQLLocation(AdjListModel):
         """
         from .tasks import update_users_at_locations
         from .document_store import publish_location_saved
+        from .fixtures import clear_location_fixture_cache
 
         to_delete = self.get_descendants(include_self=True)
         for loc in to_delete:
             loc._remove_user()
+        clear_location_fixture_cache(self.domain, Q(domain=self.domain, id=self.id))
 
         super(SQLLocation, self).delete(*args, **kwargs)
         update_users_at_locations.delay(
@@ -812,6 +846,21 @@ class LocationRelation(models.Model):
     distance = models.PositiveSmallIntegerField(null=True)
     last_modified = models.DateTimeField(auto_now=True, db_index=True)
 
+    def save(self, *args, **kwargs):
+        super(LocationRelation, self).save(*args, **kwargs)
+        self._clear_location_fixture_cache()
+
+    def delete(self, *args, **kwargs):
+        super(LocationRelation, self).delete(*args, **kwargs)
+        self._clear_location_fixture_cache()
+
+    def _clear_location_fixture_cache(self):
+        from .fixtures import clear_location_fixture_cache
+        domain = self.location_a.domain
+        clear_location_fixture_cache(domain, Q(
+            domain=domain, location_id__in=[self.location_a_id, self.location_b_id]
+        ))
+
     @classmethod
     def from_locations(cls, locations):
         """Returns  a list of location_ids that have a relation to the list of locations passed in.
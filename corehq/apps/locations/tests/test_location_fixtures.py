@@ -10,10 +10,9 @@ import mock
 
 from casexml.apps.phone.models import SimplifiedSyncLog
 from casexml.apps.phone.restore import RestoreParams
-from casexml.apps.phone.tests.utils import (
-    call_fixture_generator,
-    create_restore_user,
-)
+from casexml.apps.phone.tests.utils import \
+    call_fixture_generator as call_fixture_generator_raw
+from casexml.apps.phone.tests.utils import create_restore_user
 
 from corehq.apps.app_manager.tests.util import (
     TestXmlMixin,
@@ -85,6 +84,11 @@ TEST_LOCATION_STRUCTURE = [
 ]
 
 
+def call_fixture_generator(*args, **kwargs):
+    return [ElementTree.fromstring(f) if isinstance(f, bytes) else f
+            for f in call_fixture_generator_raw(*args, **kwargs)]
+
+
 class FixtureHasLocationsMixin(TestXmlMixin):
     root = os.path.dirname(__file__)
     file_path = ['data']
@@ -192,6 +196,30 @@ class LocationFixturesTest(LocationHierarchyTestCase, FixtureHasLocationsMixin):
              'New York City', 'Manhattan', 'Queens', 'Brooklyn']
         )
 
+    @flag_enabled('HIERARCHICAL_LOCATION_FIXTURE')
+    def test_fixture_cache_shared_by_assigned_locations(self):
+        other_user = create_restore_user(self.domain, 'other-user', '123')
+        self.addCleanup(other_user._couch_user.delete, deleted_by=None)
+        for user in [self.user, other_user]:
+            user._couch_user.set_location(self.locations['Suffolk'])
+
+        serializer = location_fixture_generator.serializer
+        with mock.patch.object(serializer, 'get_xml_nodes', wraps=serializer.get_xml_nodes) as get_xml_nodes:
+            fixture, = call_fixture_generator(location_fixture_generator, self.user)
+            other_fixture, = call_fixture_generator(location_fixture_generator, other_user)
+            self.assertEqual(get_xml_nodes.call_count, 1)
+            self.assertEqual(fixture.attrib['user_id'], self.user.user_id)
+            self.assertEqual(other_fixture.attrib['user_id'], other_user.user_id)
+
+            # a change in another location tree keeps the cached fixture
+            self.locations['Manhattan'].save()
+            call_fixture_generator(location_fixture_generator, self.user)
+            self.assertEqual(get_xml_nodes.call_count, 1)
+
+            self.locations['Boston'].save()
+            call_fixture_generator(location_fixture_generator, other_user)
+            self.assertEqual(get_xml_nodes.call_count, 2)
+
     def test_all_locations_flag_returns_all_locations(self):
         with flag_enabled('SYNC_ALL_LOCATIONS'):
             self._assert_fixture_matches_file(
@@ -251,6 +279,21 @@ class LocationFixturesTest(LocationHierarchyTestCase, FixtureHasLocationsMixin):
              'Somerville', 'New York', 'New York City', 'Manhattan', 'Queens', 'Brooklyn']
         )
 
+    @flag_enabled('HIERARCHICAL_LOCATION_FIXTURE')
+    def test_expand_from_root_cache_includes_other_trees(self):
+        self.user._couch_user.set_location(self.locations['Boston'])
+        location_type = self.locations['Boston'].location_type
+        location_type.expand_from_root = True
+        location_type.save()
+
+        serializer = location_fixture_generator.serializer
+        with mock.patch.object(serializer, 'get_xml_nodes', wraps=serializer.get_xml_nodes) as get_xml_nodes:
+            call_fixture_generator(location_fixture_generator, self.user)
+            # the fixture includes every location tree
+            self.locations['Manhattan'].save()
+            call_fixture_generator(location_fixture_generator, self.user)
+            self.assertEqual(get_xml_nodes.call_count, 2)
+
     def test_expand_from_root_to_county(self):
         self.user._couch_user.set_location(self.locations['Massachusetts'])
         location_type = self.locations['Massachusetts'].location_type
@@ -1,8 +1,11 @@
+from xml.etree import cElementTree as ElementTree
+
 from django.test import TestCase
 
 from mock import patch
 
-from casexml.apps.phone.tests.utils import call_fixture_generator
+from casexml.apps.phone.tests.utils import \
+    call_fixture_generator as call_fixture_generator_raw
 
 from corehq.apps.commtrack.tests.util import bootstrap_location_types
 from corehq.apps.domain.shortcuts import create_domain
@@ -14,6 +17,11 @@ from ..fixtures import location_fixture_generator
 from .util import make_loc
 
 
+def call_fixture_generator(*args, **kwargs):
+    return [ElementTree.fromstring(f) if isinstance(f, bytes) else f
+            for f in call_fixture_generator_raw(*args, **kwargs)]
+
+
 @flag_enabled('HIERARCHICAL_LOCATION_FIXTURE')
 class LocationGroupTest(TestCase):
 
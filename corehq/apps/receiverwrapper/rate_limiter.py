@@ -5,6 +5,7 @@ from corehq.project_limits.rate_limiter import (
     RateDefinition,
     RateLimiter,
     get_dynamic_rate_definition,
+    report_usage_many,
 )
 from corehq.project_limits.shortcuts import get_standard_ratio_rate_definition
 from corehq.toggles import DO_NOT_RATE_LIMIT_SUBMISSIONS, \
@@ -71,12 +72,12 @@ SHOULD_RATE_LIMIT_SUBMISSIONS = settings.RATE_LIMIT_SUBMISSIONS and not settings
 @run_only_when(SHOULD_RATE_LIMIT_SUBMISSIONS)
 @silence_and_report_error("Exception raised in the submission rate limiter",
                           'commcare.xform_submissions.rate_limiter_errors')
-def rate_limit_submission(domain):
+def rate_limit_submission(domain, count=1):
     if TEST_FORM_SUBMISSION_RATE_LIMIT_RESPONSE.enabled(domain):
         return True
     should_allow_usage = (
-        global_submission_rate_limiter.allow_usage()
-        or submission_rate_limiter.allow_usage(domain))
+        global_submission_rate_limiter.allow_usage(delta=count)
+        or submission_rate_limiter.allow_usage(domain, delta=count))
 
     if should_allow_usage:
         allow_usage = True
@@ -85,10 +86,10 @@ def rate_limit_submission(domain):
         # but still delay and record whether they'd be rate limited under the 'test' metric
         allow_usage = True
         _delay_and_report_rate_limit_submission(
-            domain, max_wait=15, datadog_metric='commcare.xform_submissions.rate_limited.test')
+            domain, max_wait=15, datadog_metric='commcare.xform_submissions.rate_limited.test', count=count)
     else:
         allow_usage = _delay_and_report_rate_limit_submission(
-            domain, max_wait=15, datadog_metric='commcare.xform_submissions.rate_limited')
+            domain, max_wait=15, datadog_metric='commcare.xform_submissions.rate_limited', count=count)
 
     return not allow_usage
 
@@ -96,15 +97,17 @@ def rate_limit_submission(domain):
 @run_only_when(SHOULD_RATE_LIMIT_SUBMISSIONS)
 @silence_and_report_error("Exception raised reporting usage to the submission rate limiter",
                           'commcare.xform_submissions.report_usage_errors')
-def report_submission_usage(domain):
-    submission_rate_limiter.report_usage(domain)
-    global_submission_rate_limiter.report_usage()
+def report_submission_usage(domain, count=1):
+    report_usage_many([
+        (submission_rate_limiter, domain),
+        (global_submission_rate_limiter, None),
+    ], delta=count)
     _report_current_global_submission_thresholds()
 
 
-def _delay_and_report_rate_limit_submission(domain, max_wait, datadog_metric):
+def _delay_and_report_rate_limit_submission(domain, max_wait, datadog_metric, count=1):
     with TimingContext() as timer:
-        acquired = submission_rate_limiter.wait(domain, timeout=max_wait)
+        acquired = submission_rate_limiter.wait(domain, timeout=max_wait, delta=count)
     if acquired:
         duration_tag = bucket_value(timer.duration, [.5, 1, 5, 10, 15], unit='s')
     elif timer.duration < max_wait:
@@ -1,19 +1,26 @@
 import json
 import os
+import uuid
 from io import BytesIO
 
 from django.conf import settings
 from django.test import TestCase
 from django.test.client import Client
+from django.template.loader import render_to_string
 from django.test.utils import override_settings
 from django.urls import reverse
 
 from mock import patch
 
+from casexml.apps.case.mock import CaseBlock
+from couchforms.models import DefaultAuthContext
+
 from corehq.apps.domain.shortcuts import create_domain
 from corehq.apps.receiverwrapper.util import submit_form_locally
 from corehq.apps.users.models import CommCareUser
 from corehq.form_processor.interfaces.dbaccessors import FormAccessors, CaseAccessors
+from corehq.form_processor.interfaces.processor import FormProcessorInterface
+from corehq.form_processor.submission_post import BatchSubmissionPost, SubmissionPost
 from corehq.form_processor.tests.utils import (
     FormProcessorTestUtils,
     use_sql_backend,
@@ -305,3 +312,108 @@ class SubmissionSQLTransactionsTest(TestCase, TestFileMixin):
 
         transaction = result.cases[0].get_transaction_by_form_id(result.xform.form_id)
         self.assertTrue(transaction.is_form_transaction)
+
+
+@override_settings(TESTS_SHOULD_USE_SQL_BACKEND=True)
+class BatchSubmissionPostTest(TestCase):
+    domain = 'test-batch-submissions'
+
+    def tearDown(self):
+        FormProcessorTestUtils.delete_all_xforms(self.domain)
+        FormProcessorTestUtils.delete_all_cases(self.domain)
+        super(BatchSubmissionPostTest, self).tearDown()
+
+    def _get_form_xml(self, case_block):
+        return render_to_string('hqcase/xml/case_block.xml', {
+            'xmlns': 'http://commcarehq.org/test/batch',
+            'case_block': case_block.as_text(),
+            'time': '2020-01-01T00:00:00.000000Z',
+            'uid': uuid.uuid4().hex,
+            'username': 'batch',
+            'user_id': 'batch-user',
+            'device_id': 'batch-device',
+        })
+
+    def test_forms_share_case_cache(self):
+        case_id = uuid.uuid4().hex
+        instances = [
+            self._get_form_xml(CaseBlock(case_id, create=True, case_type='person', case_name='Ada')),
+            self._get_form_xml(CaseBlock(case_id, update={'age': '36'})),
+            self._get_form_xml(CaseBlock(case_id, close=True)),
+        ]
+        get_case_with_lock = FormProcessorInterface.get_case_with_lock
+        with patch.object(FormProcessorInterface, 'get_case_with_lock', autospec=True,
+                          side_effect=get_case_with_lock) as get_case:
+            results = BatchSubmissionPost(
+                instances, domain=self.domain, auth_context=DefaultAuthContext()
+            ).run()
+
+        self.assertEqual([result.submission_type for result in results], ['normal'] * 3)
+        self.assertEqual([result.response.status_code for result in results], [201] * 3)
+        self.assertEqual(get_case.call_count, 1)
+
+        case = CaseAccessors(self.domain).get_case(case_id)
+        self.assertEqual(case.get_case_property('age'), '36')
+        self.assertTrue(case.closed)
+        self.assertEqual(
+            {transaction.form_id for transaction in case.transactions},
+            {result.xform.form_id for result in results},
+        )
+
+    def test_error_in_batch(self):
+        case_id = uuid.uuid4().hex
+        instances = [
+            self._get_form_xml(CaseBlock(case_id, create=True, case_type='person', case_name='Ada')),
+            self._get_form_xml(CaseBlock('', update={'age': '36'}, strict=False)),
+            self._get_form_xml(CaseBlock(case_id, update={'age': '37'})),
+        ]
+        results = BatchSubmissionPost(
+            instances, domain=self.domain, auth_context=DefaultAuthContext()
+        ).run()
+
+        self.assertEqual([result.submission_type for result in results], ['normal', 'error', 'normal'])
+        case = CaseAccessors(self.domain).get_case(case_id)
+        self.assertEqual(case.get_case_property('age'), '37')
+
+    @patch('corehq.form_processor.submission_post.notify_exception')
+    def test_unexpected_error_in_batch(self, notify_exception):
+        case_id = uuid.uuid4().hex
+        instances = [
+            self._get_form_xml(CaseBlock(case_id, create=True, case_type='person', case_name='Ada')),
+            self._get_form_xml(CaseBlock(case_id, update={'age': '36'})),
+            self._get_form_xml(CaseBlock(case_id, update={'age': '37'})),
+        ]
+        with patch.object(SubmissionPost, '_invalidate_caches', side_effect=[None, Exception('boom'), None]):
+            results = BatchSubmissionPost(
+                instances, domain=self.domain, auth_context=DefaultAuthContext()
+            ).run()
+
+        self.assertEqual(
+            [result.submission_type for result in results],
+            ['normal', 'unexpected_error', 'normal'],
+        )
+        self.assertEqual([result.response.status_code for result in results], [201, 500, 201])
+        self.assertEqual(notify_exception.call_count, 1)
+        case = CaseAccessors(self.domain).get_case(case_id)
+        self.assertEqual(case.get_case_property('age'), '37')
+
+    def test_case_locks_refreshed(self):
+        case_id = uuid.uuid4().hex
+        instances = [
+            self._get_form_xml(CaseBlock(case_id, create=True, case_type='person', case_name='Ada')),
+            self._get_form_xml(CaseBlock(case_id, update={'age': '36'})),
+            self._get_form_xml(CaseBlock(case_id, update={'age': '37'})),
+        ]
+        get_case_with_lock = FormProcessorInterface.get_case_with_lock
+        with patch.object(BatchSubmissionPost, 'CASE_LOCK_REFRESH_SECONDS', -1), \
+                patch.object(FormProcessorInterface, 'get_case_with_lock', autospec=True,
+                             side_effect=get_case_with_lock) as get_case:
+            results = BatchSubmissionPost(
+                instances, domain=self.domain, auth_context=DefaultAuthContext()
+            ).run()
+
+        self.assertEqual([result.submission_type for result in results], ['normal'] * 3)
+        # the case is reloaded, and locked again, by every form
+        self.assertEqual(get_case.call_count, 3)
+        case = CaseAccessors(self.domain).get_case(case_id)
+        self.assertEqual(case.get_case_property('age'), '37')
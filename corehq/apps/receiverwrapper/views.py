@@ -28,6 +28,7 @@ from corehq.apps.domain.decorators import (
     login_or_basic_ex,
     login_or_digest_ex,
     login_or_api_key_ex,
+    mobile_auth,
     two_factor_exempt,
 )
 from corehq.apps.locations.permissions import location_safe
@@ -46,7 +47,7 @@ from corehq.apps.receiverwrapper.util import (
 )
 from corehq.form_processor.exceptions import XFormLockError
 from corehq.form_processor.interfaces.dbaccessors import CaseAccessors
-from corehq.form_processor.submission_post import SubmissionPost
+from corehq.form_processor.submission_post import BatchSubmissionPost, SubmissionPost
 from corehq.form_processor.utils import (
     convert_xform_to_json,
     should_use_sql_backend,
@@ -354,3 +355,74 @@ def secure_post(request, domain, app_id=None):
         )
 
     return decorated_view(request, domain, app_id=app_id)
+
+
+@waf_allow('XSS_BODY')
+@location_safe
+@csrf_exempt
+@require_POST
+@check_domain_migration
+@mobile_auth
+@toggles.BATCH_FORM_SUBMISSIONS.required_decorator()
+def secure_post_batch(request, domain):
+    """
+    Process several forms in one request. Each form is sent as its own
+    ``xml_submission_file`` part of a multipart request; forms with
+    multimedia attachments must be submitted individually.
+
+    The response holds the usual OpenRosa response for each form, in the
+    order the forms were sent. Every form in the batch counts towards the
+    submission rate limit.
+    """
+    if not should_use_sql_backend(domain):
+        return HttpResponseBadRequest('Batch submissions are not supported for this project')
+
+    if list(request.POST) or set(request.FILES) != {MAGIC_PROPERTY}:
+        return HttpResponseBadRequest(
+            'Batch submissions must only contain {} parts'.format(MAGIC_PROPERTY)
+        )
+
+    parts = request.FILES.getlist(MAGIC_PROPERTY)
+    if len(parts) > BatchSubmissionPost.MAX_FORMS:
+        return HttpResponseBadRequest(
+            'Batch submissions can contain at most {} forms'.format(BatchSubmissionPost.MAX_FORMS)
+        )
+
+    if rate_limit_submission(domain, count=len(parts)):
+        return HttpTooManyRequests()
+
+    metric_tags = {'backend': 'sql', 'domain': domain}
+
+    if toggles.FORM_SUBMISSION_BLACKLIST.enabled(domain):
+        response = openrosa_response.BLACKLISTED_RESPONSE
+        _record_metrics(metric_tags, 'blacklisted', response)
+        return response
+
+    instances = [part.read() for part in parts]
+    user_id = request.couch_user.get_id
+    batch = BatchSubmissionPost(
+        instances,
+        domain=domain,
+        auth_context=AuthContext(
+            domain=domain,
+            user_id=user_id,
+            authenticated=True,
+        ),
+        location=couchforms.get_location(request),
+        received_on=couchforms.get_received_on(request),
+        date_header=couchforms.get_date_header(request),
+        path=couchforms.get_path(request),
+        submit_ip=couchforms.get_submit_ip(request),
+        last_sync_token=couchforms.get_last_sync_token(request),
+        openrosa_headers=couchforms.get_openrosa_headers(request),
+    )
+
+    results = batch.run()
+    for result in results:
+        if result.submission_type == 'locked':
+            metrics_counter('commcare.xformlocked.count', tags={
+                'domain': domain, 'authenticated': True
+            })
+        _record_metrics(dict(metric_tags), result.submission_type, result.response, xform=result.xform)
+
+    return openrosa_response.get_openrosa_batch_response([result.response for result in results])
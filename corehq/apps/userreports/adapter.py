@@ -82,6 +82,12 @@ class IndicatorAdapter(object):
     def save_rows(self, rows, use_shard_col=True):
         raise NotImplementedError
 
+    def bulk_load_rows(self, rows):
+        """
+        Like save rows, but optimised for saving a large number of rows at once.
+        """
+        self.save_rows(rows)
+
     def bulk_save(self, docs):
         """
         Evalutes UCR rows for given docs and saves the result in bulk.
@@ -99,6 +105,12 @@ class IndicatorAdapter(object):
     def delete(self, doc, use_shard_col=True):
         raise NotImplementedError
 
+    def update_columns(self, values_by_doc_id):
+        """
+        Set some of the columns of the rows already saved for the given docs.
+        """
+        raise NotImplementedError
+
     @property
     def run_asynchronous(self):
         return self.config.asynchronous
@@ -182,10 +194,18 @@ class IndicatorAdapterLoadTracker(object):
         self._track_load(len(rows))
         self.adapter.save_rows(rows, use_shard_col)
 
+    def bulk_load_rows(self, rows):
+        self._track_load(len(rows))
+        self.adapter.bulk_load_rows(rows)
+
     def delete(self, doc, use_shard_col=True):
         self._track_load()
         self.adapter.delete(doc, use_shard_col)
 
+    def update_columns(self, values_by_doc_id):
+        self._track_load(len(values_by_doc_id))
+        self.adapter.update_columns(values_by_doc_id)
+
     def get_distinct_values(self, column, limit):
         distinct_values, too_many_values = self.adapter.get_distinct_values(column, limit)
         self._track_load(len(distinct_values))
@@ -49,16 +49,20 @@ def ucr_context_cache(vary_on=()):
         assert 'context' in fn.__code__.co_varnames
         assert isinstance(vary_on, tuple)
 
+        # shamelessly stolen from quickcache
+        # The key prefix and argument lookups are worked out once here rather
+        # than on every call since this wraps expressions evaluated per document.
+        prefix = '{}.{}'.format(
+            fn.__name__[:40] + (fn.__name__[40:] and '..'),
+            hashlib.md5(inspect.getsource(fn).encode('utf-8')).hexdigest()[-8:]
+        )
+        get_context = _arg_getter(fn, 'context')
+        vary_on_getters = [_arg_getter(fn, arg_name) for arg_name in vary_on]
+
         @wraps(fn)
         def _inner(*args, **kwargs):
-            # shamelessly stolen from quickcache
-            callargs = inspect.getcallargs(fn, *args, **kwargs)
-            context = callargs['context']
-            prefix = '{}.{}'.format(
-                fn.__name__[:40] + (fn.__name__[40:] and '..'),
-                hashlib.md5(inspect.getsource(fn).encode('utf-8')).hexdigest()[-8:]
-            )
-            cache_key = (prefix,) + tuple(callargs[arg_name] for arg_name in vary_on)
+            context = get_context(args, kwargs)
+            cache_key = (prefix,) + tuple(getter(args, kwargs) for getter in vary_on_getters)
             if context.exists_in_cache(cache_key):
                 return context.get_cache_value(cache_key)
             res = fn(*args, **kwargs)
@@ -66,3 +70,23 @@ def ucr_context_cache(vary_on=()):
             return res
         return _inner
     return decorator
+
+
+def _arg_getter(fn, arg_name):
+    """
+    Return a function that gets the value of ``fn``'s ``arg_name`` parameter
+    from a call's ``(args, kwargs)``
+    """
+    parameters = inspect.signature(fn).parameters
+    index = list(parameters).index(arg_name)
+    default = parameters[arg_name].default
+
+    def _get(args, kwargs):
+        if index < len(args):
+            return args[index]
+        if arg_name in kwargs:
+            return kwargs[arg_name]
+        if default is inspect.Parameter.empty:
+            raise TypeError('{}() missing required argument: {!r}'.format(fn.__name__, arg_name))
+        return default
+    return _get
@@ -1,3 +1,6 @@
+import hashlib
+import json
+
 from jsonobject.base_properties import DefaultProperty
 from simpleeval import InvalidExpression
 import textwrap
@@ -8,6 +11,7 @@ from dimagi.ext.jsonobject import (
     ListProperty,
     StringProperty,
 )
+from dimagi.utils.web import json_handler
 from pillowtop.dao.exceptions import DocumentNotFoundError
 
 from corehq.apps.change_feed.data_sources import (
@@ -207,17 +211,35 @@ class NamedExpressionSpec(JsonObject):
         if self.name not in context.named_expressions:
             raise BadSpecError('Name {} not found in list of named expressions!'.format(self.name))
         self._context = context
+        # Results are cached by the definition of the expression rather than
+        # its name so that data sources that define the same named expression
+        # share its result for a document.
+        definition = _resolve_named_expressions(
+            context.named_expressions[self.name].to_json(), context.named_expressions
+        )
+        self._definition_key = hashlib.md5(
+            json.dumps(definition, sort_keys=True, default=json_handler).encode('utf-8')
+        ).hexdigest()
 
-    def _context_cache_key(self, item):
-        return 'named_expression-{}-{}'.format(self.name, id(item))
+    def _context_cache_key(self, item, context):
+        if item is context.root_doc:
+            return ('named_expression', self._definition_key, context.iteration)
+        return 'named_expression-{}-{}'.format(self._definition_key, id(item))
 
     def __call__(self, item, context=None):
-        key = self._context_cache_key(item)
-        if context and context.exists_in_cache(key):
+        if not context:
+            return self._context.named_expressions[self.name](item, context)
+
+        key = self._context_cache_key(item, context)
+        if context.exists_in_cache(key):
             return context.get_cache_value(key)
 
         result = self._context.named_expressions[self.name](item, context)
-        if context:
+        if item is context.root_doc:
+            # the root doc outlives the iteration so this is kept for the
+            # whole document and reused by every data source
+            context.set_cache_value(key, result)
+        else:
             context.set_iteration_cache_value(key, result)
         return result
 
@@ -225,6 +247,17 @@ class NamedExpressionSpec(JsonObject):
         return "{}:{}".format(NAMED_EXPRESSION_PREFIX, self.name)
 
 
+def _resolve_named_expressions(spec, named_expressions):
+    """Replace references to named expressions in ``spec`` with their definitions"""
+    if isinstance(spec, dict):
+        if spec.get('type') == 'named' and spec.get('name') in named_expressions:
+            return _resolve_named_expressions(named_expressions[spec['name']].to_json(), named_expressions)
+        return {key: _resolve_named_expressions(value, named_expressions) for key, value in spec.items()}
+    if isinstance(spec, list):
+        return [_resolve_named_expressions(value, named_expressions) for value in spec]
+    return spec
+
+
 class ConditionalExpressionSpec(JsonObject):
     """
     This expression returns ``"legal" if doc["age"] > 21 else "underage"``:
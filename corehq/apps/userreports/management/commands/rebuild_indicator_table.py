@@ -10,13 +10,17 @@ class Command(BaseCommand):
         parser.add_argument('indicator_config_id')
         parser.add_argument('--in-place', action='store_true', dest='in_place', default=False,
                             help='Rebuild table in place (preserve existing data)')
+        parser.add_argument('--incremental', action='store_true', default=False,
+                            help='With --in-place, only process documents modified since the last '
+                                 'finished build (SQL case data sources only)')
         parser.add_argument('--initiated-by', action='store', required=True, dest='initiated',
                             help='Who initiated the rebuild (for sending email notifications)')
 
     def handle(self, indicator_config_id, **options):
         if options['in_place']:
             tasks.rebuild_indicators_in_place(
-                indicator_config_id, options['initiated'], source='rebuild_indicator_table'
+                indicator_config_id, options['initiated'], source='rebuild_indicator_table',
+                incremental=options['incremental']
             )
         else:
             tasks.rebuild_indicators(
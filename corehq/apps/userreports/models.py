@@ -1,4 +1,5 @@
 import glob
+import hashlib
 import json
 import os
 import re
@@ -169,6 +170,14 @@ class DataSourceBuildInformation(DocumentSchema):
     finished_in_place = BooleanProperty(default=False)
     initiated_in_place = DateTimeProperty()
     rebuilt_asynchronously = BooleanProperty(default=False)
+    # Start time of the most recent build that finished. Every document modified before
+    # this time has been processed, so an incremental build only needs to process
+    # documents modified since.
+    processed_through = DateTimeProperty()
+    # Hashes of the parts of the data source's definition when processed_through was
+    # set (see DataSourceConfiguration.get_build_config_hashes). An incremental build
+    # uses them to work out which rows a definition change affects.
+    processed_through_config_hashes = DictProperty()
 
 
 class DataSourceMeta(DocumentSchema):
@@ -263,6 +272,36 @@ class DataSourceConfiguration(CachedCouchDocumentMixin, Document, AbstractUCRDat
     def data_source_id(self):
         return self._id
 
+    def get_build_config_hashes(self):
+        """
+        Hashes of the parts of the definition that determine which rows are
+        built from each document
+
+        :return: dict with the hash of the filter (``filter``), the hash of
+        each configured indicator by column ID (``columns``) and the hash of
+        everything else (``other``)
+        """
+        def _get_hash(value):
+            return hashlib.md5(
+                json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+            ).hexdigest()
+
+        return {
+            'filter': _get_hash(self.configured_filter),
+            'columns': {
+                indicator['column_id']: _get_hash(indicator)
+                for indicator in self.configured_indicators
+            },
+            'other': _get_hash([
+                self.referenced_doc_type,
+                self.base_item_expression,
+                self.named_expressions,
+                self.named_filters,
+                self.sql_settings.to_json(),
+                [validation.to_json() for validation in self.validations],
+            ]),
+        }
+
     def filter(self, document, eval_context=None):
         if eval_context is None:
             eval_context = EvaluationContext(document)
@@ -14,6 +14,7 @@ from pillowtop.pillow.interface import ConstructedPillow
 from pillowtop.processors import BulkPillowProcessor
 from pillowtop.utils import ensure_document_exists, ensure_matched_revisions, bulk_fetch_changes_docs
 
+from corehq.apps.aggregate_ucrs.changes import record_aggregate_changes
 from corehq.apps.change_feed.consumer.feed import (
     KafkaChangeFeed,
     KafkaCheckpointEventHandler,
@@ -358,6 +359,7 @@ class ConfigurableReportPillowProcessor(ConfigurableReportTableManagerMixin, Bul
         changes_by_id = {change.id: change for change in changes_chunk}
         to_delete_by_adapter = defaultdict(list)
         rows_to_save_by_adapter = defaultdict(list)
+        doc_ids_to_save_by_adapter = defaultdict(set)
         async_configs_by_doc_id = defaultdict(list)
         to_update = {change for change in changes_chunk if not change.deleted}
         with self._metrics_timer('extract'):
@@ -380,6 +382,8 @@ class ConfigurableReportPillowProcessor(ConfigurableReportTableManagerMixin, Bul
                                         rows_to_save_by_adapter[adapter].extend(adapter.get_all_values(doc, eval_context))
                                     except Exception as e:
                                         change_exceptions.append((change, e))
+                                    else:
+                                        doc_ids_to_save_by_adapter[adapter].add(doc['_id'])
                                     eval_context.reset_iteration()
                             elif (doc_subtype is None
                                     or doc_subtype in adapter.config.get_case_type_or_xmlns_filter()):
@@ -395,10 +399,11 @@ class ConfigurableReportPillowProcessor(ConfigurableReportTableManagerMixin, Bul
                 if not delete_docs:
                     continue
                 with self._per_config_metrics_timer('delete', adapter.config._id):
+                    delete_ids = [doc['_id'] for doc in delete_docs]
                     try:
-                        adapter.bulk_delete(delete_docs)
+                        with record_aggregate_changes(adapter, delete_ids):
+                            adapter.bulk_delete(delete_docs)
                     except Exception:
-                        delete_ids = [doc['_id'] for doc in delete_docs]
                         retry_changes.update([c for c in changes_chunk if c.id in delete_ids])
 
         with self._metrics_timer('single_batch_load'):
@@ -406,7 +411,8 @@ class ConfigurableReportPillowProcessor(ConfigurableReportTableManagerMixin, Bul
             for adapter, rows in rows_to_save_by_adapter.items():
                 with self._per_config_metrics_timer('load', adapter.config._id):
                     try:
-                        adapter.save_rows(rows)
+                        with record_aggregate_changes(adapter, doc_ids_to_save_by_adapter[adapter]):
+                            adapter.save_rows(rows)
                     except Exception:
                         retry_changes.update(to_update)
 
@@ -454,7 +460,8 @@ class ConfigurableReportPillowProcessor(ConfigurableReportTableManagerMixin, Bul
         if change.deleted:
             adapters = list(self.table_adapters_by_domain[domain])
             for table in adapters:
-                table.delete({'_id': change.metadata.document_id})
+                with record_aggregate_changes(table, [change.metadata.document_id]):
+                    table.delete({'_id': change.metadata.document_id})
 
         async_tables = []
         doc = change.get_document()
@@ -474,11 +481,13 @@ class ConfigurableReportPillowProcessor(ConfigurableReportTableManagerMixin, Bul
                     if table.run_asynchronous:
                         async_tables.append(table.config._id)
                     else:
-                        self._save_doc_to_table(domain, table, doc, eval_context)
+                        with record_aggregate_changes(table, [doc['_id']]):
+                            self._save_doc_to_table(domain, table, doc, eval_context)
                         eval_context.reset_iteration()
                 elif (doc_subtype is None
                         or doc_subtype in table.config.get_case_type_or_xmlns_filter()):
-                    table.delete(doc)
+                    with record_aggregate_changes(table, [doc['_id']]):
+                        table.delete(doc)
 
             if async_tables:
                 AsyncIndicator.update_from_kafka_change(change, async_tables)
@@ -11,6 +11,12 @@ from corehq.apps.userreports.exceptions import InvalidQueryColumn
 from corehq.apps.userreports.mixins import ConfigurableReportDataSourceMixin
 from corehq.apps.userreports.reports.sorting import ASCENDING
 from corehq.apps.userreports.reports.specs import CalculatedColumn
+from corehq.apps.userreports.sql.page_query import get_page_with_totals
+from corehq.apps.userreports.sql.query_cache import (
+    get_cached_query_result,
+    get_query_cache_key,
+    set_cached_query_result,
+)
 from corehq.sql_db.connections import connection_manager
 
 
@@ -58,6 +64,45 @@ class ConfigurableReportSqlDataSource(ConfigurableReportDataSourceMixin, SqlData
         # This explicitly only includes columns that resolve to database queries.
         return [c for c in self.inner_columns if not isinstance(c, CalculatedColumn)]
 
+    def _get_query_cache_key(self, query_type, args, query_strings=None):
+        if query_strings is None:
+            query_strings = self.get_query_strings()
+        key_parts = [query_type, args, query_strings, self.filter_values]
+        return get_query_cache_key(self.engine_id, self.table_name, key_parts)
+
+    def _get_cached_query_result(self, query_type, args, run_query):
+        """
+        Returns the result of run_query(), or the result of the same query
+        from the cache if it has run since the data source's table changed
+        """
+        return get_cached_query_result(self._get_query_cache_key(query_type, args), run_query)
+
+    def _get_data(self, start=None, limit=None):
+        query_strings = self.get_query_strings()
+        count_key = self._get_query_cache_key('count', [], query_strings)
+        totals_key = self._get_query_cache_key('totals', self.total_column_ids, query_strings)
+
+        def _get_page():
+            # Fetch the total records and total row with the page, and cache
+            # them for get_total_records() and get_total_row()
+            qc = self.query_context(start=start, limit=limit)
+            session_helper = connection_manager.get_session_helper(self.engine_id, readonly=True)
+            with session_helper.session_context() as session:
+                result = get_page_with_totals(qc, session.connection(), self.filter_values, self.total_column_ids)
+            if result is None:
+                return super(ConfigurableReportSqlDataSource, self)._get_data(start=start, limit=limit)
+
+            data, total_records, totals = result
+            if total_records is not None:
+                set_cached_query_result(count_key, total_records)
+                set_cached_query_result(totals_key, totals)
+            return data
+
+        return get_cached_query_result(
+            self._get_query_cache_key('data', [start, limit], query_strings),
+            _get_page,
+        )
+
     @memoized
     @method_decorator(catch_and_raise_exceptions)
     def get_data(self, start=None, limit=None):
@@ -81,10 +126,13 @@ class ConfigurableReportSqlDataSource(ConfigurableReportDataSourceMixin, SqlData
 
     @method_decorator(catch_and_raise_exceptions)
     def get_total_records(self):
-        qc = self.query_context()
-        session_helper = connection_manager.get_session_helper(self.engine_id, readonly=True)
-        with session_helper.session_context() as session:
-            return qc.count(session.connection(), self.filter_values)
+        def _count():
+            qc = self.query_context()
+            session_helper = connection_manager.get_session_helper(self.engine_id, readonly=True)
+            with session_helper.session_context() as session:
+                return qc.count(session.connection(), self.filter_values)
+
+        return self._get_cached_query_result('count', [], _count)
 
     @method_decorator(catch_and_raise_exceptions)
     def get_total_row(self):
@@ -95,14 +143,17 @@ class ConfigurableReportSqlDataSource(ConfigurableReportDataSourceMixin, SqlData
                 return 0
             return ''
 
-        qc = self.query_context()
-        session_helper = connection_manager.get_session_helper(self.engine_id, readonly=True)
-        with session_helper.session_context() as session:
-            totals = qc.totals(
-                session.connection(),
-                self.total_column_ids,
-                self.filter_values
-            )
+        def _totals():
+            qc = self.query_context()
+            session_helper = connection_manager.get_session_helper(self.engine_id, readonly=True)
+            with session_helper.session_context() as session:
+                return qc.totals(
+                    session.connection(),
+                    self.total_column_ids,
+                    self.filter_values
+                )
+
+        totals = self._get_cached_query_result('totals', self.total_column_ids, _totals)
 
         total_row = [
             _clean_total_row(totals.get(column_id), col)
@@ -0,0 +1,102 @@
+"""
+Fetch a page of a report, its total number of records and its total row
+in one query.
+
+sqlagg's QueryContext runs a query for each of these, and each one groups
+the same filtered rows. Here the grouped rows are a CTE, and the count
+and totals are window functions over it, so they are calculated before
+the page is limited, with one scan of the table.
+"""
+from collections import OrderedDict
+
+import sqlalchemy
+from sqlagg.base import SimpleQueryMeta
+
+TOTAL_RECORDS = '__total_records'
+
+
+def _get_total_label(index):
+    return '__total_{}'.format(index)
+
+
+def _get_query_meta(query_context):
+    """
+    Returns the QueryContext's only query if it can be combined, or None
+    """
+    query_metas = list(query_context.query_meta.values())
+    if len(query_metas) != 1:
+        # columns with their own filters or tables are separate queries
+        return None
+    query_meta = query_metas[0]
+    if type(query_meta) is not SimpleQueryMeta:
+        # column types that build their own queries
+        return None
+    if not query_meta.group_by or query_meta.distinct_on:
+        # DISTINCT ON depends on the order of the rows in the grouped query
+        return None
+    return query_meta
+
+
+def get_page_with_totals(query_context, connection, filter_values, total_columns):
+    """
+    Returns (data, total_records, totals), where data is in the format
+    returned by QueryContext.resolve(), total_records is the result of
+    QueryContext.count(), and totals is the result of
+    QueryContext.totals() for total_columns.
+
+    total_records and totals are None if the page is past the last record.
+
+    Returns None if the query context can't be fetched in one query.
+    """
+    query_meta = _get_query_meta(query_context)
+    if query_meta is None:
+        return None
+
+    query_meta._check()
+    labels = [column.label for column in query_meta.columns]
+    if not all(order_by.column_name in labels for order_by in query_meta.order_by):
+        return None
+    if not all(column in labels for column in total_columns):
+        return None
+
+    grouped = query_meta._build_query_generic(
+        query_meta.columns, query_meta.group_by, query_meta.filters, query_meta.distinct_on
+    ).cte('grouped')
+    windows = [sqlalchemy.func.count().over().label(TOTAL_RECORDS)]
+    windows.extend(
+        sqlalchemy.func.sum(grouped.c[column]).over().label(_get_total_label(index))
+        for index, column in enumerate(total_columns)
+    )
+    query = sqlalchemy.select([grouped.c[label] for label in labels] + windows)
+    for order_by in query_meta.order_by:
+        query = query.order_by(order_by.build_expression())
+    if query_meta.start is not None:
+        query = query.offset(query_meta.start)
+    if query_meta.limit is not None:
+        query = query.limit(query_meta.limit)
+
+    rows = connection.execute(query, **filter_values).fetchall()
+
+    data = OrderedDict()
+    for row in rows:
+        if len(query_meta.group_by) == 1:
+            row_key = row[query_meta.group_by[0]]
+        else:
+            row_key = tuple(row[group] for group in query_meta.group_by)
+        if row_key is None:
+            # as QueryContext.resolve()
+            row_key = ''
+        data.setdefault(row_key, {}).update((label, row[label]) for label in labels)
+
+    if rows:
+        total_records = rows[0][TOTAL_RECORDS]
+        totals = {
+            column: rows[0][_get_total_label(index)]
+            for index, column in enumerate(total_columns)
+        }
+    elif not query_meta.start:
+        total_records = 0
+        totals = {column: None for column in total_columns}
+    else:
+        total_records = totals = None
+    return data, total_records, totals
@@ -0,0 +1,65 @@
+"""
+A cache of the results of report queries against UCR tables.
+
+Each UCR table has a version in Redis, which is incremented whenever the
+table's rows are written by its adapter. Query results are cached under
+a key that includes the version, so a write makes the results cached
+before it unreachable, and they expire.
+
+Results are also cached for at most UCR_QUERY_CACHE_TIMEOUT, which bounds
+how stale a result can be if it was read from a replica that had not yet
+caught up with a write, or if a table was changed without its adapter.
+"""
+import hashlib
+import json
+
+from django.core.cache import cache
+
+from dimagi.utils.couch import get_redis_client
+
+UCR_QUERY_CACHE_TIMEOUT = 5 * 60
+
+
+def _get_client():
+    return get_redis_client().client.get_client()
+
+
+def _get_version_key(table_name):
+    return 'ucr-table-version-{}'.format(table_name)
+
+
+def get_table_version(table_name):
+    return int(_get_client().get(_get_version_key(table_name)) or 0)
+
+
+def bump_table_version(table_name):
+    _get_client().incr(_get_version_key(table_name))
+
+
+def get_query_cache_key(engine_id, table_name, key_parts):
+    """
+    :param key_parts: JSON-serializable values that identify the query,
+    like its SQL and its parameters
+    """
+    key = json.dumps([engine_id, table_name, key_parts], sort_keys=True, default=str)
+    return 'ucr-query-{}-{}-{}'.format(
+        table_name,
+        get_table_version(table_name),
+        hashlib.md5(key.encode('utf-8')).hexdigest(),
+    )
+
+
+def get_cached_query_result(cache_key, run_query):
+    """
+    :param run_query: A function that runs the query, called if its
+    result is not cached
+    """
+    result = cache.get(cache_key)
+    if result is None:
+        result = run_query()
+        set_cached_query_result(cache_key, result)
+    return result
+
+
+def set_cached_query_result(cache_key, result):
+    cache.set(cache_key, result, UCR_QUERY_CACHE_TIMEOUT)
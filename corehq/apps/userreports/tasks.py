@@ -1,5 +1,5 @@
 import logging
-from collections import defaultdict
+from collections import defaultdict, namedtuple
 from datetime import datetime, timedelta
 
 from django.conf import settings
@@ -44,6 +44,8 @@ from corehq.apps.userreports.const import (
 from corehq.apps.userreports.exceptions import (
     StaticDataSourceConfigurationNotFoundError,
 )
+from corehq.apps.userreports.indicators import CompoundIndicator
+from corehq.apps.userreports.indicators.factory import IndicatorFactory
 from corehq.apps.userreports.models import (
     AsyncIndicator,
     DataSourceConfiguration,
@@ -51,16 +53,23 @@ from corehq.apps.userreports.models import (
     get_report_config,
     id_is_static,
 )
-from corehq.apps.userreports.rebuild import DataSourceResumeHelper
+from corehq.apps.userreports.rebuild import (
+    DataSourceResumeHelper,
+    get_table_diffs,
+    get_tables_rebuild_migrate,
+    migrate_tables,
+)
 from corehq.apps.userreports.reports.data_source import (
     ConfigurableReportDataSource,
 )
 from corehq.apps.userreports.specs import EvaluationContext
+from corehq.apps.userreports.sql.adapter import get_metadata
 from corehq.apps.userreports.util import (
     get_async_indicator_modify_lock_key,
     get_indicator_adapter,
 )
 from corehq.elastic import ESError
+from corehq.form_processor.utils.general import should_use_sql_backend
 from corehq.util.context_managers import notify_someone
 from corehq.util.decorators import serial_task
 from corehq.util.timer import TimingContext
@@ -68,6 +77,9 @@ from corehq.util.view_utils import reverse
 
 celery_task_logger = logging.getLogger('celery.task')
 
+# What an incremental build of a data source needs to update, see _get_incremental_build
+IncrementalBuild = namedtuple('IncrementalBuild', ['modified_since', 'filter_changed', 'added_column_ids'])
+
 
 def _get_config_by_id(indicator_config_id):
     if id_is_static(indicator_config_id):
@@ -79,13 +91,29 @@ def _get_config_by_id(indicator_config_id):
 def _build_indicators(config, document_store, relevant_ids):
     adapter = get_indicator_adapter(config, raise_errors=True, load_source='build_indicators')
 
+    rows = []
+    docs_with_rows = []
     for doc in document_store.iter_documents(relevant_ids):
         if config.asynchronous:
             AsyncIndicator.update_record(
                 doc.get('_id'), config.referenced_doc_type, config.domain, [config._id]
             )
         else:
-            # save is a noop if the filter doesn't match
+            # no rows are returned if the filter doesn't match
+            try:
+                doc_rows = adapter.get_all_values(doc)
+            except Exception as e:
+                adapter.handle_exception(doc, e)
+            else:
+                if doc_rows:
+                    rows.extend(doc_rows)
+                    docs_with_rows.append(doc)
+
+    try:
+        adapter.bulk_load_rows(rows)
+    except Exception:
+        # save one by one so that errors are attributed to the right docs
+        for doc in docs_with_rows:
             adapter.best_effort_save(doc)
 
 
@@ -123,13 +151,21 @@ def rebuild_indicators(indicator_config_id, initiated_by=None, limit=-1, source=
 
 
 @task(serializer='pickle', queue=UCR_CELERY_QUEUE, ignore_result=True)
-def rebuild_indicators_in_place(indicator_config_id, initiated_by=None, source=None):
+def rebuild_indicators_in_place(indicator_config_id, initiated_by=None, source=None, incremental=False):
+    """
+    :param incremental: Only process documents modified since the last finished build
+    (see ``DataSourceBuildInformation.processed_through``) and the rows affected by
+    changes to the filter or new columns since. Falls back to processing every
+    document if that isn't known, other parts of the data source's definition have
+    changed, or the data source isn't based on SQL cases.
+    """
     config = _get_config_by_id(indicator_config_id)
     success = _('Your UCR table {} has finished rebuilding in {}').format(config.table_id, config.domain)
     failure = _('There was an error rebuilding Your UCR table {} in {}.').format(config.table_id, config.domain)
     send = toggles.SEND_UCR_REBUILD_INFO.enabled(initiated_by)
     with notify_someone(initiated_by, success_message=success, error_message=failure, send=send):
         adapter = get_indicator_adapter(config)
+        incremental_build = _get_incremental_build(config) if incremental else None
         if not id_is_static(indicator_config_id):
             config.meta.build.initiated_in_place = datetime.utcnow()
             config.meta.build.finished_in_place = False
@@ -137,7 +173,106 @@ def rebuild_indicators_in_place(indicator_config_id, initiated_by=None, source=N
             config.save()
 
         adapter.build_table(initiated_by=initiated_by, source=source)
-        _iteratively_build_table(config, in_place=True)
+        if incremental_build and incremental_build.added_column_ids:
+            if not _add_new_columns(adapter, source):
+                incremental_build = None
+        if incremental_build:
+            _update_unmodified_rows(config, incremental_build)
+        _iteratively_build_table(config, in_place=True, incremental_build=incremental_build)
+
+
+def _get_incremental_build(config):
+    """
+    Compare the data source's definition with the one used by the last finished
+    build to work out what an incremental build needs to update
+
+    :return: ``IncrementalBuild`` or ``None`` if every document must be processed
+    """
+    if id_is_static(config._id) or config.referenced_doc_type != 'CommCareCase':
+        return None
+    if not should_use_sql_backend(config.domain):
+        return None
+    build_hashes = config.meta.build.processed_through_config_hashes
+    if not config.meta.build.processed_through or not build_hashes:
+        return None
+
+    config_hashes = config.get_build_config_hashes()
+    if config_hashes['other'] != build_hashes['other']:
+        return None
+    if any(config_hashes['columns'].get(column_id) != column_hash
+           for column_id, column_hash in build_hashes['columns'].items()):
+        # a column was changed or removed
+        return None
+    added_column_ids = [
+        column_id for column_id in config_hashes['columns']
+        if column_id not in build_hashes['columns']
+    ]
+    if added_column_ids and config.base_item_expression:
+        # new columns are filled in one row per document
+        return None
+    return IncrementalBuild(
+        modified_since=config.meta.build.processed_through,
+        filter_changed=config_hashes['filter'] != build_hashes['filter'],
+        added_column_ids=added_column_ids,
+    )
+
+
+def _add_new_columns(adapter, source):
+    """
+    Add the new columns of the data source to its tables
+
+    :return: ``False`` if the tables have other changes that can't be migrated
+    """
+    adapters = getattr(adapter, 'all_adapters', None) or [adapter]
+    diffs_by_adapter = []
+    for adapter_ in adapters:
+        table_name = adapter_.get_table().name
+        diffs = get_table_diffs(adapter_.engine, [table_name], get_metadata(adapter_.engine_id))
+        if get_tables_rebuild_migrate(diffs).rebuild:
+            return False
+        diffs_by_adapter.append((adapter_, diffs))
+
+    for adapter_, diffs in diffs_by_adapter:
+        for diff_dicts in migrate_tables(adapter_.engine, diffs).values():
+            adapter_.log_table_migrate(source=source, diffs=diff_dicts)
+    return True
+
+
+def _update_unmodified_rows(config, incremental_build):
+    """
+    Delete the rows of documents that a changed filter no longer matches and
+    fill in new columns for the rest. Rows of documents modified since the last
+    build are rebuilt afterwards anyway.
+    """
+    if not (incremental_build.filter_changed or incremental_build.added_column_ids):
+        return
+
+    adapter = get_indicator_adapter(config, raise_errors=True, load_source='build_indicators')
+    document_store = get_document_store_for_doc_type(
+        config.domain, config.referenced_doc_type, load_source="build_indicators",
+    )
+    new_indicators = CompoundIndicator(
+        config.display_name,
+        [
+            IndicatorFactory.from_spec(indicator, config.get_factory_context())
+            for indicator in config.configured_indicators
+            if indicator['column_id'] in incremental_build.added_column_ids
+        ],
+        None,
+    )
+
+    for doc_ids in adapter.iter_doc_id_chunks(ID_CHUNK_SIZE):
+        docs_to_delete = []
+        values_by_doc_id = {}
+        for doc in document_store.iter_documents(doc_ids):
+            eval_context = EvaluationContext(doc)
+            if incremental_build.filter_changed and not config.filter(doc, eval_context):
+                docs_to_delete.append(doc)
+            elif new_indicators.indicators:
+                values_by_doc_id[doc['_id']] = new_indicators.get_values(doc, eval_context)
+        if docs_to_delete:
+            adapter.bulk_delete(docs_to_delete)
+        adapter.update_columns(values_by_doc_id)
 
 
 @task(serializer='pickle', queue=UCR_CELERY_QUEUE, ignore_result=True, acks_late=True)
@@ -156,7 +291,7 @@ def resume_building_indicators(indicator_config_id, initiated_by=None):
         _iteratively_build_table(config, resume_helper)
 
 
-def _iteratively_build_table(config, resume_helper=None, in_place=False, limit=-1):
+def _iteratively_build_table(config, resume_helper=None, in_place=False, limit=-1, incremental_build=None):
     resume_helper = resume_helper or DataSourceResumeHelper(config)
     indicator_config_id = config._id
     case_type_or_xmlns_list = config.get_case_type_or_xmlns_filter()
@@ -169,32 +304,42 @@ def _iteratively_build_table(config, resume_helper=None, in_place=False, limit=-
         ]
 
     for case_type_or_xmlns in case_type_or_xmlns_list:
-        relevant_ids = []
         document_store = get_document_store_for_doc_type(
             config.domain, config.referenced_doc_type,
             case_type_or_xmlns=case_type_or_xmlns,
             load_source="build_indicators",
+            modified_since=incremental_build.modified_since if incremental_build else None,
         )
-
-        for i, relevant_id in enumerate(document_store.iter_document_ids()):
-            if i >= limit > -1:
-                break
-            relevant_ids.append(relevant_id)
-            if len(relevant_ids) >= ID_CHUNK_SIZE:
-                _build_indicators(config, document_store, relevant_ids)
-                relevant_ids = []
-
-        if relevant_ids:
+        for relevant_ids in _iter_document_id_chunks(document_store, limit):
             _build_indicators(config, document_store, relevant_ids)
 
+        if incremental_build and incremental_build.filter_changed:
+            # documents that were not modified but that only the new filter matches
+            document_store = get_document_store_for_doc_type(
+                config.domain, config.referenced_doc_type,
+                case_type_or_xmlns=case_type_or_xmlns,
+                load_source="build_indicators",
+            )
+            adapter = get_indicator_adapter(config, load_source='build_indicators')
+            for relevant_ids in _iter_document_id_chunks(document_store):
+                existing_ids = adapter.get_existing_doc_ids(relevant_ids)
+                new_ids = [doc_id for doc_id in relevant_ids if doc_id not in existing_ids]
+                if new_ids:
+                    _build_indicators(config, document_store, new_ids)
+
         resume_helper.add_completed_case_type_or_xmlns(case_type_or_xmlns)
 
     resume_helper.clear_resume_info()
     if not id_is_static(indicator_config_id):
         if in_place:
             config.meta.build.finished_in_place = True
+            processed_through = config.meta.build.initiated_in_place
         else:
             config.meta.build.finished = True
+            processed_through = config.meta.build.initiated
+        if limit == -1:
+            config.meta.build.processed_through = processed_through
+            config.meta.build.processed_through_config_hashes = config.get_build_config_hashes()
         try:
             config.save()
         except ResourceConflict:
@@ -203,12 +348,34 @@ def _iteratively_build_table(config, resume_helper=None, in_place=False, limit=-
             if in_place:
                 if config.meta.build.initiated_in_place == current_config.meta.build.initiated_in_place:
                     current_config.meta.build.finished_in_place = True
+                    current_config.meta.build.processed_through = config.meta.build.processed_through
+                    current_config.meta.build.processed_through_config_hashes = (
+                        config.meta.build.processed_through_config_hashes
+                    )
             else:
                 if config.meta.build.initiated == current_config.meta.build.initiated:
                     current_config.meta.build.finished = True
+                    current_config.meta.build.processed_through = config.meta.build.processed_through
+                    current_config.meta.build.processed_through_config_hashes = (
+                        config.meta.build.processed_through_config_hashes
+                    )
             current_config.save()
 
 
+def _iter_document_id_chunks(document_store, limit=-1):
+    relevant_ids = []
+    for i, relevant_id in enumerate(document_store.iter_document_ids()):
+        if i >= limit > -1:
+            break
+        relevant_ids.append(relevant_id)
+        if len(relevant_ids) >= ID_CHUNK_SIZE:
+            yield relevant_ids
+            relevant_ids = []
+
+    if relevant_ids:
+        yield relevant_ids
+
+
 @task(serializer='pickle', queue=UCR_CELERY_QUEUE)
 def compare_ucr_dbs(domain, report_config_id, filter_values, sort_column=None, sort_order=None, params=None):
     if report_config_id not in settings.UCR_COMPARISONS:
@@ -0,0 +1,57 @@
+import uuid
+
+from django.test import SimpleTestCase, TestCase
+
+from corehq.apps.userreports.sql.adapter import _to_copy_text
+from corehq.apps.userreports.tests.test_save_errors import get_sample_config
+from corehq.apps.userreports.util import get_indicator_adapter
+
+
+class CopyTextTest(SimpleTestCase):
+
+    def test_null(self):
+        self.assertEqual(_to_copy_text(None), '\\N')
+
+    def test_escapes(self):
+        self.assertEqual(_to_copy_text('a\tb\nc\\d\re'), 'a\\tb\\nc\\\\d\\re')
+
+    def test_non_string(self):
+        self.assertEqual(_to_copy_text(12), '12')
+
+
+class BulkLoadRowsTest(TestCase):
+
+    def setUp(self):
+        self.config = get_sample_config()
+        self.adapter = get_indicator_adapter(self.config)
+        self.adapter.build_table()
+
+    def tearDown(self):
+        self.adapter.drop_table()
+
+    def _doc(self, doc_id, name):
+        return {
+            "_id": doc_id,
+            "domain": "domain",
+            "doc_type": "CommCareCase",
+            "name": name,
+        }
+
+    def _names(self):
+        return sorted(row.name for row in self.adapter.get_query_object())
+
+    def test_bulk_load_rows(self):
+        docs = [self._doc(uuid.uuid4().hex, name) for name in ['bob', 'tab\there', None]]
+        rows = [row for doc in docs for row in self.adapter.get_all_values(doc)]
+        self.adapter.bulk_load_rows(rows)
+        self.assertEqual(
+            sorted(row.name for row in self.adapter.get_query_object() if row.name),
+            ['bob', 'tab\there']
+        )
+        self.assertEqual(self.adapter.get_query_object().count(), 3)
+
+    def test_bulk_load_rows_replaces_existing(self):
+        doc_id = uuid.uuid4().hex
+        self.adapter.save(self._doc(doc_id, 'bob'))
+        self.adapter.bulk_load_rows(self.adapter.get_all_values(self._doc(doc_id, 'alice')))
+        self.assertEqual(self._names(), ['alice'])
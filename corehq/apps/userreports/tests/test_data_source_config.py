@@ -1,5 +1,6 @@
 import datetime
 import time
+from copy import deepcopy
 
 from django.test import SimpleTestCase, TestCase
 
@@ -7,7 +8,9 @@ from jsonobject.exceptions import BadValueError
 from mock import patch
 
 from corehq.apps.userreports.exceptions import BadSpecError
+from corehq.apps.userreports.expressions.specs import ConditionalExpressionSpec
 from corehq.apps.userreports.models import DataSourceConfiguration
+from corehq.apps.userreports.specs import EvaluationContext
 from corehq.apps.userreports.tests.utils import (
     get_sample_data_source,
     get_sample_doc_and_indicators,
@@ -488,6 +491,52 @@ class IndicatorNamedExpressionTest(SimpleTestCase):
         with self.assertRaises(BadSpecError):
             bad_config.validate()
 
+    def _get_evil_doc(self):
+        return {
+            'doc_type': 'CommCareCase',
+            'domain': 'test',
+            'pregnant': 'yes',
+            'is_evil': True,
+        }
+
+    def test_named_expression_shared_between_data_sources(self):
+        spec = deepcopy(self.indicator_configuration.to_json())
+        spec['table_id'] = 'other_mother_indicators'
+        spec['named_expressions']['laugh'] = spec['named_expressions'].pop('laugh_sound')
+        spec['configured_indicators'][0]['expression']['name'] = 'laugh'
+        other_config = DataSourceConfiguration.wrap(spec)
+
+        doc = self._get_evil_doc()
+        context = EvaluationContext(doc)
+        evaluate = ConditionalExpressionSpec.__call__
+        with patch.object(ConditionalExpressionSpec, '__call__', autospec=True,
+                          side_effect=evaluate) as evaluate_mock:
+            for config in (self.indicator_configuration, other_config):
+                [values] = config.get_all_values(doc, context)
+                self.assertEqual('mwa-ha-ha', values[2].value)
+                context.reset_iteration()
+
+        laugh_calls = [
+            call for call in evaluate_mock.call_args_list
+            if call[0][0].expression_if_true == 'mwa-ha-ha'
+        ]
+        # evaluated once for the document by the first data source
+        self.assertEqual(1, len(laugh_calls))
+
+    def test_named_expression_with_same_name_not_shared(self):
+        spec = deepcopy(self.indicator_configuration.to_json())
+        spec['table_id'] = 'other_mother_indicators'
+        spec['named_expressions']['laugh_sound']['expression_if_true'] = 'muahaha'
+        other_config = DataSourceConfiguration.wrap(spec)
+
+        doc = self._get_evil_doc()
+        context = EvaluationContext(doc)
+        [values] = self.indicator_configuration.get_all_values(doc, context)
+        context.reset_iteration()
+        [other_values] = other_config.get_all_values(doc, context)
+        self.assertEqual('mwa-ha-ha', values[2].value)
+        self.assertEqual('muahaha', other_values[2].value)
+
 
 class IndicatorNamedFilterTest(SimpleTestCase):
 
@@ -1419,6 +1419,21 @@ class TestEvaluationContext(SimpleTestCase):
         my_obj.method_that_should_be_cached(3, 3, context)
         self.assertEqual(counter.call_count, 2)
 
+    def test_cached_function_keyword_and_default_arguments(self):
+        counter = MagicMock()
+
+        @ucr_context_cache(vary_on=('arg1', 'arg2',))
+        def fn_that_should_be_cached(arg1, context, arg2=2):
+            counter()
+
+        context = EvaluationContext({})
+        fn_that_should_be_cached(2, context)
+        fn_that_should_be_cached(2, context=context, arg2=2)
+        fn_that_should_be_cached(arg1=2, context=context)
+        self.assertEqual(counter.call_count, 1)
+        fn_that_should_be_cached(2, context, 3)
+        self.assertEqual(counter.call_count, 2)
+
     def test_no_overlap(self):
         counter = MagicMock()
 
@@ -0,0 +1,39 @@
+import uuid
+
+from django.test import SimpleTestCase
+
+from mock import Mock
+
+from corehq.apps.userreports.sql.query_cache import (
+    _get_client,
+    _get_version_key,
+    bump_table_version,
+    get_cached_query_result,
+    get_query_cache_key,
+)
+
+
+class QueryCacheTest(SimpleTestCase):
+
+    def setUp(self):
+        self.table_name = 'config_report_query_cache_{}'.format(uuid.uuid4().hex)
+        self.addCleanup(_get_client().delete, _get_version_key(self.table_name))
+
+    def get_result(self, run_query, key_parts=('data', 'SELECT 1')):
+        cache_key = get_query_cache_key('default', self.table_name, list(key_parts))
+        return get_cached_query_result(cache_key, run_query)
+
+    def test_cached_until_table_changes(self):
+        run_query = Mock(side_effect=[['first'], ['second']])
+        self.assertEqual(self.get_result(run_query), ['first'])
+        self.assertEqual(self.get_result(run_query), ['first'])
+        self.assertEqual(run_query.call_count, 1)
+
+        bump_table_version(self.table_name)
+        self.assertEqual(self.get_result(run_query), ['second'])
+        self.assertEqual(run_query.call_count, 2)
+
+    def test_different_queries(self):
+        run_query = Mock(side_effect=[['first'], ['second']])
+        self.assertEqual(self.get_result(run_query, ('data', 'SELECT 1')), ['first'])
+        self.assertEqual(self.get_result(run_query, ('count', 'SELECT 1')), ['second'])
@@ -10,9 +10,12 @@ from corehq.apps.userreports.models import (
 from corehq.apps.userreports.reports.data_source import (
     ConfigurableReportDataSource,
 )
+from corehq.apps.userreports.reports.sorting import ASCENDING
+from corehq.apps.userreports.sql.page_query import get_page_with_totals
 from corehq.apps.userreports.tests.utils import doc_to_change
 from corehq.apps.userreports.util import get_indicator_adapter
 from corehq.pillows.case import get_case_pillow
+from corehq.sql_db.connections import connection_manager
 
 ReportDataTestRow = namedtuple('ReportDataTestRow', ['name', 'number', 'sort_key'])
 
@@ -211,6 +214,27 @@ class ReportDataTest(TestCase):
         total_number = sum(row.number for row in rows)
         self.assertEqual(report_data_source.get_total_row(), ['Total', total_number, '', '', ''])
 
+    def test_page_with_totals(self):
+        self._add_some_rows(5)
+        report_data_source = ConfigurableReportDataSource.from_spec(self.report_config)
+        report_data_source.set_order_by([('number', ASCENDING)])
+        data_source = report_data_source.data_source
+        qc = data_source.query_context(start=1, limit=2)
+        session_helper = connection_manager.get_session_helper(data_source.engine_id, readonly=True)
+        with session_helper.session_context() as session:
+            connection = session.connection()
+            data, total_records, totals = get_page_with_totals(
+                qc, connection, data_source.filter_values, ['number']
+            )
+            self.assertEqual(data, qc.resolve(connection, data_source.filter_values))
+        self.assertEqual(total_records, 5)
+        self.assertEqual(totals, {'number': 10})
+
+        page = report_data_source.get_data(start=1, limit=2)
+        self.assertEqual([row['number'] for row in page], [1, 2])
+        self.assertEqual(report_data_source.get_total_records(), 5)
+        self.assertEqual(report_data_source.get_total_row(), ['Total', 10, '', '', ''])
+
     def test_transform(self):
         count = 5
         self._add_some_rows(count)
@@ -1,8 +1,25 @@
+import uuid
 from datetime import datetime
 
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, TestCase
 
-from corehq.apps.userreports.tasks import time_in_range
+from mock import patch
+
+from casexml.apps.case.mock import CaseFactory
+
+from corehq.apps.userreports import tasks
+from corehq.apps.userreports.models import DataSourceConfiguration
+from corehq.apps.userreports.tasks import (
+    IncrementalBuild,
+    _get_incremental_build,
+    rebuild_indicators_in_place,
+    time_in_range,
+)
+from corehq.apps.userreports.util import get_indicator_adapter
+from corehq.form_processor.tests.utils import (
+    FormProcessorTestUtils,
+    use_sql_backend,
+)
 
 TEST_SETTINGS = {
     '*': [(0, 4), (12, 23)],
@@ -29,3 +46,143 @@ class TimeInRange(SimpleTestCase):
         for hour in range(12, 23):
             time = datetime(2018, 1, 22, hour)
             self.assertTrue(time_in_range(time, TEST_SETTINGS))
+
+
+def _get_case_type_filter(case_type):
+    return {
+        'type': 'boolean_expression',
+        'operator': 'eq',
+        'expression': {'type': 'property_name', 'property_name': 'type'},
+        'property_value': case_type,
+    }
+
+
+def _get_indicator(column_id, datatype='string'):
+    return {
+        'type': 'expression',
+        'column_id': column_id,
+        'datatype': datatype,
+        'expression': {'type': 'property_name', 'property_name': column_id},
+    }
+
+
+@patch('corehq.apps.userreports.tasks.should_use_sql_backend', return_value=True)
+class GetIncrementalBuildTest(SimpleTestCase):
+
+    def _get_config(self):
+        config = DataSourceConfiguration(
+            _id=uuid.uuid4().hex,
+            domain='incremental-build',
+            referenced_doc_type='CommCareCase',
+            table_id='cases',
+            configured_filter=_get_case_type_filter('person'),
+            configured_indicators=[_get_indicator('name')],
+        )
+        config.meta.build.processed_through = datetime(2020, 1, 1)
+        config.meta.build.processed_through_config_hashes = config.get_build_config_hashes()
+        return config
+
+    def test_unchanged_config(self, *args):
+        config = self._get_config()
+        self.assertEqual(
+            _get_incremental_build(config),
+            IncrementalBuild(datetime(2020, 1, 1), filter_changed=False, added_column_ids=[]),
+        )
+
+    def test_changed_filter(self, *args):
+        config = self._get_config()
+        config.configured_filter['property_value'] = 'child'
+        self.assertEqual(
+            _get_incremental_build(config),
+            IncrementalBuild(datetime(2020, 1, 1), filter_changed=True, added_column_ids=[]),
+        )
+
+    def test_added_column(self, *args):
+        config = self._get_config()
+        config.configured_indicators.append(_get_indicator('age', 'integer'))
+        self.assertEqual(
+            _get_incremental_build(config),
+            IncrementalBuild(datetime(2020, 1, 1), filter_changed=False, added_column_ids=['age']),
+        )
+
+    def test_added_column_with_base_item_expression(self, *args):
+        config = self._get_config()
+        config.base_item_expression = {'type': 'property_name', 'property_name': 'visits'}
+        config.meta.build.processed_through_config_hashes = config.get_build_config_hashes()
+        config.configured_indicators.append(_get_indicator('age', 'integer'))
+        self.assertIsNone(_get_incremental_build(config))
+
+    def test_changed_column(self, *args):
+        config = self._get_config()
+        config.configured_indicators[0]['datatype'] = 'integer'
+        self.assertIsNone(_get_incremental_build(config))
+
+    def test_removed_column(self, *args):
+        config = self._get_config()
+        config.configured_indicators = []
+        self.assertIsNone(_get_incremental_build(config))
+
+    def test_changed_named_expressions(self, *args):
+        config = self._get_config()
+        config.named_expressions['name'] = {'type': 'property_name', 'property_name': 'name'}
+        self.assertIsNone(_get_incremental_build(config))
+
+    def test_no_config_hashes(self, *args):
+        config = self._get_config()
+        config.meta.build.processed_through_config_hashes = {}
+        self.assertIsNone(_get_incremental_build(config))
+
+
+@use_sql_backend
+class IncrementalBuildTest(TestCase):
+    domain = 'incremental-build'
+
+    def setUp(self):
+        super(IncrementalBuildTest, self).setUp()
+        factory = CaseFactory(domain=self.domain)
+        self.person = factory.create_case(case_type='person', case_name='alice', update={'age': '30'})
+        self.child = factory.create_case(case_type='child', case_name='bob', update={'age': '3'})
+        self.addCleanup(FormProcessorTestUtils.delete_all_cases_forms_ledgers, self.domain)
+
+        config = DataSourceConfiguration(
+            domain=self.domain,
+            referenced_doc_type='CommCareCase',
+            table_id=uuid.uuid4().hex,
+            configured_filter=_get_case_type_filter('person'),
+            configured_indicators=[_get_indicator('name')],
+        )
+        config.save()
+        self.addCleanup(config.delete)
+        self.addCleanup(get_indicator_adapter(config).drop_table)
+        rebuild_indicators_in_place(config._id)
+        self.config = DataSourceConfiguration.get(config._id)
+
+    def _get_rows_by_doc_id(self):
+        adapter = get_indicator_adapter(DataSourceConfiguration.get(self.config._id))
+        return {row.doc_id: row for row in adapter.get_query_object()}
+
+    def _rebuild_incrementally(self):
+        self.config.save()
+        with patch.object(tasks, '_build_indicators', wraps=tasks._build_indicators) as build_mock:
+            rebuild_indicators_in_place(self.config._id, incremental=True)
+        return [call[0][2] for call in build_mock.call_args_list]
+
+    def test_changed_filter(self):
+        self.assertEqual(set(self._get_rows_by_doc_id()), {self.person.case_id})
+
+        self.config.configured_filter = _get_case_type_filter('child')
+        built_doc_ids = self._rebuild_incrementally()
+
+        # only the case that the new filter matches is processed
+        self.assertEqual(built_doc_ids, [[self.child.case_id]])
+        self.assertEqual(set(self._get_rows_by_doc_id()), {self.child.case_id})
+
+    def test_added_column(self):
+        self.config.configured_indicators.append(_get_indicator('age', 'integer'))
+        built_doc_ids = self._rebuild_incrementally()
+
+        # the new column is filled in without rebuilding the rows
+        self.assertEqual(built_doc_ids, [])
+        row = self._get_rows_by_doc_id()[self.person.case_id]
+        self.assertEqual(row.name, 'alice')
+        self.assertEqual(row.age, 30)
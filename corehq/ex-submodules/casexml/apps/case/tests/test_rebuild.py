@@ -3,6 +3,7 @@ from copy import deepcopy
 from datetime import datetime, timedelta
 
 from django.test import SimpleTestCase, TestCase
+from mock import patch
 from six.moves import range, zip
 
 from casexml.apps.case import const
@@ -14,9 +15,12 @@ from casexml.apps.case.tests.util import delete_all_cases
 from casexml.apps.case.util import post_case_blocks, primary_actions
 from corehq.apps.change_feed import topics
 from corehq.form_processor.backends.couch.update_strategy import CouchCaseUpdateStrategy, _action_sort_key_function
+from corehq.form_processor.backends.sql.dbaccessors import CaseAccessorSQL
+from corehq.form_processor.backends.sql.processor import FormProcessorSQL
+from corehq.form_processor.backends.sql.update_strategy import SqlCaseUpdateStrategy
 from corehq.form_processor.exceptions import CaseNotFound
 from corehq.form_processor.interfaces.dbaccessors import CaseAccessors, FormAccessors
-from corehq.form_processor.models import RebuildWithReason
+from corehq.form_processor.models import CaseSnapshot, RebuildWithReason
 from corehq.form_processor.tests.utils import use_sql_backend
 from corehq.form_processor.utils.general import should_use_sql_backend
 from testapps.test_pillowtop.utils import capture_kafka_changes_context
@@ -535,6 +539,100 @@ class CaseRebuildTestSQL(CaseRebuildTest):
     pass
 
 
+@use_sql_backend
+@patch.object(CaseSnapshot, 'INTERVAL', 2)
+class CaseSnapshotRebuildTest(TestCase):
+
+    def tearDown(self):
+        delete_all_cases()
+        super(CaseSnapshotRebuildTest, self).tearDown()
+
+    def _create_case(self, rebuild=True):
+        now = datetime.utcnow()
+        parent_case_id = _post_util(create=True)
+        case_id = _post_util(create=True, p1='p1-0', form_extras={'received_on': now})
+        post_case_blocks([
+            CaseBlock.deprecated_init(case_id, update={'p1': 'p1-1'},
+                                      index={'mom': ('mother', parent_case_id)}).as_xml()
+        ], {'domain': REBUILD_TEST_DOMAIN, 'received_on': now + timedelta(seconds=1)})
+        for i in range(2, 5):
+            _post_util(case_id=case_id, p1='p1-{}'.format(i),
+                       form_extras={'received_on': now + timedelta(seconds=i)})
+
+        if rebuild:
+            FormProcessorSQL.hard_rebuild_case(REBUILD_TEST_DOMAIN, case_id, RebuildWithReason(reason='test'))
+        return CaseAccessors(REBUILD_TEST_DOMAIN).get_case(case_id)
+
+    def _get_snapshot_counts(self, case_id):
+        return [snapshot.transaction_count for snapshot in CaseAccessorSQL.get_case_snapshots(case_id)]
+
+    def _assert_matches_full_rebuild(self, case):
+        rebuilt = FormProcessorSQL.hard_rebuild_case(
+            REBUILD_TEST_DOMAIN, case.case_id, RebuildWithReason(reason='test'), lock=False, save=False
+        )
+        self.assertEqual(case.case_json, rebuilt.case_json)
+        self.assertEqual(case.modified_on, rebuilt.modified_on)
+        self.assertEqual(
+            [(i.identifier, i.referenced_id) for i in case.indices],
+            [(i.identifier, i.referenced_id) for i in rebuilt.indices],
+        )
+
+    def test_rebuild_from_snapshot(self):
+        case = self._create_case()
+        self.assertEqual(self._get_snapshot_counts(case.case_id), [2, 4])
+        f1, f2, f3, f4, f5 = case.xform_ids
+
+        apply_form = SqlCaseUpdateStrategy._apply_form_transaction
+        with patch.object(SqlCaseUpdateStrategy, '_apply_form_transaction',
+                          autospec=True, side_effect=apply_form) as apply_mock:
+            FormAccessors(REBUILD_TEST_DOMAIN).get_form(f3).archive()
+            # start from the snapshot of the first two forms
+            self.assertEqual(
+                [call[0][1].form_id for call in apply_mock.call_args_list],
+                [f4, f5],
+            )
+
+        case = CaseAccessors(REBUILD_TEST_DOMAIN).get_case(case.case_id)
+        self.assertEqual(case.get_case_property('p1'), 'p1-4')
+        self.assertEqual(['mom'], [index.identifier for index in case.indices])
+        # the snapshot covering the archived form is replaced
+        self.assertEqual(self._get_snapshot_counts(case.case_id), [2, 4])
+        self._assert_matches_full_rebuild(case)
+
+    def test_snapshots_written_during_form_processing(self):
+        case = self._create_case(rebuild=False)
+        self.assertEqual(self._get_snapshot_counts(case.case_id), [2, 4])
+        f1, f2, f3, f4, f5 = case.xform_ids
+
+        apply_form = SqlCaseUpdateStrategy._apply_form_transaction
+        with patch.object(SqlCaseUpdateStrategy, '_apply_form_transaction',
+                          autospec=True, side_effect=apply_form) as apply_mock:
+            FormAccessors(REBUILD_TEST_DOMAIN).get_form(f4).archive()
+            # start from the snapshot written when the second form was processed
+            self.assertEqual(
+                [call[0][1].form_id for call in apply_mock.call_args_list],
+                [f3, f5],
+            )
+
+        case = CaseAccessors(REBUILD_TEST_DOMAIN).get_case(case.case_id)
+        self.assertEqual(case.get_case_property('p1'), 'p1-4')
+        self.assertEqual(['mom'], [index.identifier for index in case.indices])
+        self.assertEqual(self._get_snapshot_counts(case.case_id), [2, 4])
+        self._assert_matches_full_rebuild(case)
+
+    def test_archive_form_before_snapshot(self):
+        case = self._create_case()
+        f1, f2, f3, f4, f5 = case.xform_ids
+
+        FormAccessors(REBUILD_TEST_DOMAIN).get_form(f2).archive()
+
+        case = CaseAccessors(REBUILD_TEST_DOMAIN).get_case(case.case_id)
+        self.assertEqual(case.get_case_property('p1'), 'p1-4')
+        self.assertEqual([], case.indices)
+        self.assertEqual(self._get_snapshot_counts(case.case_id), [2, 4])
+        self._assert_matches_full_rebuild(case)
+
+
 class TestCheckActionOrder(SimpleTestCase):
 
     def _action(self, datetime_):
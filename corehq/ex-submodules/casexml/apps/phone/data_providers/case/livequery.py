@@ -71,7 +71,7 @@ def do_livequery(timing_context, restore_state, response, async_task=None):
         """
         return case_id in hosts_by_extension and case_id not in parents_by_child
 
-    def has_live_extension(case_id, cache={}):
+    def has_live_extension(case_id):
         """Check if available case_id has a live extension case
 
         Do not check for live children because an available parent
@@ -84,39 +84,52 @@ def do_livequery(timing_context, restore_state, response, async_task=None):
             - it is open and is the extension of an available case.
         - A case is live if it is owned and available.
 
-        The result is cached to reduce recursion in subsequent calls
-        and to prevent infinite recursion.
+        Extension chains are walked iteratively so deep chains cannot
+        exhaust the stack. A negative result is cached for every case
+        visited since none of them can reach a live extension either.
         """
         try:
-            return cache[case_id]
+            return live_extension_cache[case_id]
         except KeyError:
-            cache[case_id] = False
-        cache[case_id] = result = any(
-            ext_id in live_ids      # has live extension
-            or ext_id in owned_ids  # ext is owned and available, will be live
-            or has_live_extension(ext_id)
-            for ext_id in extensions_by_host[case_id]
-        )
-        return result
+            pass
+        visited = {case_id}
+        stack = [case_id]
+        while stack:
+            for ext_id in extensions_by_host[stack.pop()]:
+                if (ext_id in live_ids      # has live extension
+                        or ext_id in owned_ids  # ext is owned and available, will be live
+                        or live_extension_cache.get(ext_id)):
+                    live_extension_cache[case_id] = True
+                    return True
+                if ext_id not in visited:
+                    visited.add(ext_id)
+                    stack.append(ext_id)
+        for visited_id in visited:
+            live_extension_cache[visited_id] = False
+        return False
 
     def enliven(case_id):
         """Mark the given case, its extensions and their hosts as live
 
         This closure mutates `live_ids` from the enclosing function.
         """
-        if case_id in live_ids:
-            # already live
-            return
-        debug('enliven(%s)', case_id)
-        live_ids.add(case_id)
-        # case is open and is the extension of a live case
-        ext_ids = extensions_by_host.get(case_id, [])
-        # case has live extension
-        host_ids = hosts_by_extension.get(case_id, [])
-        # case has live child
-        parent_ids = parents_by_child.get(case_id, [])
-        for cid in chain(ext_ids, host_ids, parent_ids):
-            enliven(cid)
+        stack = [case_id]
+        while stack:
+            case_id = stack.pop()
+            if case_id in live_ids:
+                # already live
+                continue
+            debug('enliven(%s)', case_id)
+            live_ids.add(case_id)
+            # case is open and is the extension of a live case
+            ext_ids = extensions_by_host.get(case_id, [])
+            # case has live extension
+            host_ids = hosts_by_extension.get(case_id, [])
+            # case has live child
+            parent_ids = parents_by_child.get(case_id, [])
+            stack.extend(cid
+                for cid in chain(ext_ids, host_ids, parent_ids)
+                if cid not in live_ids)
 
     def classify(index, prev_ids):
         """Classify index as either live or extension with live status pending
@@ -208,6 +221,7 @@ def do_livequery(timing_context, restore_state, response, async_task=None):
     parents_by_child = defaultdict(set)    # child_id -> parent_ids
     indices = defaultdict(list)  # case_id -> list of CommCareCaseIndex-like
     seen_ix = defaultdict(set)   # case_id -> set of '<index.case_id> <index.identifier>'
+    live_extension_cache = {}    # case_id -> has live extension (see has_live_extension)
     owner_ids = list(restore_state.owner_ids)
 
     debug("sync %s for %r", restore_state.current_sync_log._id, owner_ids)
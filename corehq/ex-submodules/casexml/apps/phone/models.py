@@ -121,6 +121,9 @@ class OTARestoreUser(object):
     def get_fixture_data_items(self):
         raise NotImplementedError()
 
+    def get_fixture_owner_ids(self):
+        raise NotImplementedError()
+
     def get_commtrack_location_id(self):
         raise NotImplementedError()
 
@@ -160,6 +163,9 @@ class OTARestoreWebUser(OTARestoreUser):
     def get_fixture_data_items(self):
         return []
 
+    def get_fixture_owner_ids(self):
+        return []
+
     def get_commtrack_location_id(self):
         return None
 
@@ -195,6 +201,11 @@ class OTARestoreCommCareUser(OTARestoreUser):
 
         return FixtureDataItem.by_user(self._couch_user)
 
+    def get_fixture_owner_ids(self):
+        from corehq.apps.fixtures.models import get_fixture_owner_ids
+
+        return get_fixture_owner_ids(self._couch_user)
+
     def get_commtrack_location_id(self):
         from corehq.apps.commtrack.util import get_commtrack_location_id
 
@@ -1,6 +1,6 @@
+import io
 import logging
 import os
-import shutil
 import tempfile
 import uuid
 from io import BytesIO
@@ -115,7 +115,9 @@ class RestoreContent(object):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.response_body.close()
+        # the body file is owned by the RestoreFile if get_fileobj was called
+        if self.response_body is not None:
+            self.response_body.close()
 
     def append(self, xml_element):
         self.num_items += 1
@@ -130,31 +132,105 @@ class RestoreContent(object):
         for element in iterable:
             self.append(element)
 
-    def _write_to_file(self, fileobj):
+    def _get_start_tag(self):
         # Add 1 to num_items to account for message element
         items = (self.items_template % ('%s' % (self.num_items + 1)).encode('utf-8')) if self.items else b''
-        fileobj.write(self.start_tag_template % {
+        return self.start_tag_template % {
             b"items": items,
             b"username": self.username.encode("utf8"),
             b"nature": ResponseNature.OTA_RESTORE_SUCCESS.encode("utf8"),
-        })
-
-        self.response_body.seek(0)
-        shutil.copyfileobj(self.response_body, fileobj)
-
-        fileobj.write(self.closing_tag)
+        }
 
     def get_fileobj(self):
-        fileobj = tempfile.TemporaryFile('w+b')
+        """Get a file-like object with the full response content
+
+        The response body is not copied: the returned file reads the
+        start tag, the body written so far and the closing tag in
+        sequence. Ownership of the body file is transferred to the
+        returned object, so it remains readable after this context exits.
+        Can only be called once.
+        """
+        body, self.response_body = self.response_body, None
         try:
-            self._write_to_file(fileobj)
-            fileobj.seek(0)
-            return fileobj
+            return RestoreFile([self._get_start_tag(), body, self.closing_tag])
         except:
-            fileobj.close()
+            body.close()
             raise
 
 
+class RestoreFile(io.RawIOBase):
+    """Read-only, seekable file composed of a sequence of parts
+
+    Each part is either a bytes object or a seekable binary file. The
+    parts are read in order without being copied into a single file.
+    """
+
+    def __init__(self, parts):
+        super().__init__()
+        self._parts = []
+        offset = 0
+        for part in parts:
+            if isinstance(part, bytes):
+                size = len(part)
+            else:
+                part.seek(0, os.SEEK_END)
+                size = part.tell()
+            self._parts.append((offset, size, part))
+            offset += size
+        self._size = offset
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            pos = offset
+        elif whence == os.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == os.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise ValueError("invalid whence: {}".format(whence))
+        if pos < 0:
+            raise ValueError("negative seek position {}".format(pos))
+        self._pos = pos
+        return pos
+
+    def readinto(self, buffer):
+        view = memoryview(buffer).cast('B')
+        written = 0
+        for start, size, part in self._parts:
+            if written == len(view) or self._pos >= self._size:
+                break
+            if not start <= self._pos < start + size:
+                continue
+            part_offset = self._pos - start
+            length = min(size - part_offset, len(view) - written)
+            if isinstance(part, bytes):
+                view[written:written + length] = part[part_offset:part_offset + length]
+            else:
+                part.seek(part_offset)
+                length = part.readinto(view[written:written + length])
+            written += length
+            self._pos += length
+        return written
+
+    def close(self):
+        if not self.closed:
+            for start, size, part in self._parts:
+                if not isinstance(part, bytes):
+                    part.close()
+            self._parts = []
+        super().close()
+
+
 class RestoreResponse(object):
 
     def __init__(self, fileobj):
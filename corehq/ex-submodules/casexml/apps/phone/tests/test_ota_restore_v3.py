@@ -1,3 +1,5 @@
+import os
+
 import six
 from django.test import TestCase
 from django.test.testcases import SimpleTestCase
@@ -75,3 +77,16 @@ class TestRestoreContent(SimpleTestCase):
             response.append(body.encode('utf-8'))
             with response.get_fileobj() as fileobj:
                 self.assertEqual(expected, fileobj.read().decode('utf-8'))
+
+    def test_fileobj_outlives_content(self):
+        user = 'user1'
+        body = '<elem>data0</elem>'
+        expected = self._expected(user, body, items=2)
+        with RestoreContent(user, True) as response:
+            response.append(body.encode('utf-8'))
+            fileobj = response.get_fileobj()
+        with fileobj:
+            fileobj.seek(0, os.SEEK_END)
+            self.assertEqual(fileobj.tell(), len(expected))
+            fileobj.seek(0)
+            self.assertEqual(expected, fileobj.read().decode('utf-8'))
@@ -7,9 +7,11 @@ from couchexport.models import Format
 from couchexport import writers
 
 
-def get_writer(format, use_formatted_cells=False):
+def get_writer(format, use_formatted_cells=False, streaming=False):
     if format == Format.XLS_2007:
-        return writers.Excel2007ExportWriter(use_formatted_cells=use_formatted_cells)
+        writer_class = (writers.StreamingExcel2007ExportWriter if streaming
+                        else writers.Excel2007ExportWriter)
+        return writer_class(use_formatted_cells=use_formatted_cells)
     try:
         return {
             Format.CSV: writers.CsvExportWriter,
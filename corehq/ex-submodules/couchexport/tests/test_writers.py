@@ -1,18 +1,21 @@
 from codecs import BOM_UTF8
 from contextlib import closing
+from datetime import datetime
 import io
 import os
 
+import openpyxl
 from django.test import SimpleTestCase
 from lxml import html, etree
 from mock import patch, Mock
 
-from couchexport.export import export_from_tables
+from couchexport.export import FormattedRow, export_from_tables
 from couchexport.models import Format
 from couchexport.writers import (
     MAX_XLS_COLUMNS,
     CsvFileWriter,
     PythonDictWriter,
+    StreamingExcel2007ExportWriter,
     XlsLengthException,
     ZippedExportWriter,
 )
@@ -121,6 +124,55 @@ class Excel2007ExportWriterTests(SimpleTestCase):
         export_from_tables(tables, file_, format_)
 
 
+class StreamingExcel2007ExportWriterTests(SimpleTestCase):
+
+    def _write(self, writer, headers, rows):
+        file_ = io.BytesIO()
+        writer.open([('Spam & <Eggs>', [headers])], file_)
+        writer.write([('Spam & <Eggs>', rows)])
+        writer.close()
+        return openpyxl.load_workbook(file_)
+
+    def _values(self, sheet):
+        return [[cell.value for cell in row] for row in sheet.iter_rows()]
+
+    def test_plain_values(self):
+        workbook = self._write(
+            StreamingExcel2007ExportWriter(),
+            ['héading', 'count'],
+            [['a & <b>', 12], [b'row2\xe2\x80\x931', None]],
+        )
+        sheet = workbook.active
+        self.assertEqual(sheet.title, 'Spam & <Eggs>')
+        self.assertEqual(self._values(sheet), [
+            ['héading', 'count'],
+            ['a & <b>', 12],
+            ['row2\u20131', None],
+        ])
+
+    def test_formatted_cells(self):
+        workbook = self._write(
+            StreamingExcel2007ExportWriter(use_formatted_cells=True),
+            ['int', 'float', 'date'],
+            [['12', '1.5', '2020-01-02']],
+        )
+        row = list(workbook.active.iter_rows())[1]
+        self.assertEqual([cell.value for cell in row], [12, 1.5, datetime(2020, 1, 2)])
+        self.assertEqual([cell.number_format for cell in row], ['0', '0.00', 'yyyy-mm-dd'])
+
+    def test_hyperlinks(self):
+        url = 'https://example.com/?a=1&b=2'
+        workbook = self._write(
+            StreamingExcel2007ExportWriter(),
+            FormattedRow(['name', 'link']),
+            [FormattedRow(['spam', url], hyperlink_column_indices=[1])],
+        )
+        cell = workbook.active['B2']
+        self.assertEqual(cell.value, url)
+        self.assertEqual(cell.hyperlink.target, url)
+        self.assertIsNone(workbook.active['A2'].hyperlink)
+
+
 class Excel2003ExportWriterTests(SimpleTestCase):
 
     def test_data_length(self):
@@ -1,14 +1,18 @@
 import io
 from base64 import b64decode
 from codecs import BOM_UTF8
+import datetime
 import os
 import re
+import shutil
 import tempfile
 import zipfile
 import csv
 import json
 import bz2
 from collections import OrderedDict
+from decimal import Decimal
+from xml.sax.saxutils import escape, quoteattr
 import openpyxl
 import math
 
@@ -19,6 +23,8 @@ import xlwt
 from couchexport.models import Format
 from openpyxl.styles import numbers
 from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel
 
 from couchexport.util import get_excel_format_value, get_legacy_excel_safe_value
 
@@ -417,6 +423,295 @@ class Excel2007ExportWriter(ExportWriter):
         self.book.save(self.file)
 
 
+XLSX_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+XLSX_PACKAGE_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+XLSX_DOC_RELS_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+
+class XlsxStyles(object):
+    """
+    The cell formats used by a streamed workbook. Cells refer to formats by
+    index, and the styles part is only rendered once all rows are written.
+    """
+    first_custom_format_id = 164
+
+    def __init__(self):
+        self._xfs = OrderedDict([((numbers.FORMAT_GENERAL, False), 0)])
+        self._custom_formats = OrderedDict()
+
+    def get_index(self, number_format=None, hyperlink=False):
+        key = (number_format or numbers.FORMAT_GENERAL, hyperlink)
+        try:
+            return self._xfs[key]
+        except KeyError:
+            self._xfs[key] = index = len(self._xfs)
+            return index
+
+    def _get_format_id(self, number_format):
+        format_id = numbers.builtin_format_id(number_format)
+        if format_id is None:
+            format_id = self._custom_formats.setdefault(
+                number_format, self.first_custom_format_id + len(self._custom_formats)
+            )
+        return format_id
+
+    def to_xml(self):
+        xfs = ''.join(
+            '<xf numFmtId="{}" fontId="{}" fillId="0" borderId="0" xfId="0"{}/>'.format(
+                self._get_format_id(number_format),
+                1 if hyperlink else 0,
+                ' applyNumberFormat="1"' if number_format != numbers.FORMAT_GENERAL else '',
+            )
+            for number_format, hyperlink in self._xfs
+        )
+        num_fmts = ''.join(
+            '<numFmt numFmtId="{}" formatCode={}/>'.format(format_id, quoteattr(number_format))
+            for number_format, format_id in self._custom_formats.items()
+        )
+        if num_fmts:
+            num_fmts = '<numFmts count="{}">{}</numFmts>'.format(len(self._custom_formats), num_fmts)
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<styleSheet xmlns="{ns}">{num_fmts}'
+            '<fonts count="2">'
+            '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+            '<font><u/><sz val="11"/><color rgb="FF0563C1"/><name val="Calibri"/><family val="2"/></font>'
+            '</fonts>'
+            '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+            '<fill><patternFill patternType="gray125"/></fill></fills>'
+            '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+            '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+            '<cellXfs count="{xf_count}">{xfs}</cellXfs>'
+            '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+            '</styleSheet>'
+        ).format(ns=XLSX_MAIN_NS, num_fmts=num_fmts, xf_count=len(self._xfs), xfs=xfs)
+
+
+class XlsxSheetFileWriter(ExportFileWriter):
+    """
+    Writes the rows of a single worksheet as ``<sheetData>`` XML to a
+    temporary file. Strings are written inline rather than to a shared
+    strings table, and hyperlinks are spooled to their own temporary files,
+    so memory use does not grow with the number of rows.
+
+    Rows are sequences of ``(value, number_format, is_hyperlink)`` tuples.
+    """
+
+    def __init__(self, styles):
+        super(XlsxSheetFileWriter, self).__init__()
+        self.styles = styles
+
+    def _open(self):
+        self.row_count = 0
+        self.hyperlink_count = 0
+        self.hyperlinks_file = tempfile.TemporaryFile()
+        self.hyperlink_rels_file = tempfile.TemporaryFile()
+
+    def write_row(self, row):
+        self.row_count += 1
+        row_number = self.row_count
+        cells = []
+        for col_index, (value, number_format, is_hyperlink) in enumerate(row, 1):
+            ref = '{}{}'.format(get_column_letter(col_index), row_number)
+            if is_hyperlink and isinstance(value, str) and value:
+                self._write_hyperlink(ref, value)
+            else:
+                is_hyperlink = False
+            cells.append(self._get_cell_xml(ref, value, number_format, is_hyperlink))
+        self._file.write('<row r="{}">{}</row>'.format(row_number, ''.join(cells)).encode('utf-8'))
+
+    def _get_cell_xml(self, ref, value, number_format, is_hyperlink):
+        if isinstance(value, Decimal):
+            value = float(value)
+        elif isinstance(value, (datetime.date, datetime.time)):
+            if not number_format or number_format == numbers.FORMAT_GENERAL:
+                number_format = (
+                    numbers.FORMAT_DATE_DATETIME if isinstance(value, datetime.datetime)
+                    else numbers.FORMAT_DATE_TIME4 if isinstance(value, datetime.time)
+                    else numbers.FORMAT_DATE_YYYYMMDD2
+                )
+            if getattr(value, 'tzinfo', None) is not None:
+                value = value.replace(tzinfo=None)
+            value = to_excel(value)
+
+        style_index = self.styles.get_index(number_format, is_hyperlink)
+        style = ' s="{}"'.format(style_index) if style_index else ''
+
+        if value is None or value == '':
+            return '<c r="{}"{}/>'.format(ref, style) if style else ''
+        if isinstance(value, bool):
+            return '<c r="{}" t="b"{}><v>{}</v></c>'.format(ref, style, int(value))
+        if isinstance(value, (int, float)) and math.isfinite(value):
+            return '<c r="{}"{}><v>{!r}</v></c>'.format(ref, style, value)
+        if isinstance(value, bytes):
+            value = value.decode('utf-8')
+        return '<c r="{}" t="inlineStr"{}><is><t xml:space="preserve">{}</t></is></c>'.format(
+            ref, style, escape(str(value))
+        )
+
+    def _write_hyperlink(self, ref, url):
+        self.hyperlink_count += 1
+        rel_id = 'rId{}'.format(self.hyperlink_count)
+        self.hyperlinks_file.write(
+            '<hyperlink ref="{}" r:id="{}"/>'.format(ref, rel_id).encode('utf-8')
+        )
+        self.hyperlink_rels_file.write(
+            '<Relationship Id="{}" Type="{}/hyperlink" Target={} TargetMode="External"/>'.format(
+                rel_id, XLSX_DOC_RELS_NS, quoteattr(url)
+            ).encode('utf-8')
+        )
+
+    def write_sheet_xml(self, out):
+        out.write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<worksheet xmlns="{}" xmlns:r="{}"><sheetData>'.format(
+                XLSX_MAIN_NS, XLSX_DOC_RELS_NS
+            ).encode('utf-8')
+        )
+        shutil.copyfileobj(self._file, out)
+        out.write(b'</sheetData>')
+        if self.hyperlink_count:
+            out.write(b'<hyperlinks>')
+            self.hyperlinks_file.seek(0)
+            shutil.copyfileobj(self.hyperlinks_file, out)
+            out.write(b'</hyperlinks>')
+        out.write(b'</worksheet>')
+
+    def write_rels_xml(self, out):
+        out.write(
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="{}">'.format(XLSX_PACKAGE_RELS_NS).encode('utf-8')
+        )
+        self.hyperlink_rels_file.seek(0)
+        shutil.copyfileobj(self.hyperlink_rels_file, out)
+        out.write(b'</Relationships>')
+
+    def close(self):
+        self.hyperlinks_file.close()
+        self.hyperlink_rels_file.close()
+        super(XlsxSheetFileWriter, self).close()
+
+
+class StreamingExcel2007ExportWriter(OnDiskExportWriter):
+    """
+    Excel 2007 writer that streams each sheet's XML to disk as rows are
+    written and assembles the xlsx package on close. Output matches
+    Excel2007ExportWriter, but memory use stays flat regardless of the
+    size of the export.
+    """
+    format = Format.XLS_2007
+    max_table_name_size = 31
+    writer_class = XlsxSheetFileWriter
+
+    def __init__(self, format_as_text=False, use_formatted_cells=False):
+        super(StreamingExcel2007ExportWriter, self).__init__()
+        self.format_as_text = format_as_text
+        self.use_formatted_cells = use_formatted_cells
+
+    def _init(self):
+        super(StreamingExcel2007ExportWriter, self)._init()
+        self.styles = XlsxStyles()
+
+    def _init_table(self, table_index, table_title):
+        writer = self.writer_class(self.styles)
+        self.tables[table_index] = writer
+        writer.open(table_title)
+        self.table_names[table_index] = table_title
+
+    def _write_row(self, sheet_index, row):
+        from couchexport.export import FormattedRow
+        is_formatted_row = isinstance(row, FormattedRow)
+        hyperlink_columns = row.hyperlink_column_indices if is_formatted_row else ()
+
+        cells = []
+        for col_ind, val in enumerate(row):
+            skip_formatting_on_row = is_formatted_row and col_ind in row.skip_excel_formatting
+
+            if (self.use_formatted_cells
+                    and not skip_formatting_on_row
+                    and not self.format_as_text):
+                number_format, val = get_excel_format_value(val)
+            else:
+                val = get_legacy_excel_safe_value(val)
+                number_format = numbers.FORMAT_TEXT if self.format_as_text else None
+
+            cells.append((val, number_format, col_ind in hyperlink_columns))
+
+        self.tables[sheet_index].write_row(cells)
+
+    def _write_final_result(self):
+        sheets = list(self.tables.values())
+        with zipfile.ZipFile(self.file, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('[Content_Types].xml', self._get_content_types_xml(sheets))
+            archive.writestr('_rels/.rels', self._get_package_rels_xml())
+            archive.writestr('xl/workbook.xml', self._get_workbook_xml())
+            archive.writestr('xl/_rels/workbook.xml.rels', self._get_workbook_rels_xml(len(sheets)))
+            archive.writestr('xl/styles.xml', self.styles.to_xml())
+            for number, sheet in enumerate(sheets, 1):
+                # the size of the sheet isn't known up front, and may be over 2 GiB
+                with archive.open('xl/worksheets/sheet{}.xml'.format(number), 'w', force_zip64=True) as out:
+                    sheet.write_sheet_xml(out)
+                if sheet.hyperlink_count:
+                    rels_name = 'xl/worksheets/_rels/sheet{}.xml.rels'.format(number)
+                    with archive.open(rels_name, 'w') as out:
+                        sheet.write_rels_xml(out)
+        self.file.seek(0)
+
+    @staticmethod
+    def _get_content_types_xml(sheets):
+        sheet_overrides = ''.join(
+            '<Override PartName="/xl/worksheets/sheet{}.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'.format(number)
+            for number in range(1, len(sheets) + 1)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            '{}</Types>'
+        ).format(sheet_overrides)
+
+    @staticmethod
+    def _get_package_rels_xml():
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="{}">'
+            '<Relationship Id="rId1" Type="{}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'
+        ).format(XLSX_PACKAGE_RELS_NS, XLSX_DOC_RELS_NS)
+
+    def _get_workbook_xml(self):
+        sheets = ''.join(
+            '<sheet name={} sheetId="{}" r:id="rId{}"/>'.format(quoteattr(name), number, number)
+            for number, name in enumerate(self.table_names.values(), 1)
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="{}" xmlns:r="{}"><sheets>{}</sheets></workbook>'
+        ).format(XLSX_MAIN_NS, XLSX_DOC_RELS_NS, sheets)
+
+    @staticmethod
+    def _get_workbook_rels_xml(sheet_count):
+        rels = ''.join(
+            '<Relationship Id="rId{0}" Type="{1}/worksheet" Target="worksheets/sheet{0}.xml"/>'.format(
+                number, XLSX_DOC_RELS_NS
+            )
+            for number in range(1, sheet_count + 1)
+        )
+        rels += '<Relationship Id="rId{}" Type="{}/styles" Target="styles.xml"/>'.format(
+            sheet_count + 1, XLSX_DOC_RELS_NS
+        )
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="{}">{}</Relationships>'
+        ).format(XLSX_PACKAGE_RELS_NS, rels)
+
+
 class Excel2003ExportWriter(ExportWriter):
     format = Format.XLS
     max_table_name_size = 31
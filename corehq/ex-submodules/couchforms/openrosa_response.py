@@ -62,6 +62,27 @@ class OpenRosaResponse(object):
         return HttpResponse(self.xml(), status=self.status)
 
 
+def get_openrosa_batch_response(responses):
+    """
+    Combine the responses to each form of a batch submission into one
+    response. Each form's response is wrapped in a <submission> element
+    carrying its position in the batch, its HTTP status and its form ID.
+    """
+    elem = ElementTree.Element('OpenRosaBatchResponse')
+    elem.set('xmlns', RESPONSE_XMLNS)
+    for index, response in enumerate(responses):
+        submission_elem = ElementTree.SubElement(elem, 'submission')
+        submission_elem.set('index', str(index))
+        submission_elem.set('status', str(response.status_code))
+        if response.has_header('X-CommCareHQ-FormID'):
+            submission_elem.set('form_id', response['X-CommCareHQ-FormID'])
+        try:
+            submission_elem.append(ElementTree.fromstring(response.content))
+        except ElementTree.XMLSyntaxError:
+            submission_elem.append(get_response_element(response.content.decode('utf-8', 'replace')))
+    return HttpResponse(ElementTree.tostring(elem, encoding='utf-8'), status=201)
+
+
 def get_openarosa_success_response(message=None):
     if not message:
         message = _('   √   ')
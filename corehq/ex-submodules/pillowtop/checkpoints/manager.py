@@ -138,10 +138,10 @@ class PillowCheckpointEventHandler(ChangeEventHandler):
     def get_new_seq(self, change):
         return change['seq']
 
-    def update_checkpoint(self, change, context):
+    def update_checkpoint(self, change, context, new_seq=None):
         if self.should_update_checkpoint(context):
             context.reset()
-            self.checkpoint.update_to(self.get_new_seq(change))
+            self.checkpoint.update_to(new_seq if new_seq is not None else self.get_new_seq(change))
             self.last_update = datetime.utcnow()
             if self.checkpoint_callback:
                 self.checkpoint_callback.checkpoint_updated()
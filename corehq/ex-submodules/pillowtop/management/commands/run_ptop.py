@@ -78,6 +78,15 @@ class Command(BaseCommand):
             help="The process number of this pillow process. Should be between 0 and num-processes. "
                  "It's expected that there will only be one process for each number running at once",
         )
+        parser.add_argument(
+            '--processor-pipeline-depth',
+            action='store',
+            dest='processor_pipeline_depth',
+            default=0,
+            type=int,
+            help="Number of chunks to process in a background thread while the next chunk is read "
+                 "from the change feed. Only applies to pillows with batch processors.",
+        )
 
     def handle(self, **options):
         run_all = options['run_all']
@@ -88,6 +97,7 @@ class Command(BaseCommand):
         num_processes = options['num_processes']
         process_number = options['process_number']
         processor_chunk_size = options['processor_chunk_size']
+        processor_pipeline_depth = options['processor_pipeline_depth']
         assert 0 <= process_number < num_processes
         assert processor_chunk_size
         if list_all:
@@ -113,6 +123,7 @@ class Command(BaseCommand):
 
         elif not run_all and not pillow_key and pillow_name:
             pillow = get_pillow_by_name(pillow_name, num_processes=num_processes, process_num=process_number, processor_chunk_size=processor_chunk_size)
+            pillow.processor_pipeline_depth = processor_pipeline_depth
             start_pillow(pillow)
             sys.exit()
         elif list_checkpoints:
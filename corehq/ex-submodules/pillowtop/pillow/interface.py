@@ -1,8 +1,10 @@
 from abc import ABCMeta, abstractproperty, abstractmethod
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 from django.conf import settings
+from django.db import connections
 from memoized import memoized
 
 import sys
@@ -54,6 +56,9 @@ class PillowBase(metaclass=ABCMeta):
     retry_errors = True
     # this will be the batch size for processors that support batch processing
     processor_chunk_size = 0
+    # number of chunks that may be processed in a background thread while
+    # the next chunk is read from the change feed (requires batch processors)
+    processor_pipeline_depth = 0
 
     @abstractproperty
     def pillow_id(self):
@@ -108,9 +113,9 @@ class PillowBase(metaclass=ABCMeta):
             scope.set_tag("pillow_name", self.get_name())
         self.process_changes(since=self.get_last_checkpoint_sequence(), forever=True)
 
-    def _update_checkpoint(self, change, context):
+    def _update_checkpoint(self, change, context, new_seq=None):
         if change and context:
-            updated = self.update_checkpoint(change, context)
+            updated = self.update_checkpoint(change, context, new_seq)
         else:
             updated = self.checkpoint.touch(min_interval=CHECKPOINT_MIN_WAIT)
         if updated:
@@ -139,7 +144,13 @@ class PillowBase(metaclass=ABCMeta):
             Processes changes serially on serial processors, and in batches on
             batch processors. If there are batch processors, checkpoint is updated
             at the end of the batch, otherwise is updated for every change.
+
+            With processor_pipeline_depth set, batches are processed in the
+            background while the next batch is read from the change feed.
         """
+        if self.processor_pipeline_depth and self.batch_processors:
+            return self._process_changes_pipelined(since, forever)
+
         context = PillowRuntimeContext(changes_seen=0)
         min_wait_seconds = 30
 
@@ -182,6 +193,69 @@ class PillowBase(metaclass=ABCMeta):
             process_offset_chunk(changes_chunk, context)
             self.process_changes(since=self.get_last_checkpoint_sequence(), forever=forever)
 
+    def _process_changes_pipelined(self, since, forever):
+        """
+        Process changes in chunks on a background thread while the next
+            chunk is read from the change feed.
+
+            Chunks are processed one at a time in feed order. The checkpoint
+            sequence is captured when a chunk is handed off and only committed
+            once that chunk (and every chunk before it) has been processed,
+            so checkpoints never move past unprocessed changes.
+        """
+        context = PillowRuntimeContext(changes_seen=0)
+        min_wait_seconds = 30
+        # (future, last change, checkpoint sequence) in feed order
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.get_name())
+
+        def submit_chunk(chunk):
+            # the feed moves on while the chunk is processed so the
+            # sequence must be captured now
+            new_seq = self.get_new_seq(chunk[-1])
+            future = executor.submit(self._batch_process_with_error_handling, chunk)
+            pending.append((future, chunk[-1], new_seq))
+
+        def commit_oldest_chunk():
+            future, change, new_seq = pending.popleft()
+            future.result()
+            self._update_checkpoint(change, context, new_seq)
+
+        changes_chunk = []
+        last_process_time = datetime.utcnow()
+
+        try:
+            for change in self.get_change_feed().iter_changes(since=since or None, forever=forever):
+                context.changes_seen += 1
+                if change:
+                    changes_chunk.append(change)
+                    chunk_full = len(changes_chunk) == self.processor_chunk_size
+                    time_elapsed = (datetime.utcnow() - last_process_time).seconds > min_wait_seconds
+                    if chunk_full or time_elapsed:
+                        last_process_time = datetime.utcnow()
+                        submit_chunk(changes_chunk)
+                        changes_chunk = []
+                        while len(pending) > self.processor_pipeline_depth:
+                            commit_oldest_chunk()
+                else:
+                    while pending and pending[0][0].done():
+                        commit_oldest_chunk()
+                    if not pending:
+                        self._update_checkpoint(None, None)
+            if changes_chunk:
+                submit_chunk(changes_chunk)
+            while pending:
+                commit_oldest_chunk()
+        except PillowtopCheckpointReset:
+            for future, change, new_seq in pending:
+                future.result()
+            if changes_chunk:
+                self._batch_process_with_error_handling(changes_chunk)
+            self.process_changes(since=self.get_last_checkpoint_sequence(), forever=forever)
+        finally:
+            executor.submit(connections.close_all)
+            executor.shutdown(wait=True)
+
     def _batch_process_with_error_handling(self, changes_chunk):
         """
         Process given chunk in batch mode first on batch-processors
@@ -263,12 +337,20 @@ class PillowBase(metaclass=ABCMeta):
         pass
 
     @abstractmethod
-    def update_checkpoint(self, change, context):
+    def update_checkpoint(self, change, context, new_seq=None):
         """
+        :param new_seq: sequence to checkpoint to, defaults to the sequence
+        of ``change``
         :return: True if checkpoint was updated otherwise False
         """
         pass
 
+    def get_new_seq(self, change):
+        """
+        :return: sequence value the checkpoint would be updated to for ``change``
+        """
+        return change['seq']
+
     def _normalize_checkpoint_sequence(self):
         if self.checkpoint is None:
             return {}
@@ -397,8 +479,10 @@ class ChangeEventHandler(metaclass=ABCMeta):
     """
 
     @abstractmethod
-    def update_checkpoint(self, change, context):
+    def update_checkpoint(self, change, context, new_seq=None):
         """
+        :param new_seq: sequence to checkpoint to, defaults to
+        ``self.get_new_seq(change)``
         :return: True if checkpoint was updated otherwise False
         """
         pass
@@ -418,11 +502,13 @@ class ConstructedPillow(PillowBase):
     """
 
     def __init__(self, name, checkpoint, change_feed, processor,
-                 change_processed_event_handler=None, processor_chunk_size=0):
+                 change_processed_event_handler=None, processor_chunk_size=0,
+                 processor_pipeline_depth=0):
         self._name = name
         self._checkpoint = checkpoint
         self._change_feed = change_feed
         self.processor_chunk_size = processor_chunk_size
+        self.processor_pipeline_depth = processor_pipeline_depth
         if isinstance(processor, list):
             self.processors = processor
         else:
@@ -456,11 +542,16 @@ class ConstructedPillow(PillowBase):
         for processor in processors:
             processor.process_change(change)
 
-    def update_checkpoint(self, change, context):
+    def update_checkpoint(self, change, context, new_seq=None):
         if self._change_processed_event_handler is not None:
-            return self._change_processed_event_handler.update_checkpoint(change, context)
+            return self._change_processed_event_handler.update_checkpoint(change, context, new_seq)
         return False
 
+    def get_new_seq(self, change):
+        if self._change_processed_event_handler is not None:
+            return self._change_processed_event_handler.get_new_seq(change)
+        return super().get_new_seq(change)
+
 
 def handle_pillow_error(pillow, change, exception):
     from pillow_retry.models import PillowError, path_from_object
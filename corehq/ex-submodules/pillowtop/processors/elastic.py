@@ -86,6 +86,8 @@ class ElasticProcessor(PillowProcessor):
 
         # send it across
         with self._datadog_timing('load'):
+            # index (rather than create) replaces any existing doc, so there is no
+            # need to check for its existence first
             send_to_elasticsearch(
                 alias=self.index_info.alias,
                 doc_type=self.index_info.type,
@@ -93,15 +95,14 @@ class ElasticProcessor(PillowProcessor):
                 es_getter=self.es_getter,
                 name='ElasticProcessor',
                 data=doc_ready_to_save,
-                update=self._doc_exists(change.id),
+                update=True,
             )
 
-    def _doc_exists(self, doc_id):
-        return self.elasticsearch.exists(self.index_info.alias, self.index_info.type, doc_id)
-
     def _delete_doc_if_exists(self, doc_id):
-        if self._doc_exists(doc_id):
+        try:
             self.elasticsearch.delete(self.index_info.alias, self.index_info.type, doc_id)
+        except NotFoundError:
+            pass
 
     def _datadog_timing(self, step):
         return metrics_histogram_timer(
@@ -9,8 +9,9 @@ from casexml.apps.case.signals import case_post_save
 from corehq.util.es.interface import ElasticsearchInterface
 from pillowtop.es_utils import initialize_index_and_mapping
 from pillowtop.feed.interface import Change, ChangeMeta
-from pillowtop.pillow.interface import PillowBase
+from pillowtop.pillow.interface import ConstructedPillow, PillowBase
 from pillowtop.processors.elastic import BulkElasticProcessor
+from pillowtop.processors.interface import BulkPillowProcessor
 from pillowtop.tests.utils import TEST_INDEX_INFO
 from pillowtop.utils import bulk_fetch_changes_docs, get_errors_with_ids
 
@@ -53,6 +54,59 @@ class BulkTest(SimpleTestCase):
         self.assertEqual([(1, 'e1'), (2, 'e2')], errors)
 
 
+class PipelinedPillowTest(SimpleTestCase):
+
+    class RecordingProcessor(BulkPillowProcessor):
+
+        def __init__(self):
+            self.processed = []
+
+        def process_change(self, change):
+            self.processed.append(change.sequence_id)
+
+        def process_changes_chunk(self, changes_chunk):
+            self.processed.extend(change.sequence_id for change in changes_chunk)
+            return [], []
+
+    @staticmethod
+    def _change(sequence_id):
+        return Change(
+            id=uuid.uuid4().hex,
+            sequence_id=sequence_id,
+            metadata=ChangeMeta(
+                document_id='doc', data_source_type='sql', data_source_name='test'
+            ),
+        )
+
+    def test_pipelined_processing(self):
+        processor = self.RecordingProcessor()
+        event_handler = Mock()
+        checkpoints = []
+
+        def update_checkpoint(change, context, new_seq=None):
+            # every change up to the checkpointed one has been processed
+            self.assertIn(new_seq, processor.processed)
+            checkpoints.append(new_seq)
+            return False
+
+        event_handler.get_new_seq.side_effect = lambda change: change['seq']
+        event_handler.update_checkpoint.side_effect = update_checkpoint
+        change_feed = Mock()
+        change_feed.iter_changes.return_value = [self._change(seq) for seq in range(25)]
+        pillow = ConstructedPillow(
+            name='test-pipelined-pillow',
+            checkpoint=Mock(),
+            change_feed=change_feed,
+            processor=processor,
+            change_processed_event_handler=event_handler,
+            processor_chunk_size=10,
+            processor_pipeline_depth=2,
+        )
+        pillow.process_changes(since=0, forever=False)
+        self.assertEqual(processor.processed, list(range(25)))
+        self.assertEqual(checkpoints, [9, 19, 24])
+
+
 @use_sql_backend
 @es_test
 class TestBulkDocOperations(TestCase):
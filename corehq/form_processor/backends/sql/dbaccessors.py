@@ -45,6 +45,7 @@ from corehq.form_processor.interfaces.dbaccessors import (
 )
 from corehq.form_processor.models import (
     CaseAttachmentSQL,
+    CaseSnapshot,
     CaseTransaction,
     CommCareCaseIndexSQL,
     CommCareCaseSQL,
@@ -922,7 +923,11 @@ class CaseAccessorSQL(AbstractCaseAccessor):
         with CommCareCaseSQL.get_plproxy_cursor() as cursor:
             cursor.execute('SELECT hard_delete_cases(%s, %s) as deleted_count', [domain, case_ids])
             results = fetchall_as_namedtuple(cursor)
-            return sum([result.deleted_count for result in results])
+            deleted_count = sum([result.deleted_count for result in results])
+
+        for db_name, split_case_ids in split_list_by_db_partition(case_ids):
+            CaseSnapshot.objects.using(db_name).filter(case_id__in=split_case_ids).delete()
+        return deleted_count
 
     @staticmethod
     def get_attachment_by_name(case_id, attachment_name):
@@ -963,6 +968,24 @@ class CaseAccessorSQL(AbstractCaseAccessor):
             [case_id, transaction_type])
         )
 
+    @staticmethod
+    def get_case_snapshots(case_id):
+        return list(
+            CaseSnapshot.objects.partitioned_query(case_id)
+            .filter(case_id=case_id)
+            .order_by('transaction_count')
+        )
+
+    @staticmethod
+    def get_form_transaction_count(case_id):
+        """Count the form transactions of a case that have not been revoked"""
+        return (
+            CaseTransaction.objects.partitioned_query(case_id)
+            .annotate(type_form=F('type').bitand(CaseTransaction.TYPE_FORM))
+            .filter(case_id=case_id, revoked=False, type_form=CaseTransaction.TYPE_FORM)
+            .count()
+        )
+
     @staticmethod
     def get_transactions_for_case_rebuild(case_id):
         return CaseAccessorSQL.get_transactions_by_type(case_id, CaseTransaction.TYPE_FORM)
@@ -1006,6 +1029,9 @@ class CaseAccessorSQL(AbstractCaseAccessor):
         indices_to_save_or_update = case.get_live_tracked_models(CommCareCaseIndexSQL)
         index_ids_to_delete = [index.id for index in case.get_tracked_models_to_delete(CommCareCaseIndexSQL)]
 
+        snapshots_to_save = case.get_tracked_models_to_create(CaseSnapshot)
+        snapshot_ids_to_delete = [snapshot.id for snapshot in case.get_tracked_models_to_delete(CaseSnapshot)]
+
         attachments_to_save = case.get_tracked_models_to_create(CaseAttachmentSQL)
         attachment_ids_to_delete = [att.id for att in case.get_tracked_models_to_delete(CaseAttachmentSQL)]
         for attachment in attachments_to_save:
@@ -1038,6 +1064,10 @@ class CaseAccessorSQL(AbstractCaseAccessor):
 
                 CaseAttachmentSQL.objects.using(case.db).filter(id__in=attachment_ids_to_delete).delete()
 
+                CaseSnapshot.objects.using(case.db).filter(id__in=snapshot_ids_to_delete).delete()
+                for snapshot in snapshots_to_save:
+                    snapshot.save()
+
                 case.clear_tracked_models()
         except DatabaseError as e:
             raise CaseSaveError(e)
@@ -27,6 +27,13 @@ from corehq import toggles
 from couchforms.const import ATTACHMENT_NAME
 from dimagi.utils.couch import acquire_lock, release_lock
 
+# Rebuilds caused by a change to a single form start from the latest case
+# snapshot that precedes the change. Other rebuilds replay every transaction.
+SNAPSHOT_REBUILD_TYPES = {
+    CaseTransaction.TYPE_REBUILD_FORM_ARCHIVED,
+    CaseTransaction.TYPE_REBUILD_FORM_EDIT,
+}
+
 
 class FormProcessorSQL(object):
 
@@ -269,6 +276,8 @@ class FormProcessorSQL(object):
                         "XForm %s had a case block that wasn't able to create a case! "
                         "This usually means it had a missing ID" % xform.get_id
                     )
+            for case_update_meta in touched_cases.values():
+                SqlCaseUpdateStrategy(case_update_meta.case).track_snapshot_if_due(xform)
 
         return touched_cases
 
@@ -306,6 +315,7 @@ class FormProcessorSQL(object):
         transactions = CaseAccessorSQL.get_case_transactions_by_case_id(
             case,
             updated_xforms=updated_xforms)
+        snapshots = CaseAccessorSQL.get_case_snapshots(case.case_id) if case.is_saved() else []
         strategy = SqlCaseUpdateStrategy(case)
 
         rebuild_transaction = CaseTransaction.rebuild_transaction(case, detail)
@@ -316,7 +326,8 @@ class FormProcessorSQL(object):
             # we're rebuilding because a form was un-archived
             unarchived_form_id = detail.form_id
         strategy.rebuild_from_transactions(
-            transactions, rebuild_transaction, unarchived_form_id=unarchived_form_id
+            transactions, rebuild_transaction, unarchived_form_id=unarchived_form_id,
+            snapshots=snapshots, use_snapshots=detail.type in SNAPSHOT_REBUILD_TYPES,
         )
         return case, rebuild_transaction
 
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import sys
 from functools import cmp_to_key
@@ -18,7 +19,8 @@ from casexml.apps.case.exceptions import (
 )
 from casexml.apps.case.xform import get_case_updates
 from casexml.apps.case.xml import V2
-from casexml.apps.case.xml.parser import KNOWN_PROPERTIES
+from casexml.apps.case.xml.parser import KNOWN_PROPERTIES, CaseIndex
+from dimagi.utils.parsing import json_format_datetime, string_to_utc_datetime
 
 from corehq import toggles
 from corehq.apps.couch_sql_migration.progress import (
@@ -28,6 +30,7 @@ from corehq.form_processor.backends.sql.dbaccessors import CaseAccessorSQL
 from corehq.form_processor.exceptions import AttachmentNotFound, StockProcessingError
 from corehq.form_processor.models import (
     CaseAttachmentSQL,
+    CaseSnapshot,
     CaseTransaction,
     CommCareCaseIndexSQL,
     CommCareCaseSQL,
@@ -59,6 +62,12 @@ PROPERTY_TYPE_MAPPING = {
     'external_id': _validate_length(255),
 }
 
+# case properties set by applying form transactions, saved in case snapshots
+SNAPSHOT_PROPERTIES = sorted(set(KNOWN_PROPERTIES) | {
+    'opened_by', 'modified_on', 'modified_by', 'closed', 'closed_on', 'closed_by', 'location_id',
+})
+SNAPSHOT_DATETIME_PROPERTIES = {'opened_on', 'modified_on', 'closed_on'}
+
 
 def _convert_type_check_length(property_name, value):
     try:
@@ -189,30 +198,33 @@ class SqlCaseUpdateStrategy(UpdateStrategy):
             return
 
         for index_update in action.indices:
-            if self.case.has_index(index_update.identifier):
-                if not index_update.referenced_id:
-                    # empty ID = delete
-                    index = self.case.get_index(index_update.identifier)
-                    self.case.track_delete(index)
-                else:
-                    # update
-                    index = self.case.get_index(index_update.identifier)
-                    index.referenced_type = index_update.referenced_type
-                    index.referenced_id = index_update.referenced_id
-                    index.relationship = index_update.relationship
-                    self.case.track_update(index)
+            self._apply_index_update(index_update)
+
+    def _apply_index_update(self, index_update):
+        if self.case.has_index(index_update.identifier):
+            if not index_update.referenced_id:
+                # empty ID = delete
+                index = self.case.get_index(index_update.identifier)
+                self.case.track_delete(index)
             else:
-                # no id, no index
-                if index_update.referenced_id:
-                    index = CommCareCaseIndexSQL(
-                        domain=self.case.domain,
-                        case=self.case,
-                        identifier=index_update.identifier,
-                        referenced_type=index_update.referenced_type,
-                        referenced_id=index_update.referenced_id,
-                        relationship=index_update.relationship
-                    )
-                    self.case.track_create(index)
+                # update
+                index = self.case.get_index(index_update.identifier)
+                index.referenced_type = index_update.referenced_type
+                index.referenced_id = index_update.referenced_id
+                index.relationship = index_update.relationship
+                self.case.track_update(index)
+        else:
+            # no id, no index
+            if index_update.referenced_id:
+                index = CommCareCaseIndexSQL(
+                    domain=self.case.domain,
+                    case=self.case,
+                    identifier=index_update.identifier,
+                    referenced_type=index_update.referenced_type,
+                    referenced_id=index_update.referenced_id,
+                    relationship=index_update.relationship
+                )
+                self.case.track_create(index)
 
     def _apply_attachments_action(self, attachment_action, xform):
         if not toggles.MM_CASE_PROPERTIES.enabled(self.case.domain):
@@ -266,12 +278,19 @@ class SqlCaseUpdateStrategy(UpdateStrategy):
         self.case.closed_on = None
         self.case.closed_by = ''
 
-    def rebuild_from_transactions(self, transactions, rebuild_transaction, unarchived_form_id=None):
+    def rebuild_from_transactions(self, transactions, rebuild_transaction, unarchived_form_id=None,
+                                  snapshots=None, use_snapshots=False):
         """
         :param transactions:        The transactions required to rebuild the case
         :param rebuild_transaction: The transaction to add for this rebuild
         :param unarchived_form_id:  If this rebuild was triggered by a form being unarchived then this is
                                     its ID.
+        :param snapshots:           The saved ``CaseSnapshot`` objects for the case. Snapshots that
+                                    no longer match the case transactions are deleted and new ones
+                                    are written as transactions are applied.
+        :param use_snapshots:       Start the rebuild from the latest snapshot that still matches the
+                                    case transactions instead of replaying every transaction. Otherwise
+                                    all snapshots are replaced.
         """
         already_deleted = False
         if self.case.is_deleted:
@@ -291,13 +310,33 @@ class SqlCaseUpdateStrategy(UpdateStrategy):
         original_indices = {index.identifier: index for index in self.case.indices}
         original_attachments = {attach.name: attach for attach in self.case.get_attachments()}
 
-        real_transactions = []
-        for transaction in transactions:
-            if transaction.is_form_transaction and transaction.is_relevant:
+        real_transactions = [
+            transaction for transaction in transactions
+            if transaction.is_form_transaction and transaction.is_relevant
+        ]
+        transaction_hashes = _get_transaction_hashes(real_transactions)
+        valid_snapshots = {}
+        for snapshot in snapshots or []:
+            count = snapshot.transaction_count
+            if (use_snapshots and count <= len(real_transactions)
+                    and snapshot.transactions_hash == transaction_hashes[count - 1]):
+                valid_snapshots[count] = snapshot
+            else:
+                self.case.track_delete(snapshot)
+
+        applied_count = 0
+        if valid_snapshots:
+            applied_count = max(valid_snapshots)
+            self._restore_snapshot(valid_snapshots[applied_count])
+            metrics_counter("commcare.form_processor.sql.rebuild_from_snapshot")
+
+        for count, transaction in enumerate(real_transactions, start=1):
+            if count > applied_count:
                 self._apply_form_transaction(transaction)
-                real_transactions.append(transaction)
-                if not transaction.is_saved():
-                    self.case.track_create(transaction)
+                if count % CaseSnapshot.INTERVAL == 0 and count not in valid_snapshots:
+                    self._track_snapshot(transaction, count, transaction_hashes[count - 1])
+            if not transaction.is_saved():
+                self.case.track_create(transaction)
 
         self._delete_old_related_models(
             original_indices,
@@ -343,7 +382,109 @@ class SqlCaseUpdateStrategy(UpdateStrategy):
         CaseAccessorSQL.fetch_case_transaction_forms(self.case, sorted_transactions)
         rebuild_detail = RebuildWithReason(reason="client_date_reconciliation")
         rebuild_transaction = CaseTransaction.rebuild_transaction(self.case, rebuild_detail)
-        self.rebuild_from_transactions(sorted_transactions, rebuild_transaction)
+        snapshots = CaseAccessorSQL.get_case_snapshots(self.case.case_id)
+        self.rebuild_from_transactions(sorted_transactions, rebuild_transaction, snapshots=snapshots)
+
+    def track_snapshot_if_due(self, xform):
+        """Write a snapshot of the case if the new form brings it to a multiple
+        of ``CaseSnapshot.INTERVAL`` relevant form transactions
+
+        Call once all the case updates in the form have been applied.
+        """
+        transaction = self.case.get_transaction_by_form_id(xform.form_id)
+        if not self.case.is_saved() or not transaction or transaction.is_saved():
+            return
+
+        transaction.cached_form = xform
+        if not (transaction.is_form_transaction and transaction.is_relevant):
+            return
+
+        # cheap check first: only load the case forms when a snapshot may be due
+        count = CaseAccessorSQL.get_form_transaction_count(self.case.case_id) + 1
+        if count % CaseSnapshot.INTERVAL != 0 or self.case.get_attachments():
+            return
+
+        real_transactions = [
+            tx for tx in CaseAccessorSQL.get_case_transactions_by_case_id(self.case)
+            if tx.is_form_transaction and tx.is_relevant
+        ]
+        real_transactions.append(transaction)
+        count = len(real_transactions)
+        if count % CaseSnapshot.INTERVAL != 0:
+            return
+
+        for snapshot in CaseAccessorSQL.get_case_snapshots(self.case.case_id):
+            if snapshot.transaction_count == count:
+                # left over from before an earlier form was archived
+                self.case.track_delete(snapshot)
+
+        self._track_snapshot(
+            transaction, count, _get_transaction_hashes(real_transactions)[-1],
+            index_identifiers={index.identifier for index in self.case.indices},
+        )
+
+    def _track_snapshot(self, transaction, transaction_count, transactions_hash, index_identifiers=None):
+        """
+        :param index_identifiers: Indices to save in the snapshot. Defaults to the
+                                  indices changed by the transactions applied so far.
+        """
+        if self.case.has_tracked_models(CaseAttachmentSQL):
+            # attachments are not saved in snapshots
+            return
+
+        properties = {}
+        for prop in SNAPSHOT_PROPERTIES:
+            value = getattr(self.case, prop)
+            if prop in SNAPSHOT_DATETIME_PROPERTIES and value is not None:
+                value = json_format_datetime(string_to_utc_datetime(value))
+            properties[prop] = value
+
+        if index_identifiers is None:
+            tracked_indices = (
+                self.case.get_tracked_models_to_create(CommCareCaseIndexSQL)
+                + self.case.get_tracked_models_to_update(CommCareCaseIndexSQL)
+                + self.case.get_tracked_models_to_delete(CommCareCaseIndexSQL)
+            )
+            index_identifiers = {index.identifier for index in tracked_indices}
+        indices = {}
+        for identifier in index_identifiers:
+            index = self.case.get_index(identifier)
+            indices[identifier] = {
+                'referenced_type': index.referenced_type,
+                'referenced_id': index.referenced_id,
+                'relationship': index.relationship,
+            } if index else None
+
+        self.case.track_create(CaseSnapshot(
+            case_id=self.case.case_id,
+            transaction_count=transaction_count,
+            transactions_hash=transactions_hash,
+            server_date=transaction.server_date,
+            case_state={
+                'properties': properties,
+                'case_json': self.case.case_json,
+                'indices': indices,
+            },
+        ))
+
+    def _restore_snapshot(self, snapshot):
+        """Set the case to the state it had after the transactions covered by the snapshot
+
+        Indices changed by those transactions are set to their final state (or
+        removed) the same way a form index block would set them.
+        """
+        state = snapshot.case_state
+        for prop, value in state['properties'].items():
+            if prop in SNAPSHOT_DATETIME_PROPERTIES and value is not None:
+                value = string_to_utc_datetime(value)
+            setattr(self.case, prop, value)
+        self.case.case_json = dict(state['case_json'])
+
+        for identifier, index in sorted(state['indices'].items()):
+            if index is None:
+                self._apply_index_update(CaseIndex(identifier, None, None))
+            else:
+                self._apply_index_update(CaseIndex(identifier, **index))
 
     def _delete_old_related_models(self, original_models_by_id, models_to_keep, key="identifier"):
         for model in models_to_keep:
@@ -362,6 +503,21 @@ class SqlCaseUpdateStrategy(UpdateStrategy):
                 self._apply_case_update(case_update, form)
 
 
+def _get_transaction_hashes(transactions):
+    """Get a running hash of the transactions
+
+    :return: list where item ``i`` is the hash of ``transactions[:i + 1]``.
+    Form edits change the hash since the edited form keeps its form ID.
+    """
+    running_hash = hashlib.sha1()
+    hashes = []
+    for transaction in transactions:
+        edited_on = transaction.form.edited_on if transaction.form else None
+        running_hash.update('{} {}\n'.format(transaction.form_id, edited_on).encode('utf-8'))
+        hashes.append(running_hash.hexdigest())
+    return hashes
+
+
 def _transaction_sort_key_function(case):
 
     def transaction_cmp(first_transaction, second_transaction):
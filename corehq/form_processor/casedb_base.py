@@ -72,10 +72,7 @@ class AbstractCaseDbCache(metaclass=ABCMeta):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        for lock in self.locks:
-            if lock is not None:
-                release_lock(lock, True)
-        self.locks = []
+        self._release_locks()
 
         if self.lock_stack:
             self.locks = self.lock_stack.pop()
@@ -107,6 +104,22 @@ class AbstractCaseDbCache(metaclass=ABCMeta):
         self._validate_case(case)
         self.cache[case_id] = case
 
+    def _release_locks(self):
+        for lock in self.locks:
+            if lock is not None:
+                release_lock(lock, True)
+        self.locks = []
+
+    def clear_cache(self):
+        """
+        Forget all cached cases so they are reloaded on next access.
+        Locks held by the current context are released, and taken again
+        when their cases are reloaded.
+        """
+        self._release_locks()
+        self.cache = {}
+        self._changed = set()
+
     def in_cache(self, case_id):
         return case_id in self.cache
 
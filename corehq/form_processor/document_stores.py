@@ -60,10 +60,15 @@ class FormDocumentStore(DocumentStore):
 
 class CaseDocumentStore(DocumentStore):
 
-    def __init__(self, domain, case_type=None):
+    def __init__(self, domain, case_type=None, modified_since=None):
+        """
+        :param modified_since: Only iterate over ids of cases modified on or after
+        this date. Only supported on the SQL backend.
+        """
         self.domain = domain
         self.case_accessors = CaseAccessors(domain=domain)
         self.case_type = case_type
+        self.modified_since = modified_since
 
     def get_document(self, doc_id):
         try:
@@ -73,9 +78,12 @@ class CaseDocumentStore(DocumentStore):
 
     def iter_document_ids(self):
         if should_use_sql_backend(self.domain):
-            accessor = CaseReindexAccessor(self.domain, case_type=self.case_type)
+            accessor = CaseReindexAccessor(
+                self.domain, case_type=self.case_type, start_date=self.modified_since
+            )
             return iter_all_ids(accessor)
         else:
+            assert self.modified_since is None, "modified_since is only supported on the SQL backend"
             return iter(self.case_accessors.get_case_ids_in_domain(self.case_type))
 
     def iter_documents(self, ids):
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+import jsonfield.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('form_processor', '0091_auto_20190603_2023'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('case_id', models.CharField(max_length=255)),
+                ('transaction_count', models.PositiveIntegerField()),
+                ('transactions_hash', models.CharField(max_length=40)),
+                ('server_date', models.DateTimeField()),
+                ('case_state', jsonfield.fields.JSONField(default=dict)),
+            ],
+            options={
+                'db_table': 'form_processor_casesnapshot',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='casesnapshot',
+            unique_together=set([('case_id', 'transaction_count')]),
+        ),
+    ]
@@ -51,6 +51,7 @@ CaseAttachmentSQL_DB_TABLE = 'form_processor_caseattachmentsql'
 CaseTransaction_DB_TABLE = 'form_processor_casetransaction'
 LedgerValue_DB_TABLE = 'form_processor_ledgervalue'
 LedgerTransaction_DB_TABLE = 'form_processor_ledgertransaction'
+CaseSnapshot_DB_TABLE = 'form_processor_casesnapshot'
 
 CaseAction = namedtuple("CaseAction", ["action_type", "updated_known_properties", "indices"])
 
@@ -1550,6 +1551,43 @@ class FormReprocessRebuild(CaseTransactionDetail):
     form_id = StringProperty()
 
 
+class CaseSnapshot(PartitionedModel, SaveStateMixin, models.Model):
+    """
+    The state of a case after applying its first ``transaction_count``
+    relevant form transactions.
+
+    Snapshots are written while rebuilding a case and allow later rebuilds
+    to replay only the transactions that come after them. ``transactions_hash``
+    identifies the transactions covered by the snapshot so that a snapshot
+    is no longer used once any of those transactions change.
+    """
+    partition_attr = 'case_id'
+
+    # write a snapshot after every INTERVAL relevant form transactions
+    INTERVAL = 100
+
+    # not a foreign key: snapshots are derived data and are removed
+    # separately when cases are hard deleted
+    case_id = models.CharField(max_length=255)
+    transaction_count = models.PositiveIntegerField()
+    transactions_hash = models.CharField(max_length=40)
+    server_date = models.DateTimeField(null=False)
+    case_state = JSONField(default=dict)
+
+    def __str__(self):
+        return (
+            "CaseSnapshot("
+            "case_id='{self.case_id}', "
+            "transaction_count='{self.transaction_count}', "
+            "server_date='{self.server_date}')"
+        ).format(self=self)
+
+    class Meta(object):
+        unique_together = ('case_id', 'transaction_count')
+        db_table = CaseSnapshot_DB_TABLE
+        app_label = "form_processor"
+
+
 class LedgerValue(PartitionedModel, SaveStateMixin, models.Model, TrackRelatedChanges):
     """
     Represents the current state of a ledger. Supercedes StockState
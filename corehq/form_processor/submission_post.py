@@ -1,4 +1,5 @@
 import logging
+import time
 from collections import namedtuple
 
 from ddtrace import tracer
@@ -28,7 +29,7 @@ from corehq.apps.commtrack.exceptions import MissingProductId
 from corehq.apps.domain_migration_flags.api import any_migrations_in_progress
 from corehq.apps.users.models import CouchUser
 from corehq.apps.users.permissions import has_permission_to_view_report
-from corehq.form_processor.exceptions import CouchSaveAborted, PostSaveError, XFormSaveError
+from corehq.form_processor.exceptions import CouchSaveAborted, PostSaveError, XFormLockError, XFormSaveError
 from corehq.form_processor.interfaces.dbaccessors import FormAccessors
 from corehq.form_processor.interfaces.processor import FormProcessorInterface
 from corehq.form_processor.parsers.form import process_xform_xml
@@ -216,7 +217,7 @@ class SubmissionPost(object):
 
     def run(self):
         self.track_load()
-        report_submission_usage(self.domain)
+        self._report_usage()
         failure_response = self._handle_basic_failure_modes()
         if failure_response:
             return FormProcessingResult(failure_response, None, [], [], 'known_failures')
@@ -260,16 +261,7 @@ class SubmissionPost(object):
         with result.get_locked_forms() as xforms:
             if len(xforms) > 1:
                 self.track_load(len(xforms) - 1)
-            if self.case_db:
-                case_db_cache = self.case_db
-                case_db_cache.cached_xforms.extend(xforms)
-            else:
-                case_db_cache = self.interface.casedb_cache(
-                    domain=self.domain, lock=True, deleted_ok=True,
-                    xforms=xforms, load_src="form_submission",
-                )
-
-            with case_db_cache as case_db:
+            with self._get_case_db(xforms) as case_db:
                 instance = xforms[0]
 
                 if instance.is_duplicate:
@@ -329,6 +321,15 @@ class SubmissionPost(object):
             response = self._get_open_rosa_response(instance, **openrosa_kwargs)
             return FormProcessingResult(response, instance, cases, ledgers, submission_type)
 
+    def _get_case_db(self, xforms):
+        if self.case_db:
+            self.case_db.cached_xforms.extend(xforms)
+            return self.case_db
+        return self.interface.casedb_cache(
+            domain=self.domain, lock=True, deleted_ok=True,
+            xforms=xforms, load_src="form_submission",
+        )
+
     def _conditionally_send_device_logs_to_sumologic(self, instance):
         url = getattr(settings, 'SUMOLOGIC_URL', None)
         if url and SUMOLOGIC_LOGS.enabled(instance.form_data.get('device_id'), NAMESPACE_OTHER):
@@ -438,6 +439,9 @@ class SubmissionPost(object):
     def get_response(self):
         return self.run().response
 
+    def _report_usage(self):
+        report_submission_usage(self.domain)
+
     @staticmethod
     def _fire_post_save_signals(instance, cases):
         from casexml.apps.case.signals import case_post_save
@@ -535,6 +539,108 @@ class SubmissionPost(object):
         return FormProcessingResult(response, device_log_form, [], [], 'device-log')
 
 
+class BatchSubmissionPost(object):
+    """
+    Process several form instances in one go, e.g. the backlog of a device
+    that has been offline for a while.
+
+    Each form is processed and saved exactly as SubmissionPost would, in
+    order, and gets its own FormProcessingResult. The forms share one case
+    cache: a case is loaded and locked the first time a form touches it and
+    stays locked until the batch is done, so later forms in the batch
+    don't reload cases that earlier forms just saved.
+
+    Case locks expire, so the cache is cleared and its locks released once
+    they have been held for CASE_LOCK_REFRESH_SECONDS.
+
+    An error processing one form does not abort the batch: the form gets an
+    error response the device will retry, and the remaining forms are
+    processed as usual. Forms that were saved before the error keep their
+    success responses, so they are not resubmitted.
+    """
+    MAX_FORMS = 50
+    CASE_LOCK_REFRESH_SECONDS = 60
+
+    def __init__(self, instances, domain, **submission_kwargs):
+        assert 'case_db' not in submission_kwargs, submission_kwargs
+        assert len(instances) <= self.MAX_FORMS, len(instances)
+        self.instances = instances
+        self.domain = domain
+        self.submission_kwargs = submission_kwargs
+
+    def run(self):
+        interface = FormProcessorInterface(self.domain)
+        case_db = interface.casedb_cache(
+            domain=self.domain, lock=True, deleted_ok=True, load_src="form_submission_batch",
+        )
+        report_submission_usage(self.domain, count=len(self.instances))
+        results = []
+        with case_db:
+            locked_at = time.time()
+            for index, instance in enumerate(self.instances):
+                if time.time() - locked_at > self.CASE_LOCK_REFRESH_SECONDS:
+                    case_db.clear_cache()
+                    locked_at = time.time()
+                try:
+                    result = _BatchedSubmissionPost(
+                        instance=instance,
+                        domain=self.domain,
+                        case_db=case_db,
+                        **self.submission_kwargs
+                    ).run()
+                except XFormLockError as e:
+                    result = self._get_error_result("XFormLockError: %s" % e, 'locked', status=423)
+                except Exception as e:
+                    notify_exception(None, "Error processing form in batch submission", details={
+                        'domain': self.domain,
+                        'index': index,
+                    })
+                    result = self._get_error_result(
+                        '{}: {}'.format(type(e).__name__, str(e)), 'unexpected_error', status=500
+                    )
+                if result.submission_type != 'normal':
+                    # errors can leave unsaved changes on the cached cases, and
+                    # duplicates and system actions may change cases behind its back
+                    case_db.clear_cache()
+                    locked_at = time.time()
+                results.append(result)
+        return results
+
+    @staticmethod
+    def _get_error_result(message, submission_type, status):
+        # Any status other than a 422 with processing_failure nature tells
+        # the device to resubmit the form
+        response = OpenRosaResponse(
+            message=message, nature=ResponseNature.SUBMIT_ERROR, status=status,
+        ).response()
+        return FormProcessingResult(response, None, [], [], submission_type)
+
+
+class _BatchedSubmissionPost(SubmissionPost):
+
+    def _report_usage(self):
+        # usage is reported for the whole batch by BatchSubmissionPost
+        pass
+
+    def _get_case_db(self, xforms):
+        # Don't re-enter the batch's case cache: that would release the locks
+        # on cases loaded by this form while they are still cached.
+        self.case_db.cached_xforms.extend(xforms)
+        return _NoExitContext(self.case_db)
+
+
+class _NoExitContext(object):
+
+    def __init__(self, value):
+        self.value = value
+
+    def __enter__(self):
+        return self.value
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
 def _transform_instance_to_error(interface, exception, instance):
     error_message = '{}: {}'.format(type(exception).__name__, str(exception))
     return interface.xformerror_from_xform_instance(instance, error_message)
@@ -21,7 +21,13 @@ from corehq.form_processor.backends.sql.dbaccessors import (
     iter_all_rows, FormAccessorSQL)
 from corehq.form_processor.backends.sql.processor import FormProcessorSQL
 from corehq.form_processor.interfaces.processor import ProcessedForms
-from corehq.form_processor.models import XFormInstanceSQL, CommCareCaseSQL, CaseTransaction, Attachment
+from corehq.form_processor.models import (
+    Attachment,
+    CaseSnapshot,
+    CaseTransaction,
+    CommCareCaseSQL,
+    XFormInstanceSQL,
+)
 from corehq.form_processor.utils.general import should_use_sql_backend
 from corehq.sql_db.models import PartitionedModel
 from corehq.util.test_utils import unit_testing_only, run_with_multiple_configs, RunConfig
@@ -51,7 +57,15 @@ class FormProcessorTestUtils(object):
     @classmethod
     @unit_testing_only
     def delete_all_sql_cases(cls, domain=None):
+        from corehq.sql_db.util import get_db_aliases_for_partitioned_query
         logger.debug("Deleting all SQL cases for domain %s", domain)
+        if domain:
+            # snapshots do not have a domain but live on the same shard as their case
+            for db_name in get_db_aliases_for_partitioned_query():
+                case_ids = CommCareCaseSQL.objects.using(db_name).filter(domain=domain).values('case_id')
+                CaseSnapshot.objects.using(db_name).filter(case_id__in=case_ids).delete()
+        else:
+            cls._delete_all_sql_sharded_models(CaseSnapshot)
         cls._delete_all_sql_sharded_models(CommCareCaseSQL, domain)
 
     @staticmethod
@@ -3,6 +3,10 @@ from corehq.messaging.scheduling.scheduling_partitioned.dbaccessors import (
     get_active_schedule_instance_ids,
     get_active_case_schedule_instance_ids,
 )
+from corehq.messaging.scheduling.scheduling_partitioned.due_index import (
+    get_due_schedule_instance_ids,
+    is_due_index_built,
+)
 from corehq.messaging.scheduling.scheduling_partitioned.models import (
     AlertScheduleInstance,
     TimedScheduleInstance,
@@ -10,19 +14,28 @@ from corehq.messaging.scheduling.scheduling_partitioned.models import (
     CaseTimedScheduleInstance,
 )
 from corehq.messaging.scheduling.tasks import (
+    build_schedule_due_index,
     handle_alert_schedule_instance,
     handle_timed_schedule_instance,
     handle_case_alert_schedule_instance,
     handle_case_timed_schedule_instance,
 )
 from corehq.sql_db.util import handle_connection_failure, get_default_and_partitioned_db_aliases
-from datetime import datetime
+from datetime import datetime, timedelta
 from dimagi.utils.couch import get_redis_lock
 from dimagi.utils.logging import notify_exception
 from django.core.management.base import BaseCommand
 from time import sleep
 
 
+# How often to also query the database for due instances, in case any
+# were missed by the due index
+DATABASE_QUERY_INTERVAL = timedelta(hours=1)
+# How often to queue a task to build the due index while it is missing.
+# The task does nothing if the index is already being built.
+DUE_INDEX_BUILD_INTERVAL = timedelta(hours=1)
+
+
 def skip_domain(domain):
     return any_migrations_in_progress(domain)
 
@@ -37,6 +50,9 @@ class Command(BaseCommand):
     """
     help = "Spawns tasks to process schedule instances"
 
+    last_database_query = None
+    last_due_index_build = None
+
     def get_task(self, cls):
         task = {
             AlertScheduleInstance: handle_alert_schedule_instance,
@@ -63,30 +79,64 @@ class Command(BaseCommand):
             track_unreleased=False,
         )
 
+    def enqueue(self, cls, domain, schedule_instance_id, next_event_due, case_id=None):
+        if skip_domain(domain):
+            return
+
+        # We use a non-blocking lock here with a timeout of one hour to make sure
+        # that we only retry non-processed schedule instances once an hour.
+        enqueue_lock = self.get_enqueue_lock(cls, schedule_instance_id, next_event_due)
+        if enqueue_lock.acquire(blocking=False):
+            if case_id:
+                self.get_task(cls).delay(case_id, schedule_instance_id)
+            else:
+                self.get_task(cls).delay(schedule_instance_id)
+
+    def should_query_database(self):
+        if not is_due_index_built():
+            # Query the database until the index has been built
+            self.queue_due_index_build()
+            return True
+
+        return (
+            self.last_database_query is None
+            or datetime.utcnow() - self.last_database_query >= DATABASE_QUERY_INTERVAL
+        )
+
+    def queue_due_index_build(self):
+        now = datetime.utcnow()
+        if self.last_due_index_build is None or now - self.last_due_index_build >= DUE_INDEX_BUILD_INTERVAL:
+            self.last_due_index_build = now
+            build_schedule_due_index.delay()
+
+    @property
+    def classes(self):
+        return (AlertScheduleInstance, TimedScheduleInstance, CaseAlertScheduleInstance, CaseTimedScheduleInstance)
+
     @handle_connection_failure(get_db_aliases=get_default_and_partitioned_db_aliases)
     def create_tasks(self):
+        if self.should_query_database():
+            self.last_database_query = datetime.utcnow()
+            self.create_tasks_from_database()
+        else:
+            self.create_tasks_from_due_index()
+
+    def create_tasks_from_due_index(self):
+        for cls in self.classes:
+            for domain, schedule_instance_id, case_id, next_event_due in get_due_schedule_instance_ids(
+                    cls, datetime.utcnow()):
+                self.enqueue(cls, domain, schedule_instance_id, next_event_due, case_id=case_id)
+
+    def create_tasks_from_database(self):
         for cls in (AlertScheduleInstance, TimedScheduleInstance):
             for domain, schedule_instance_id, next_event_due in get_active_schedule_instance_ids(
                     cls, datetime.utcnow()):
-                if skip_domain(domain):
-                    continue
-
-                # We use a non-blocking lock here with a timeout of one hour to make sure
-                # that we only retry non-processed schedule instances once an hour.
-                enqueue_lock = self.get_enqueue_lock(cls, schedule_instance_id, next_event_due)
-                if enqueue_lock.acquire(blocking=False):
-                    self.get_task(cls).delay(schedule_instance_id)
+                self.enqueue(cls, domain, schedule_instance_id, next_event_due)
 
         for cls in (CaseAlertScheduleInstance, CaseTimedScheduleInstance):
             for domain, case_id, schedule_instance_id, next_event_due in get_active_case_schedule_instance_ids(
                     cls, datetime.utcnow()):
-                if skip_domain(domain):
-                    continue
-
-                # See comment above about why we use a non-blocking lock here.
-                enqueue_lock = self.get_enqueue_lock(cls, schedule_instance_id, next_event_due)
-                if enqueue_lock.acquire(blocking=False):
-                    self.get_task(cls).delay(case_id, schedule_instance_id)
+                self.enqueue(cls, domain, schedule_instance_id, next_event_due, case_id=case_id)
 
     def handle(self, **options):
         while True:
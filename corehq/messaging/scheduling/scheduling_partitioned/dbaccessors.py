@@ -1,10 +1,16 @@
+from collections import defaultdict
 from uuid import UUID
 
 from django.db.models import Q
 
+from corehq.messaging.scheduling.scheduling_partitioned.due_index import (
+    remove_from_due_index,
+    update_due_index,
+)
 from corehq.sql_db.util import (
     get_db_aliases_for_partitioned_query,
     paginate_query_across_partitioned_databases,
+    split_list_by_db_partition,
 )
 from corehq.util.metrics.load_counters import load_counter_for_model
 
@@ -260,6 +266,28 @@ def get_case_timed_schedule_instances_for_schedule_id(case_id, schedule_id):
     )
 
 
+def get_case_schedule_instances_for_schedule_id_and_cases(cls, schedule_id, case_ids):
+    """
+    Returns the instances of the schedule for all of ``case_ids``, with one
+    query per shard
+    """
+    from corehq.messaging.scheduling.scheduling_partitioned.models import (
+        CaseAlertScheduleInstance,
+        CaseTimedScheduleInstance,
+    )
+
+    if cls is CaseAlertScheduleInstance:
+        schedule_filter = {'alert_schedule_id': schedule_id}
+    elif cls is CaseTimedScheduleInstance:
+        schedule_filter = {'timed_schedule_id': schedule_id}
+    else:
+        raise TypeError("Expected CaseAlertScheduleInstance or CaseTimedScheduleInstance")
+
+    for db_name, case_ids_for_db in split_list_by_db_partition(case_ids):
+        for instance in cls.objects.using(db_name).filter(case_id__in=case_ids_for_db, **schedule_filter):
+            yield instance
+
+
 def get_case_alert_schedule_instances_for_schedule(case_id, schedule):
     from corehq.messaging.scheduling.models import AlertSchedule
 
@@ -320,7 +348,7 @@ def delete_alert_schedule_instances_for_schedule(cls, schedule_id):
     _validate_uuid(schedule_id)
 
     for db_name in get_db_aliases_for_partitioned_query():
-        cls.objects.using(db_name).filter(alert_schedule_id=schedule_id).delete()
+        _delete_and_remove_from_due_index(cls, cls.objects.using(db_name).filter(alert_schedule_id=schedule_id))
 
 
 def delete_timed_schedule_instances_for_schedule(cls, schedule_id):
@@ -335,7 +363,7 @@ def delete_timed_schedule_instances_for_schedule(cls, schedule_id):
     _validate_uuid(schedule_id)
 
     for db_name in get_db_aliases_for_partitioned_query():
-        cls.objects.using(db_name).filter(timed_schedule_id=schedule_id).delete()
+        _delete_and_remove_from_due_index(cls, cls.objects.using(db_name).filter(timed_schedule_id=schedule_id))
 
 
 def delete_schedule_instances_by_case_id(domain, case_id):
@@ -346,4 +374,68 @@ def delete_schedule_instances_by_case_id(domain, case_id):
 
     for cls in (CaseAlertScheduleInstance, CaseTimedScheduleInstance):
         for db_name in get_db_aliases_for_partitioned_query():
-            cls.objects.using(db_name).filter(domain=domain, case_id=case_id).delete()
+            queryset = cls.objects.using(db_name).filter(domain=domain, case_id=case_id)
+            _delete_and_remove_from_due_index(cls, queryset)
+
+
+def _delete_and_remove_from_due_index(cls, queryset):
+    from corehq.messaging.scheduling.scheduling_partitioned.models import CaseScheduleInstanceMixin
+
+    if issubclass(cls, CaseScheduleInstanceMixin):
+        ids = list(queryset.values_list('schedule_instance_id', 'case_id'))
+    else:
+        ids = [(schedule_instance_id, None) for schedule_instance_id in
+               queryset.values_list('schedule_instance_id', flat=True)]
+
+    queryset.delete()
+    remove_from_due_index(cls, ids)
+
+
+def _group_schedule_instances_by_class_and_db(instances):
+    from corehq.messaging.scheduling.scheduling_partitioned.models import (
+        AlertScheduleInstance,
+        TimedScheduleInstance,
+        CaseAlertScheduleInstance,
+        CaseTimedScheduleInstance,
+    )
+
+    classes = (AlertScheduleInstance, TimedScheduleInstance, CaseAlertScheduleInstance, CaseTimedScheduleInstance)
+
+    result = defaultdict(list)
+    for instance in instances:
+        _validate_class(instance, classes)
+        _validate_uuid(instance.schedule_instance_id)
+        result[(type(instance), instance.db)].append(instance)
+
+    return result.items()
+
+
+def bulk_create_schedule_instances(instances, batch_size=1000):
+    """
+    Saves new schedule instances with one INSERT per table per shard
+    (per batch_size instances)
+    """
+    for (cls, db_name), instances_for_db in _group_schedule_instances_by_class_and_db(instances):
+        cls.objects.using(db_name).bulk_create(instances_for_db, batch_size=batch_size)
+        update_due_index(instances_for_db)
+
+
+def bulk_update_schedule_instances(instances, batch_size=1000):
+    """
+    Saves existing schedule instances with one UPDATE per table per shard
+    (per batch_size instances)
+    """
+    for (cls, db_name), instances_for_db in _group_schedule_instances_by_class_and_db(instances):
+        fields = [field.name for field in cls._meta.concrete_fields if not field.primary_key]
+        cls.objects.using(db_name).bulk_update(instances_for_db, fields, batch_size=batch_size)
+        update_due_index(instances_for_db)
+
+
+def bulk_delete_schedule_instances(instances):
+    """
+    Deletes schedule instances with one DELETE per table per shard
+    """
+    for (cls, db_name), instances_for_db in _group_schedule_instances_by_class_and_db(instances):
+        _delete_and_remove_from_due_index(cls, cls.objects.using(db_name).filter(
+            schedule_instance_id__in=[instance.schedule_instance_id for instance in instances_for_db]
+        ))
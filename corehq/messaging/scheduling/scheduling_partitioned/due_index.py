@@ -0,0 +1,168 @@
+"""
+An index in Redis of active schedule instances by when they are next due.
+
+Finding due instances with a query on ``next_event_due`` has to scan every
+shard, and gets slower as the number of active instances grows. This index
+lets the poller read only the instances that are due.
+
+For each schedule instance class there is a sorted set of instances,
+scored by ``next_event_due`` (in seconds since the epoch), and a hash of
+the instance's domain. Saving or deleting a schedule instance updates the
+index. The index is (re)built from the database by a task when it is
+missing, and the poller still queries the database periodically, so an instance that
+was missed by the index is only delayed, not lost.
+"""
+from calendar import timegm
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from django.db.models import Q
+
+from dimagi.utils.chunked import chunked
+from dimagi.utils.couch import get_redis_client, get_redis_lock
+
+from corehq.sql_db.util import paginate_query_across_partitioned_databases
+
+DUE_INDEX_BUILT_KEY = 'scheduling-due-index-built'
+# The index is rebuilt this often, to add anything it may have missed
+DUE_INDEX_REBUILD_INTERVAL = timedelta(days=1)
+
+
+def _get_client():
+    return get_redis_client().client.get_client()
+
+
+def _get_keys(cls):
+    return (
+        'scheduling-due-index-{}'.format(cls.__name__),
+        'scheduling-due-index-domains-{}'.format(cls.__name__),
+    )
+
+
+def _get_member(schedule_instance_id, case_id=None):
+    if case_id:
+        return '{} {}'.format(schedule_instance_id.hex, case_id)
+    return schedule_instance_id.hex
+
+
+def _parse_member(member):
+    schedule_instance_id, __, case_id = member.decode('utf-8').partition(' ')
+    return UUID(schedule_instance_id), case_id or None
+
+
+def _get_score(next_event_due):
+    # Rounded up, so that an instance is not read from the index before
+    # it is due
+    score = timegm(next_event_due.utctimetuple())
+    if next_event_due.microsecond:
+        score += 1
+    return score
+
+
+def _add(pipeline, cls, domain, schedule_instance_id, case_id, next_event_due):
+    key, domains_key = _get_keys(cls)
+    member = _get_member(schedule_instance_id, case_id)
+    pipeline.zadd(key, _get_score(next_event_due), member)
+    pipeline.hset(domains_key, member, domain)
+
+
+def _remove(pipeline, cls, schedule_instance_id, case_id):
+    key, domains_key = _get_keys(cls)
+    member = _get_member(schedule_instance_id, case_id)
+    pipeline.zrem(key, member)
+    pipeline.hdel(domains_key, member)
+
+
+def update_due_index(instances):
+    """
+    Adds active instances to the index, or updates when they are due,
+    and removes inactive instances
+    """
+    pipeline = _get_client().pipeline(transaction=False)
+    for instance in instances:
+        case_id = getattr(instance, 'case_id', None)
+        if instance.active:
+            _add(pipeline, type(instance), instance.domain, instance.schedule_instance_id, case_id,
+                 instance.next_event_due)
+        else:
+            _remove(pipeline, type(instance), instance.schedule_instance_id, case_id)
+    pipeline.execute()
+
+
+def remove_from_due_index(cls, schedule_instance_ids_and_case_ids):
+    """
+    :param schedule_instance_ids_and_case_ids: a list of
+    (schedule_instance_id, case_id) tuples; case_id is None for
+    instances that are not case schedule instances
+    """
+    pipeline = _get_client().pipeline(transaction=False)
+    for schedule_instance_id, case_id in schedule_instance_ids_and_case_ids:
+        _remove(pipeline, cls, schedule_instance_id, case_id)
+    pipeline.execute()
+
+
+def get_due_schedule_instance_ids(cls, due_before):
+    """
+    :return: a generator of (domain, schedule_instance_id, case_id, next_event_due)
+    tuples for the instances of cls due before due_before
+    """
+    key, domains_key = _get_keys(cls)
+    client = _get_client()
+    due = client.zrangebyscore(key, '-inf', timegm(due_before.utctimetuple()), withscores=True)
+    for chunk in chunked(due, 1000, list):
+        domains = client.hmget(domains_key, [member for member, score in chunk])
+        for (member, score), domain in zip(chunk, domains):
+            if domain is None:
+                # Removed since it was read
+                continue
+            schedule_instance_id, case_id = _parse_member(member)
+            yield domain.decode('utf-8'), schedule_instance_id, case_id, datetime.utcfromtimestamp(score)
+
+
+def is_due_index_built():
+    return bool(_get_client().exists(DUE_INDEX_BUILT_KEY))
+
+
+def build_due_index(classes):
+    """
+    Adds all active instances of classes to the index
+
+    :return: False if the index is already being built by another process,
+    otherwise True
+    """
+    from corehq.messaging.scheduling.scheduling_partitioned.models import CaseScheduleInstanceMixin
+
+    lock = get_redis_lock(
+        'scheduling-due-index-build',
+        timeout=6 * 60 * 60,
+        name='scheduling_due_index_build',
+        track_unreleased=False,
+    )
+    if not lock.acquire(blocking=False):
+        return False
+
+    try:
+        client = _get_client()
+        for cls in classes:
+            is_case_instance = issubclass(cls, CaseScheduleInstanceMixin)
+            values = ['domain', 'schedule_instance_id', 'next_event_due']
+            if is_case_instance:
+                values.append('case_id')
+            rows = paginate_query_across_partitioned_databases(
+                cls,
+                Q(active=True),
+                values=values,
+                load_source='build_schedule_due_index',
+            )
+            for chunk in chunked(rows, 1000):
+                pipeline = client.pipeline(transaction=False)
+                for row in chunk:
+                    domain, schedule_instance_id, next_event_due = row[:3]
+                    case_id = row[3] if is_case_instance else None
+                    _add(pipeline, cls, domain, schedule_instance_id, case_id, next_event_due)
+                pipeline.execute()
+        client.set(DUE_INDEX_BUILT_KEY, 1, ex=int(DUE_INDEX_REBUILD_INTERVAL.total_seconds()))
+    finally:
+        lock.release()
+
+    return True
@@ -15,6 +15,10 @@ from corehq.form_processor.utils import is_commcarecase
 from corehq.messaging.scheduling import util
 from corehq.messaging.scheduling.exceptions import UnknownRecipientType
 from corehq.messaging.scheduling.models import AlertSchedule, TimedSchedule, IVRSurveyContent, SMSCallbackContent
+from corehq.messaging.scheduling.scheduling_partitioned.due_index import (
+    remove_from_due_index,
+    update_due_index,
+)
 from corehq.sql_db.models import PartitionedModel
 from corehq.util.timezones.conversions import ServerTime, UserTime
 from corehq.util.timezones.utils import get_timezone_for_domain, coerce_timezone_value
@@ -59,6 +63,17 @@ class ScheduleInstance(PartitionedModel):
             ('domain', 'active', 'next_event_due'),
         )
 
+    def save(self, *args, **kwargs):
+        super(ScheduleInstance, self).save(*args, **kwargs)
+        update_due_index([self])
+
+    def delete(self, *args, **kwargs):
+        # The primary key is cleared by delete()
+        schedule_instance_id = self.schedule_instance_id
+        result = super(ScheduleInstance, self).delete(*args, **kwargs)
+        remove_from_due_index(type(self), [(schedule_instance_id, getattr(self, 'case_id', None))])
+        return result
+
     def get_today_for_recipient(self, schedule):
         return ServerTime(util.utcnow()).user_time(self.get_timezone(schedule)).done().date()
 
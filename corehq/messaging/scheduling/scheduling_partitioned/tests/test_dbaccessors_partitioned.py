@@ -2,6 +2,9 @@ import uuid
 from corehq.form_processor.backends.sql.dbaccessors import ShardAccessor
 from corehq.form_processor.tests.utils import only_run_with_partitioned_database
 from corehq.messaging.scheduling.scheduling_partitioned.dbaccessors import (
+    bulk_create_schedule_instances,
+    bulk_delete_schedule_instances,
+    bulk_update_schedule_instances,
     get_alert_schedule_instance,
     get_timed_schedule_instance,
     save_alert_schedule_instance,
@@ -102,6 +105,23 @@ class TestSchedulingPartitionedDBAccessorsGetAndSave(BaseSchedulingPartitionedDB
         self.assertEqual(TimedScheduleInstance.objects.using(self.db1).count(), 0)
         self.assertEqual(TimedScheduleInstance.objects.using(self.db2).count(), 1)
 
+    def test_bulk_create_and_update_schedule_instances(self):
+        alert_instance = self.make_alert_schedule_instance(self.p1_uuid)
+        timed_instance = self.make_timed_schedule_instance(self.p2_uuid)
+        bulk_create_schedule_instances([alert_instance, timed_instance])
+
+        self.assertEqual(AlertScheduleInstance.objects.using(self.db1).count(), 1)
+        self.assertEqual(AlertScheduleInstance.objects.using(self.db2).count(), 0)
+        self.assertEqual(TimedScheduleInstance.objects.using(self.db1).count(), 0)
+        self.assertEqual(TimedScheduleInstance.objects.using(self.db2).count(), 1)
+
+        alert_instance.active = False
+        timed_instance.current_event_num = 1
+        bulk_update_schedule_instances([alert_instance, timed_instance])
+
+        self.assertFalse(get_alert_schedule_instance(self.p1_uuid).active)
+        self.assertEqual(get_timed_schedule_instance(self.p2_uuid).current_event_num, 1)
+
     def test_get_alert_schedule_instance(self):
         self.test_save_alert_schedule_instance()
         instance = get_alert_schedule_instance(self.p1_uuid)
@@ -199,6 +219,17 @@ class TestSchedulingPartitionedDBAccessorsDeleteAndFilter(BaseSchedulingPartitio
         with self.assertRaises(TimedScheduleInstance.DoesNotExist):
             get_timed_schedule_instance(self.p2_uuid2)
 
+    def test_bulk_delete_schedule_instances(self):
+        bulk_delete_schedule_instances([
+            self.alert_instance1_p1,
+            self.alert_instance2_p2,
+            self.timed_instance2_p1,
+        ])
+        self.assertEqual(AlertScheduleInstance.objects.using(self.db1).count(), 1)
+        self.assertEqual(AlertScheduleInstance.objects.using(self.db2).count(), 0)
+        self.assertEqual(TimedScheduleInstance.objects.using(self.db1).count(), 0)
+        self.assertEqual(TimedScheduleInstance.objects.using(self.db2).count(), 2)
+
     def test_get_active_alert_schedule_instance_ids(self):
         self.assertItemsEqual(
             get_active_schedule_instance_ids(
@@ -0,0 +1,100 @@
+import uuid
+from datetime import datetime
+
+from django.test import TestCase
+
+from corehq.form_processor.tests.utils import partitioned
+from corehq.messaging.scheduling.scheduling_partitioned.dbaccessors import (
+    delete_schedule_instances_by_case_id,
+)
+from corehq.messaging.scheduling.scheduling_partitioned.due_index import (
+    get_due_schedule_instance_ids,
+)
+from corehq.messaging.scheduling.scheduling_partitioned.models import (
+    AlertScheduleInstance,
+    CaseAlertScheduleInstance,
+    CaseScheduleInstanceMixin,
+)
+
+
+@partitioned
+class DueIndexTest(TestCase):
+
+    domain = 'scheduling-due-index-test'
+
+    def get_due(self, cls, due_before):
+        return [
+            (schedule_instance_id, case_id, next_event_due)
+            for domain, schedule_instance_id, case_id, next_event_due
+            in get_due_schedule_instance_ids(cls, due_before)
+            if domain == self.domain
+        ]
+
+    def create_alert_schedule_instance(self):
+        instance = AlertScheduleInstance(
+            domain=self.domain,
+            recipient_type='CommCareUser',
+            recipient_id=uuid.uuid4().hex,
+            current_event_num=0,
+            schedule_iteration_num=1,
+            next_event_due=datetime(2018, 7, 1, 12, 0),
+            active=True,
+            alert_schedule_id=uuid.uuid4(),
+        )
+        instance.save()
+        self.addCleanup(AlertScheduleInstance.objects.using(instance.db).filter(
+            schedule_instance_id=instance.schedule_instance_id).delete)
+        return instance
+
+    def test_save(self):
+        instance = self.create_alert_schedule_instance()
+        self.assertEqual(self.get_due(AlertScheduleInstance, datetime(2018, 7, 1, 11, 59)), [])
+        self.assertEqual(
+            self.get_due(AlertScheduleInstance, datetime(2018, 7, 1, 12, 0)),
+            [(instance.schedule_instance_id, None, datetime(2018, 7, 1, 12, 0))]
+        )
+
+        instance.next_event_due = datetime(2018, 7, 2, 12, 0)
+        instance.save()
+        self.assertEqual(self.get_due(AlertScheduleInstance, datetime(2018, 7, 2)), [])
+
+        instance.active = False
+        instance.save()
+        self.assertEqual(self.get_due(AlertScheduleInstance, datetime(2018, 7, 3)), [])
+
+    def test_not_due_within_second(self):
+        instance = self.create_alert_schedule_instance()
+        instance.next_event_due = datetime(2018, 7, 1, 12, 0, 0, 500000)
+        instance.save()
+        self.assertEqual(self.get_due(AlertScheduleInstance, datetime(2018, 7, 1, 12, 0, 0, 900000)), [])
+        self.assertEqual(
+            self.get_due(AlertScheduleInstance, datetime(2018, 7, 1, 12, 0, 1)),
+            [(instance.schedule_instance_id, None, datetime(2018, 7, 1, 12, 0, 1))]
+        )
+
+    def test_delete(self):
+        instance = self.create_alert_schedule_instance()
+        instance.delete()
+        self.assertEqual(self.get_due(AlertScheduleInstance, datetime(2018, 7, 3)), [])
+
+    def test_delete_by_case_id(self):
+        case_id = uuid.uuid4().hex
+        instance = CaseAlertScheduleInstance(
+            domain=self.domain,
+            recipient_type=CaseScheduleInstanceMixin.RECIPIENT_TYPE_SELF,
+            current_event_num=0,
+            schedule_iteration_num=1,
+            next_event_due=datetime(2018, 7, 1),
+            active=True,
+            alert_schedule_id=uuid.uuid4(),
+            case_id=case_id,
+            rule_id=1,
+        )
+        instance.save()
+        self.assertEqual(
+            self.get_due(CaseAlertScheduleInstance, datetime(2018, 7, 3)),
+            [(instance.schedule_instance_id, case_id, datetime(2018, 7, 1))]
+        )
+
+        delete_schedule_instances_by_case_id(self.domain, case_id)
+        self.assertEqual(self.get_due(CaseAlertScheduleInstance, datetime(2018, 7, 3)), [])
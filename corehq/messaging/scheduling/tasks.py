@@ -1,3 +1,7 @@
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
 from celery.task import task
 from corehq.messaging.scheduling.models import (
     ImmediateBroadcast,
@@ -13,8 +17,9 @@ from corehq.messaging.scheduling.scheduling_partitioned.models import (
     CaseScheduleInstanceMixin,
 )
 from corehq.messaging.scheduling.scheduling_partitioned.dbaccessors import (
-    delete_alert_schedule_instance,
-    delete_timed_schedule_instance,
+    bulk_create_schedule_instances,
+    bulk_delete_schedule_instances,
+    bulk_update_schedule_instances,
     get_alert_schedule_instances_for_schedule,
     get_timed_schedule_instances_for_schedule,
     get_alert_schedule_instance,
@@ -22,14 +27,21 @@ from corehq.messaging.scheduling.scheduling_partitioned.dbaccessors import (
     get_timed_schedule_instance,
     save_timed_schedule_instance,
     get_case_alert_schedule_instances_for_schedule,
+    get_case_alert_schedule_instances_for_schedule_id,
+    get_case_schedule_instances_for_schedule_id_and_cases,
     get_case_timed_schedule_instances_for_schedule,
+    get_case_timed_schedule_instances_for_schedule_id,
     get_case_schedule_instance,
     save_case_schedule_instance,
-    delete_case_schedule_instance,
     delete_alert_schedule_instances_for_schedule,
     delete_timed_schedule_instances_for_schedule,
     delete_schedule_instances_by_case_id,
 )
+from corehq.messaging.scheduling.scheduling_partitioned.due_index import (
+    build_due_index,
+    remove_from_due_index,
+    update_due_index,
+)
 from corehq.util.celery_utils import no_result_task
 from datetime import datetime
 from dimagi.utils.couch import CriticalSection
@@ -101,56 +113,40 @@ class ScheduleInstanceRefresher(object):
         """
         raise NotImplementedError()
 
-    @staticmethod
-    def delete_instance(instance):
-        if isinstance(instance, AlertScheduleInstance):
-            delete_alert_schedule_instance(instance)
-        elif isinstance(instance, TimedScheduleInstance):
-            delete_timed_schedule_instance(instance)
-        elif isinstance(instance, (CaseAlertScheduleInstance, CaseTimedScheduleInstance)):
-            delete_case_schedule_instance(instance)
-        else:
-            raise TypeError("Unexpected type: %s" % type(instance))
-
-    @staticmethod
-    def save_instance(instance):
-        if isinstance(instance, AlertScheduleInstance):
-            save_alert_schedule_instance(instance)
-        elif isinstance(instance, TimedScheduleInstance):
-            save_timed_schedule_instance(instance)
-        elif isinstance(instance, (CaseAlertScheduleInstance, CaseTimedScheduleInstance)):
-            save_case_schedule_instance(instance)
-        else:
-            raise TypeError("Unexpected type: %s" % type(instance))
+    def get_changes(self):
+        """
+        :return: a tuple of the lists of instances to delete, create and
+        update. Instances that didn't change are left out.
+        """
+        # Compare recipients as sets. We should avoid saving instances
+        # that didn't change to prevent churn on the database tables.
+        existing_recipients = set(self.existing_instances)
+
+        instances_to_create = [
+            self.create_new_instance_for_recipient(recipient_type, recipient_id)
+            for recipient_type, recipient_id in self.new_recipients - existing_recipients
+        ]
+        for instance in instances_to_create:
+            instance.check_active_flag_against_schedule()
+
+        instances_to_update = []
+        for recipient_type_and_id in existing_recipients & self.new_recipients:
+            instance = self.existing_instances[recipient_type_and_id]
+            needs_saving = self.handle_existing_instance(instance)
+            if instance.check_active_flag_against_schedule() or needs_saving:
+                instances_to_update.append(instance)
+
+        instances_to_delete = [
+            self.existing_instances[recipient_type_and_id]
+            for recipient_type_and_id in existing_recipients - self.new_recipients
+        ]
+        return instances_to_delete, instances_to_create, instances_to_update
 
     def refresh(self):
-        # A list of (instance, needs_saving) tuples representing the final version
-        # of the refreshed instances and whether or not each one needs to be saved
-        # at the end of processing. We should avoid saving instances that didn't
-        # change to prevent churn on the database tables.
-        refreshed_list = []
-
-        for recipient_type_and_id in self.new_recipients:
-            recipient_type, recipient_id = recipient_type_and_id
-
-            if recipient_type_and_id not in self.existing_instances:
-                refreshed_list.append(
-                    (self.create_new_instance_for_recipient(recipient_type, recipient_id), True)
-                )
-
-        for recipient_type_and_id, instance in self.existing_instances.items():
-            if recipient_type_and_id in self.new_recipients:
-                needs_saving = self.handle_existing_instance(instance)
-                refreshed_list.append((instance, needs_saving))
-            else:
-                self.delete_instance(instance)
-
-        for instance, needs_saving in refreshed_list:
-            if instance.check_active_flag_against_schedule():
-                needs_saving = True
-
-            if needs_saving:
-                self.save_instance(instance)
+        instances_to_delete, instances_to_create, instances_to_update = self.get_changes()
+        bulk_delete_schedule_instances(instances_to_delete)
+        bulk_create_schedule_instances(instances_to_create)
+        bulk_update_schedule_instances(instances_to_update)
 
 
 class AlertScheduleInstanceRefresher(ScheduleInstanceRefresher):
@@ -286,6 +282,93 @@ class CaseTimedScheduleInstanceRefresher(ScheduleInstanceRefresher):
         return False
 
 
+class CaseScheduleInstanceBatch(object):
+    """
+    Collects the case schedule instance changes made while running a rule
+    on a chunk of cases, so that they are read and written together.
+
+    The instances of a schedule are loaded for every case in the chunk the
+    first time any of the cases needs them. The changes are written by
+    save() with one bulk DELETE, INSERT and UPDATE per table and shard.
+    """
+
+    def __init__(self, case_ids):
+        self.case_ids = set(case_ids)
+        # {(cls, schedule_id): {case_id: [instance, ...]}}
+        self.instances = {}
+        self.instances_to_delete = []
+        self.instances_to_create = []
+        self.instances_to_update = []
+
+    def get_instances(self, cls, case_id, schedule_id):
+        if case_id not in self.case_ids:
+            raise ValueError("Case %s is not part of this batch" % case_id)
+
+        key = (cls, schedule_id)
+        if key not in self.instances:
+            instances_by_case_id = defaultdict(list)
+            for instance in get_case_schedule_instances_for_schedule_id_and_cases(
+                    cls, schedule_id, self.case_ids):
+                instances_by_case_id[instance.case_id].append(instance)
+            self.instances[key] = instances_by_case_id
+
+        return list(self.instances[key][case_id])
+
+    def add_changes(self, cls, case_id, schedule_id, instances_to_delete, instances_to_create,
+                    instances_to_update):
+        for instance in instances_to_delete:
+            self._delete(instance)
+        self.instances_to_create.extend(instances_to_create)
+        self.instances_to_update.extend(instances_to_update)
+
+        deleted_ids = {instance.schedule_instance_id for instance in instances_to_delete}
+        self.instances[(cls, schedule_id)][case_id] = [
+            instance for instance in self.get_instances(cls, case_id, schedule_id)
+            if instance.schedule_instance_id not in deleted_ids
+        ] + list(instances_to_create)
+
+    def delete_instances(self, cls, case_id, schedule_id):
+        for instance in self.get_instances(cls, case_id, schedule_id):
+            self._delete(instance)
+        self.instances[(cls, schedule_id)][case_id] = []
+
+    def _delete(self, instance):
+        if instance in self.instances_to_create:
+            # It was created earlier in this batch, so it was never saved
+            self.instances_to_create.remove(instance)
+        else:
+            self.instances_to_delete.append(instance)
+
+    def save(self):
+        bulk_delete_schedule_instances(self.instances_to_delete)
+        bulk_create_schedule_instances(self.instances_to_create)
+        bulk_update_schedule_instances(self.instances_to_update)
+
+
+_case_schedule_instance_batch = threading.local()
+
+
+@contextmanager
+def case_schedule_instance_batch(case_ids):
+    """
+    Read and write the case schedule instances refreshed or deleted for
+    any of ``case_ids`` in this context together. The changes are saved
+    when the context exits without an error.
+    """
+    assert get_case_schedule_instance_batch() is None, "Case schedule instance batches can't be nested"
+    batch = CaseScheduleInstanceBatch(case_ids)
+    _case_schedule_instance_batch.batch = batch
+    try:
+        yield batch
+        batch.save()
+    finally:
+        _case_schedule_instance_batch.batch = None
+
+
+def get_case_schedule_instance_batch():
+    return getattr(_case_schedule_instance_batch, 'batch', None)
+
+
 @task(serializer='pickle', queue=settings.CELERY_REMINDER_RULE_QUEUE, ignore_result=True)
 def refresh_alert_schedule_instances(schedule_id, recipients):
     """
@@ -320,6 +403,13 @@ def refresh_timed_schedule_instances(schedule_id, recipients, start_date=None):
         ).refresh()
 
 
+@no_result_task(serializer='pickle', queue=settings.CELERY_REMINDER_RULE_QUEUE)
+def build_schedule_due_index():
+    build_due_index(
+        (AlertScheduleInstance, TimedScheduleInstance, CaseAlertScheduleInstance, CaseTimedScheduleInstance)
+    )
+
+
 @no_result_task(serializer='pickle', queue=settings.CELERY_REMINDER_RULE_QUEUE, acks_late=True,
                 default_retry_delay=60 * 60, max_retries=24, bind=True)
 def delete_alert_schedule_instances(self, schedule_id):
@@ -388,14 +478,24 @@ def refresh_case_alert_schedule_instances(case, schedule, action_definition, rul
     :param rule: the AutomaticUpdateRule that is causing the schedule instances
     to be refreshed
     """
-    CaseAlertScheduleInstanceRefresher(
+    batch = get_case_schedule_instance_batch()
+    if batch:
+        existing_instances = batch.get_instances(CaseAlertScheduleInstance, case.case_id, schedule.schedule_id)
+    else:
+        existing_instances = get_case_alert_schedule_instances_for_schedule(case.case_id, schedule)
+
+    refresher = CaseAlertScheduleInstanceRefresher(
         case,
         action_definition,
         rule,
         schedule,
         action_definition.recipients,
-        get_case_alert_schedule_instances_for_schedule(case.case_id, schedule)
-    ).refresh()
+        existing_instances
+    )
+    if batch:
+        batch.add_changes(CaseAlertScheduleInstance, case.case_id, schedule.schedule_id, *refresher.get_changes())
+    else:
+        refresher.refresh()
 
 
 def refresh_case_timed_schedule_instances(case, schedule, action_definition, rule, start_date=None):
@@ -408,15 +508,41 @@ def refresh_case_timed_schedule_instances(case, schedule, action_definition, rul
     to be refreshed
     :param start_date: the date to start the TimedSchedule
     """
-    CaseTimedScheduleInstanceRefresher(
+    batch = get_case_schedule_instance_batch()
+    if batch:
+        existing_instances = batch.get_instances(CaseTimedScheduleInstance, case.case_id, schedule.schedule_id)
+    else:
+        existing_instances = get_case_timed_schedule_instances_for_schedule(case.case_id, schedule)
+
+    refresher = CaseTimedScheduleInstanceRefresher(
         case,
         action_definition,
         rule,
         schedule,
         action_definition.recipients,
-        get_case_timed_schedule_instances_for_schedule(case.case_id, schedule),
+        existing_instances,
         start_date=start_date
-    ).refresh()
+    )
+    if batch:
+        batch.add_changes(CaseTimedScheduleInstance, case.case_id, schedule.schedule_id, *refresher.get_changes())
+    else:
+        refresher.refresh()
+
+
+def delete_case_schedule_instances_for_schedule_id(cls, case_id, schedule_id):
+    """
+    Deletes the case's instances of the schedule, or adds them to the
+    deletions of the current CaseScheduleInstanceBatch if there is one
+    """
+    batch = get_case_schedule_instance_batch()
+    if batch:
+        batch.delete_instances(cls, case_id, schedule_id)
+    elif cls is CaseAlertScheduleInstance:
+        get_case_alert_schedule_instances_for_schedule_id(case_id, schedule_id).delete()
+    elif cls is CaseTimedScheduleInstance:
+        get_case_timed_schedule_instances_for_schedule_id(case_id, schedule_id).delete()
+    else:
+        raise TypeError("Expected CaseAlertScheduleInstance or CaseTimedScheduleInstance")
 
 
 def _handle_schedule_instance(instance, save_function):
@@ -447,6 +573,8 @@ def _handle_schedule_instance(instance, save_function):
         save_function(instance)
         return True
 
+    # The instance was queued from an out-of-date entry in the due index
+    update_due_index([instance])
     return False
 
 
@@ -460,6 +588,7 @@ def handle_alert_schedule_instance(schedule_instance_id):
         try:
             instance = get_alert_schedule_instance(schedule_instance_id)
         except AlertScheduleInstance.DoesNotExist:
+            remove_from_due_index(AlertScheduleInstance, [(schedule_instance_id, None)])
             return
 
         if _handle_schedule_instance(instance, save_alert_schedule_instance):
@@ -472,6 +601,7 @@ def handle_timed_schedule_instance(schedule_instance_id):
         try:
             instance = get_timed_schedule_instance(schedule_instance_id)
         except TimedScheduleInstance.DoesNotExist:
+            remove_from_due_index(TimedScheduleInstance, [(schedule_instance_id, None)])
             return
 
         if _handle_schedule_instance(instance, save_timed_schedule_instance):
@@ -486,6 +616,7 @@ def handle_case_alert_schedule_instance(case_id, schedule_instance_id):
         try:
             instance = get_case_schedule_instance(CaseAlertScheduleInstance, case_id, schedule_instance_id)
         except CaseAlertScheduleInstance.DoesNotExist:
+            remove_from_due_index(CaseAlertScheduleInstance, [(schedule_instance_id, case_id)])
             return
 
         _handle_schedule_instance(instance, save_case_schedule_instance)
@@ -499,6 +630,7 @@ def handle_case_timed_schedule_instance(case_id, schedule_instance_id):
         try:
             instance = get_case_schedule_instance(CaseTimedScheduleInstance, case_id, schedule_instance_id)
         except CaseTimedScheduleInstance.DoesNotExist:
+            remove_from_due_index(CaseTimedScheduleInstance, [(schedule_instance_id, case_id)])
             return
 
         _handle_schedule_instance(instance, save_case_schedule_instance)
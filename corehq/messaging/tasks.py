@@ -5,7 +5,10 @@ from corehq.form_processor.exceptions import CaseNotFound
 from corehq.form_processor.interfaces.dbaccessors import CaseAccessors
 from corehq.form_processor.models import CommCareCaseSQL
 from corehq.form_processor.utils import should_use_sql_backend
-from corehq.messaging.scheduling.tasks import delete_schedule_instances_for_cases
+from corehq.messaging.scheduling.tasks import (
+    case_schedule_instance_batch,
+    delete_schedule_instances_for_cases,
+)
 from corehq.messaging.scheduling.util import utcnow
 from corehq.messaging.util import MessagingRuleProgressHelper, use_phone_entries
 from corehq.sql_db.util import (
@@ -48,11 +51,15 @@ def sync_case_for_messaging_rule(self, domain, case_id, rule_id):
 
 @no_result_task(serializer='pickle', queue=settings.CELERY_REMINDER_CASE_UPDATE_QUEUE, acks_late=True)
 def sync_case_chunk_for_messaging_rule(domain, case_id_chunk, rule_id):
-    for case_id in case_id_chunk:
-        try:
-            with CriticalSection([get_sync_key(case_id)], timeout=5 * 60):
-                _sync_case_for_messaging_rule(domain, case_id, rule_id)
-        except Exception:
+    # Sort the keys so that tasks locking overlapping chunks can't deadlock
+    sync_keys = sorted(get_sync_key(case_id) for case_id in case_id_chunk)
+    try:
+        with CriticalSection(sync_keys, timeout=5 * 60):
+            _sync_case_chunk_for_messaging_rule(domain, case_id_chunk, rule_id)
+    except Exception:
+        # The schedule instances of the chunk are saved together at the end,
+        # so fall back to syncing each case on its own, with retries
+        for case_id in case_id_chunk:
             sync_case_for_messaging_rule.delay(domain, case_id, rule_id)
 
 
@@ -106,6 +113,23 @@ def _sync_case_for_messaging_rule(domain, case_id, rule_id):
         MessagingRuleProgressHelper(rule_id).increment_current_case_count()
 
 
+def _sync_case_chunk_for_messaging_rule(domain, case_id_chunk, rule_id):
+    case_load_counter("messaging_rule_sync", domain)(len(case_id_chunk))
+    cases = CaseAccessors(domain).get_cases(list(case_id_chunk))
+    missing_case_ids = list(set(case_id_chunk) - {case.case_id for case in cases})
+    if missing_case_ids:
+        sms_tasks.delete_phone_numbers_for_owners(missing_case_ids)
+        delete_schedule_instances_for_cases(domain, missing_case_ids)
+
+    rule = _get_cached_rule(domain, rule_id)
+    if rule and cases:
+        now = utcnow()
+        with case_schedule_instance_batch([case.case_id for case in cases]):
+            for case in cases:
+                rule.run_rule(case, now)
+        MessagingRuleProgressHelper(rule_id).increment_current_case_count(count=len(cases))
+
+
 def initiate_messaging_rule_run(rule):
     if not rule.active:
         return
@@ -100,8 +100,17 @@ class Dhis2EntityRepeater(CaseRepeater, Dhis2Instance):
 
     @memoized
     def payload_doc(self, repeat_record):
+        form = self._get_prefetched_payload_doc(repeat_record)
+        if form is not None:
+            return form
         return FormAccessors(repeat_record.domain).get_form(repeat_record.payload_id)
 
+    def get_payload_docs(self, repeat_records):
+        # The payload is the form that updated the case, not the case
+        form_ids = list({r.payload_id for r in repeat_records})
+        forms = FormAccessors(self.domain).get_forms(form_ids)
+        return {form.form_id: form for form in forms}
+
     @property
     def form_class_name(self):
         return self.__class__.__name__
@@ -165,10 +174,6 @@ class Dhis2Repeater(FormRepeater, Dhis2Instance):
     def __hash__(self):
         return hash(self.get_id)
 
-    @memoized
-    def payload_doc(self, repeat_record):
-        return FormAccessors(repeat_record.domain).get_form(repeat_record.payload_id)
-
     @property
     def form_class_name(self):
         """
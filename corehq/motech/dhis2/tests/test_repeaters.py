@@ -13,7 +13,7 @@ from nose.tools import assert_equal, assert_true
 
 from corehq.motech.dhis2.const import DHIS2_MAX_VERSION
 from corehq.motech.dhis2.exceptions import Dhis2Exception
-from corehq.motech.dhis2.repeaters import Dhis2Repeater
+from corehq.motech.dhis2.repeaters import Dhis2EntityRepeater, Dhis2Repeater
 from corehq.motech.requests import Requests
 
 dhis2_version = "2.32.2"
@@ -229,3 +229,19 @@ class SlowApiVersionTest(TestCase):
 
             self.assertEqual(self.repeater.get_api_version(), bigly_api_version)
             mock_notify.assert_called()
+
+
+class Dhis2EntityRepeaterPayloadDocsTests(SimpleTestCase):
+
+    def test_get_payload_docs_fetches_forms(self):
+        repeater = Dhis2EntityRepeater(domain=domain_name)
+        form = Mock(form_id='abc123')
+        repeat_record = Mock(payload_id='abc123')
+        with patch('corehq.motech.dhis2.repeaters.FormAccessors') as form_accessors, \
+                patch('corehq.motech.repeaters.models.CaseAccessors') as case_accessors:
+            form_accessors.return_value.get_forms.return_value = [form]
+            payload_docs = repeater.get_payload_docs([repeat_record])
+
+        self.assertEqual(payload_docs, {'abc123': form})
+        form_accessors.return_value.get_forms.assert_called_once_with(['abc123'])
+        case_accessors.assert_not_called()
@@ -4,6 +4,13 @@ MAX_RETRY_WAIT = timedelta(days=7)
 MIN_RETRY_WAIT = timedelta(minutes=60)
 CHECK_REPEATERS_INTERVAL = timedelta(minutes=5)
 CHECK_REPEATERS_KEY = 'check-repeaters-key'
+# Number of records of the same repeater that are queued as one task
+REPEAT_RECORD_BATCH_SIZE = 100
+# Number of concurrent requests for a batch of repeat records
+REPEAT_RECORD_BATCH_CONCURRENCY = 4
+# When all the concurrent requests for a batch fail, the rest of the batch
+# is postponed by this long
+ENDPOINT_BACKOFF = timedelta(minutes=30)
 
 RECORD_PENDING_STATE = 'PENDING'
 RECORD_SUCCESS_STATE = 'SUCCESS'
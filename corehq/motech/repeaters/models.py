@@ -41,9 +41,11 @@ associates it with the payload using the payload's ID. The
 ``RepeatRecord.next_check`` property is set to ``datetime.utcnow()``.
 
 Next we jump to *tasks.py*. The ``check_repeaters()`` function will run
-every ``CHECK_REPEATERS_INTERVAL`` (currently set to 5 minutes). Each
-``RepeatRecord`` due to be processed will be added to the
-``CELERY_REPEAT_RECORD_QUEUE``.
+every ``CHECK_REPEATERS_INTERVAL`` (currently set to 5 minutes). The
+``RepeatRecord`` instances due to be processed will be grouped by
+repeater, and added to the ``CELERY_REPEAT_RECORD_QUEUE`` in batches.
+The records in a batch are sent a few at a time, reusing keep-alive
+connections to the repeater's destination.
 
 When it is pulled off the queue and processed, if its repeater is paused
 it will be postponed. If its repeater is deleted it will be deleted. And
@@ -191,6 +193,9 @@ class Repeater(QuickCachedDocumentMixin, Document):
     payload_generator_classes = ()
 
     _has_config = False
+    # Set by prefetch_payloads()
+    _prefetched_payload_docs = None
+    _prefetched_payloads = None
 
     def __str__(self):
         return f'{self.__class__.__name__}: {self.name}'
@@ -243,8 +248,42 @@ class Repeater(QuickCachedDocumentMixin, Document):
     def payload_doc(self, repeat_record):
         raise NotImplementedError
 
+    def get_payload_docs(self, repeat_records):
+        """
+        Returns a dict of the payload docs of ``repeat_records`` by
+        payload ID. Missing docs are left out.
+
+        Repeaters that can fetch their payload docs in bulk override
+        this. By default nothing is prefetched, and payload docs are
+        fetched one at a time by ``payload_doc()``.
+        """
+        return {}
+
+    def prefetch_payloads(self, repeat_records):
+        """
+        Fetch the payload docs of ``repeat_records`` and generate their
+        payloads in bulk, so that forwarding the records does not look
+        them up one at a time.
+        """
+        payload_docs = self.get_payload_docs(repeat_records)
+        self._prefetched_payload_docs = payload_docs
+        records = [r for r in repeat_records if r.payload_id in payload_docs]
+        try:
+            payloads = self.generator.get_payloads(records, [payload_docs[r.payload_id] for r in records])
+        except Exception:
+            # Leave it to each record to fail when it is forwarded
+            return
+        self._prefetched_payloads = {r._id: payload for r, payload in zip(records, payloads)}
+
+    def _get_prefetched_payload_doc(self, repeat_record):
+        if self._prefetched_payload_docs:
+            return self._prefetched_payload_docs.get(repeat_record.payload_id)
+        return None
+
     @memoized
     def get_payload(self, repeat_record):
+        if self._prefetched_payloads and repeat_record._id in self._prefetched_payloads:
+            return self._prefetched_payloads[repeat_record._id]
         return self.generator.get_payload(repeat_record, self.payload_doc(repeat_record))
 
     def get_attempt_info(self, repeat_record):
@@ -468,8 +507,16 @@ class FormRepeater(Repeater):
 
     @memoized
     def payload_doc(self, repeat_record):
+        form = self._get_prefetched_payload_doc(repeat_record)
+        if form is not None:
+            return form
         return FormAccessors(repeat_record.domain).get_form(repeat_record.payload_id)
 
+    def get_payload_docs(self, repeat_records):
+        form_ids = list({r.payload_id for r in repeat_records})
+        forms = FormAccessors(self.domain).get_forms(form_ids)
+        return {form.form_id: form for form in forms}
+
     @property
     def form_class_name(self):
         """
@@ -534,8 +581,16 @@ class CaseRepeater(Repeater):
 
     @memoized
     def payload_doc(self, repeat_record):
+        case = self._get_prefetched_payload_doc(repeat_record)
+        if case is not None:
+            return case
         return CaseAccessors(repeat_record.domain).get_case(repeat_record.payload_id)
 
+    def get_payload_docs(self, repeat_records):
+        case_ids = list({r.payload_id for r in repeat_records})
+        cases = CaseAccessors(self.domain).get_cases(case_ids)
+        return {case.case_id: case for case in cases}
+
     @property
     def form_class_name(self):
         """
@@ -712,13 +767,21 @@ class RepeatRecord(Document):
             )]
         return self
 
+    # Set by the repeater setter, to share a Repeater between records
+    _repeater = None
+
     @property
-    @memoized
     def repeater(self):
-        try:
-            return Repeater.get(self.repeater_id)
-        except ResourceNotFound:
-            return None
+        if self._repeater is None:
+            try:
+                self._repeater = Repeater.get(self.repeater_id)
+            except ResourceNotFound:
+                return None
+        return self._repeater
+
+    @repeater.setter
+    def repeater(self, repeater):
+        self._repeater = repeater
 
     @property
     def url(self):
@@ -899,6 +962,15 @@ class RepeatRecord(Document):
     def attempt_forward_now(self):
         from corehq.motech.repeaters.tasks import process_repeat_record
 
+        if self.lock_for_forwarding():
+            process_repeat_record.delay(self)
+
+    def lock_for_forwarding(self):
+        """
+        Mark this record as being processed, if it is due
+
+        :returns: True if the record should be queued to be forwarded
+        """
         def is_ready():
             return self.next_check < datetime.utcnow()
 
@@ -906,7 +978,7 @@ class RepeatRecord(Document):
             return self.succeeded or self.cancelled or self.next_check is None
 
         if already_processed() or not is_ready():
-            return
+            return False
 
         # Set the next check to happen an arbitrarily long time from now so
         # if something goes horribly wrong with the delayed task it will not
@@ -920,8 +992,8 @@ class RepeatRecord(Document):
             # Another process beat us to the punch. This takes advantage
             # of Couch DB's optimistic locking, which prevents a process
             # with stale data from overwriting the work of another.
-            return
-        process_repeat_record.delay(self)
+            return False
+        return True
 
     def requeue(self):
         self.cancelled = False
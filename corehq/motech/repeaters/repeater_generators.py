@@ -54,6 +54,19 @@ class BasePayloadGenerator(object):
     def get_payload(self, repeat_record, payload_doc):
         raise NotImplementedError()
 
+    def get_payloads(self, repeat_records, payload_docs):
+        """
+        Returns a list of payloads for ``repeat_records`` and their
+        corresponding ``payload_docs``.
+
+        Override this if payloads can be generated more efficiently
+        together than one at a time.
+        """
+        return [
+            self.get_payload(repeat_record, payload_doc)
+            for repeat_record, payload_doc in zip(repeat_records, payload_docs)
+        ]
+
     def get_headers(self):
         return {'Content-Type': self.content_type}
 
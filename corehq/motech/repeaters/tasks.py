@@ -1,11 +1,16 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from django.conf import settings
+from django.db import connections
 
 from celery.schedules import crontab
 from celery.task import periodic_task, task
 from celery.utils.log import get_task_logger
+from couchdbkit.exceptions import ResourceConflict
 
+from dimagi.utils.chunked import chunked
 from dimagi.utils.couch import get_redis_lock
 from dimagi.utils.couch.undo import DELETED_SUFFIX
 
@@ -16,18 +21,23 @@ from corehq.motech.models import RequestLog
 from corehq.motech.repeaters.const import (
     CHECK_REPEATERS_INTERVAL,
     CHECK_REPEATERS_KEY,
+    ENDPOINT_BACKOFF,
     RECORD_FAILURE_STATE,
     RECORD_PENDING_STATE,
+    REPEAT_RECORD_BATCH_CONCURRENCY,
+    REPEAT_RECORD_BATCH_SIZE,
 )
 from corehq.motech.repeaters.dbaccessors import (
     get_overdue_repeat_record_count,
     iterate_repeat_records,
 )
+from corehq.motech.requests import pooled_connections
 from corehq.privileges import DATA_FORWARDING, ZAPIER_INTEGRATION
 from corehq.util.metrics import (
     make_buckets_from_timedeltas,
     metrics_counter,
     metrics_gauge_task,
+    metrics_histogram,
     metrics_histogram_timer,
 )
 from corehq.util.metrics.const import MPM_MAX
@@ -79,6 +89,9 @@ def check_repeaters():
         metrics_counter("commcare.repeaters.check.locked_out")
         return
 
+    # Records are queued in batches per repeater, so that the records
+    # for the same destination can share connections
+    batches = defaultdict(list)
     try:
         with metrics_histogram_timer(
             "commcare.repeaters.check.processing",
@@ -91,7 +104,13 @@ def check_repeaters():
                 ):
                     break
                 metrics_counter("commcare.repeaters.check.attempt_forward")
-                record.attempt_forward_now()
+                _record_queue_age(record)
+                if not record.lock_for_forwarding():
+                    continue
+                batch = batches[record.repeater_id]
+                batch.append(record)
+                if len(batch) >= REPEAT_RECORD_BATCH_SIZE:
+                    process_repeat_records.delay(batches.pop(record.repeater_id))
             else:
                 iterating_time = datetime.utcnow() - start
                 _soft_assert(
@@ -99,11 +118,102 @@ def check_repeaters():
                     f"It took {iterating_time} to iterate repeat records."
                 )
     finally:
+        for batch in batches.values():
+            process_repeat_records.delay(batch)
         check_repeater_lock.release()
 
 
+def _record_queue_age(repeat_record):
+    if repeat_record.next_check is None:
+        return
+    queue_age = datetime.utcnow() - repeat_record.next_check
+    metrics_histogram(
+        "commcare.repeaters.queue_age", queue_age.total_seconds(),
+        bucket_tag='age', buckets=_check_repeaters_buckets, bucket_unit='s',
+        tags={
+            'domain': repeat_record.domain,
+            'repeater_type': repeat_record.repeater_type,
+        },
+    )
+
+
 @task(serializer='pickle', queue=settings.CELERY_REPEAT_RECORD_QUEUE)
 def process_repeat_record(repeat_record):
+    _process_repeat_record(repeat_record)
+
+
+@task(serializer='pickle', queue=settings.CELERY_REPEAT_RECORD_QUEUE)
+def process_repeat_records(repeat_records):
+    """
+    Forward a batch of repeat records of the same repeater.
+
+    Payloads are fetched and generated for the whole batch up front.
+    Records are then sent ``REPEAT_RECORD_BATCH_CONCURRENCY`` at a time
+    over pooled keep-alive connections. If all the records sent at the
+    same time fail, the destination is assumed to be down, and the rest
+    of the batch is postponed by ``ENDPOINT_BACKOFF``.
+    """
+    if not repeat_records:
+        return
+    metrics_counter("commcare.repeaters.process_batch.records", len(repeat_records), tags={
+        'domain': repeat_records[0].domain,
+        'repeater_type': repeat_records[0].repeater_type,
+    })
+    _prefetch_payloads(repeat_records)
+    with ThreadPoolExecutor(max_workers=REPEAT_RECORD_BATCH_CONCURRENCY) as executor:
+        _process_repeat_record_chunks(repeat_records, REPEAT_RECORD_BATCH_CONCURRENCY, executor.map)
+
+
+def _prefetch_payloads(repeat_records):
+    repeater = repeat_records[0].repeater
+    if repeater is None or repeater.paused:
+        return
+    records = [r for r in repeat_records if r.repeater_id == repeater._id]
+    for record in records:
+        record.repeater = repeater
+    try:
+        repeater.prefetch_payloads(records)
+    except Exception:
+        # Payloads will be fetched one at a time
+        logging.exception('Failed to prefetch payloads for repeater: {}'.format(repeater._id))
+
+
+def _process_repeat_record_chunks(repeat_records, chunk_size, map_):
+    chunks = chunked(repeat_records, chunk_size, list)
+    for chunk in chunks:
+        tries = [record.overall_tries for record in chunk]
+        list(map_(_process_repeat_record_in_thread, chunk))
+        # Records that were not sent, e.g. because their repeater is
+        # paused, say nothing about the endpoint
+        sent = [record for record, tries_ in zip(chunk, tries) if record.overall_tries > tries_]
+        if sent and all(record.state == RECORD_FAILURE_STATE for record in sent):
+            for remaining in chunks:
+                _postpone_repeat_records(remaining, ENDPOINT_BACKOFF)
+            break
+
+
+def _process_repeat_record_in_thread(repeat_record):
+    try:
+        with pooled_connections():
+            _process_repeat_record(repeat_record)
+    finally:
+        _close_thread_connections()
+
+
+def _close_thread_connections():
+    # Worker threads open their own DB connections
+    connections.close_all()
+
+
+def _postpone_repeat_records(repeat_records, duration):
+    for repeat_record in repeat_records:
+        try:
+            repeat_record.postpone_by(duration)
+        except ResourceConflict:
+            pass
+
+
+def _process_repeat_record(repeat_record):
 
     # A RepeatRecord should ideally never get into this state, as the
     # domain_has_privilege check is also triggered in the create_repeat_records
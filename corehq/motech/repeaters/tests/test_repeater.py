@@ -36,8 +36,11 @@ from corehq.form_processor.tests.utils import (
 )
 from corehq.motech.models import ConnectionSettings
 from corehq.motech.repeaters.const import (
+    ENDPOINT_BACKOFF,
     MAX_RETRY_WAIT,
     MIN_RETRY_WAIT,
+    RECORD_FAILURE_STATE,
+    RECORD_PENDING_STATE,
     RECORD_SUCCESS_STATE,
 )
 from corehq.motech.repeaters.dbaccessors import (
@@ -60,6 +63,7 @@ from corehq.motech.repeaters.repeater_generators import (
     RegisterGenerator,
 )
 from corehq.motech.repeaters.tasks import (
+    _process_repeat_record_chunks,
     check_repeaters,
     process_repeat_record,
 )
@@ -85,9 +89,37 @@ XFORM_XML_TEMPLATE = """<?xml version='1.0' ?>
 """
 
 
+class SynchronousExecutor(object):
+    """
+    Processes repeat records in the test's thread, where test data is
+    visible to the DB connection
+    """
+
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def map(self, fn, *iterables):
+        return map(fn, *iterables)
+
+
 class BaseRepeaterTest(TestCase, DomainSubscriptionMixin):
     domain = 'base-domain'
 
+    def setUp(self):
+        super().setUp()
+        for patcher in [
+            patch('corehq.motech.repeaters.tasks.ThreadPoolExecutor', SynchronousExecutor),
+            patch('corehq.motech.repeaters.tasks._close_thread_connections'),
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
     @classmethod
     def setUpClass(cls):
         super().setUpClass()
@@ -333,7 +365,7 @@ class RepeaterTest(BaseRepeaterTest):
     def test_process_repeat_record_locking(self):
         self.assertEqual(len(self.repeat_records()), 2)
 
-        with patch('corehq.motech.repeaters.tasks.process_repeat_record') as mock_process:
+        with patch('corehq.motech.repeaters.tasks.process_repeat_records') as mock_process:
             check_repeaters()
             self.assertEqual(mock_process.delay.call_count, 0)
 
@@ -342,9 +374,16 @@ class RepeaterTest(BaseRepeaterTest):
             record.next_check = datetime.utcnow()
             record.save()
 
-        with patch('corehq.motech.repeaters.tasks.process_repeat_record') as mock_process:
+        with patch('corehq.motech.repeaters.tasks.process_repeat_records') as mock_process:
             check_repeaters()
-            self.assertEqual(mock_process.delay.call_count, 2)
+            batched_records = [
+                record
+                for call in mock_process.delay.call_args_list
+                for record in call[0][0]
+            ]
+            self.assertEqual(len(batched_records), 2)
+            for call in mock_process.delay.call_args_list:
+                self.assertEqual(len({record.repeater_id for record in call[0][0]}), 1)
 
     @run_with_all_backends
     def test_automatic_cancel_repeat_record(self):
@@ -359,6 +398,39 @@ class RepeaterTest(BaseRepeaterTest):
         self.assertNotEqual(None, repeat_record.next_check)
 
 
+@patch('corehq.motech.repeaters.tasks._postpone_repeat_records')
+class ProcessRepeatRecordChunksTest(SimpleTestCase):
+
+    def _process(self, records, sends, result_state):
+        def process_record(record):
+            if sends:
+                record.overall_tries += 1
+            record.state = result_state
+
+        with patch('corehq.motech.repeaters.tasks._process_repeat_record_in_thread',
+                   side_effect=process_record):
+            _process_repeat_record_chunks(records, 2, map)
+
+    def _get_records(self, state):
+        return [Mock(overall_tries=1, state=state) for __ in range(4)]
+
+    def test_failed_sends_back_off(self, postpone):
+        records = self._get_records(RECORD_PENDING_STATE)
+        self._process(records, sends=True, result_state=RECORD_FAILURE_STATE)
+        postpone.assert_called_once_with(records[2:], ENDPOINT_BACKOFF)
+
+    def test_successful_sends(self, postpone):
+        records = self._get_records(RECORD_PENDING_STATE)
+        self._process(records, sends=True, result_state=RECORD_SUCCESS_STATE)
+        postpone.assert_not_called()
+
+    def test_records_not_sent(self, postpone):
+        # e.g. the repeater is paused, and the records failed before
+        records = self._get_records(RECORD_FAILURE_STATE)
+        self._process(records, sends=False, result_state=RECORD_FAILURE_STATE)
+        postpone.assert_not_called()
+
+
 class FormPayloadGeneratorTest(BaseRepeaterTest, TestXmlMixin):
     domain = "form-payload"
 
@@ -509,6 +581,24 @@ class CaseRepeaterTest(BaseRepeaterTest, TestXmlMixin):
         self.assertXmlHasXpath(close_payload, '//*[local-name()="case"]')
         self.assertXmlHasXpath(close_payload, '//*[local-name()="close"]')
 
+    @run_with_all_backends
+    def test_prefetch_payloads(self):
+        CaseFactory(self.domain).post_case_blocks([
+            CaseBlock.deprecated_init(case_id=case_id, create=True, case_type="planet").as_xml()
+            for case_id in ["a_case_id", "b_case_id"]
+        ])
+        repeat_records = self.repeat_records(self.domain).all()
+        self.assertEqual(len(repeat_records), 2)
+        expected = {r.payload_id: Repeater.get(self.repeater._id).get_payload(r) for r in repeat_records}
+
+        repeater = Repeater.get(self.repeater._id)
+        repeater.prefetch_payloads(repeat_records)
+        with patch.object(CaseAccessors, 'get_case') as get_case:
+            for record in repeat_records:
+                self.assertEqual(repeater.get_payload(record), expected[record.payload_id])
+                self.assertEqual(repeater.payload_doc(record).case_id, record.payload_id)
+            get_case.assert_not_called()
+
     @run_with_all_backends
     def test_excluded_case_types_are_not_forwarded(self):
         self.repeater.white_listed_case_types = ['planet']
@@ -1,10 +1,13 @@
 import logging
+import threading
+from contextlib import contextmanager
 from functools import wraps
 from typing import Callable, Optional
 
 from django.conf import settings
 
 import attr
+from requests.adapters import HTTPAdapter
 from requests.structures import CaseInsensitiveDict
 
 from dimagi.utils.logging import notify_exception
@@ -114,7 +117,7 @@ class Requests(object):
         self._session = None
 
     def __enter__(self):
-        self._session = self.auth_manager.get_session()
+        self._session = get_session(self.auth_manager)
         return self
 
     def __exit__(self, *args):
@@ -130,7 +133,7 @@ class Requests(object):
             response = self._session.request(method, *args, **kwargs)
         else:
             # Mimics the behaviour of requests.api.request()
-            with self.auth_manager.get_session() as session:
+            with get_session(self.auth_manager) as session:
                 response = session.request(method, *args, **kwargs)
         if raise_for_status:
             response.raise_for_status()
@@ -189,6 +192,57 @@ class Requests(object):
         )
 
 
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    An HTTPAdapter whose connection pools outlive the sessions it is
+    mounted on.
+    """
+
+    def close(self):
+        # Session.close() closes its adapters. Keep the pools open so
+        # that the next session can reuse their keep-alive connections.
+        pass
+
+
+_pooled_adapter = None
+_pooled_adapter_lock = threading.Lock()
+_pooling = threading.local()
+
+
+def _get_pooled_adapter():
+    global _pooled_adapter
+    with _pooled_adapter_lock:
+        if _pooled_adapter is None:
+            _pooled_adapter = PooledHTTPAdapter(pool_connections=50, pool_maxsize=10)
+    return _pooled_adapter
+
+
+@contextmanager
+def pooled_connections():
+    """
+    Reuse keep-alive connections for requests sent in this thread while
+    in this context.
+
+    Connections are pooled per host, and shared by all threads that use
+    pooled connections.
+    """
+    previous = getattr(_pooling, 'enabled', False)
+    _pooling.enabled = True
+    try:
+        yield
+    finally:
+        _pooling.enabled = previous
+
+
+def get_session(auth_manager):
+    session = auth_manager.get_session()
+    if getattr(_pooling, 'enabled', False):
+        adapter = _get_pooled_adapter()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+    return session
+
+
 def get_basic_requests(domain_name, base_url, username, password, **kwargs):
     """
     Returns a Requests instance with basic auth.
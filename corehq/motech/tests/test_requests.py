@@ -11,7 +11,12 @@ from mock import patch
 from corehq.motech.auth import AuthManager, BasicAuthManager, DigestAuthManager
 from corehq.motech.const import OAUTH2_PWD, REQUEST_TIMEOUT
 from corehq.motech.models import ConnectionSettings
-from corehq.motech.requests import get_basic_requests
+from corehq.motech.requests import (
+    PooledHTTPAdapter,
+    get_basic_requests,
+    get_session,
+    pooled_connections,
+)
 
 BASE_URL = 'http://dhis2.example.org/2.3.4/'
 USERNAME = 'admin'
@@ -123,6 +128,22 @@ class SessionTests(SimpleTestCase):
         self.assertEqual(self.close_mock.call_count, 2)
 
 
+class PooledConnectionsTests(SimpleTestCase):
+
+    def test_pooled_connections(self):
+        auth_manager = BasicAuthManager(USERNAME, PASSWORD)
+        with pooled_connections():
+            with get_session(auth_manager) as session:
+                adapter = session.get_adapter(BASE_URL)
+            with get_session(auth_manager) as session:
+                self.assertIs(session.get_adapter(BASE_URL), adapter)
+        self.assertIsInstance(adapter, PooledHTTPAdapter)
+
+    def test_not_pooled(self):
+        with get_session(BasicAuthManager(USERNAME, PASSWORD)) as session:
+            self.assertNotIsInstance(session.get_adapter(BASE_URL), PooledHTTPAdapter)
+
+
 class NotifyErrorTests(SimpleTestCase):
 
     def setUp(self):
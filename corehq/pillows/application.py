@@ -9,7 +9,8 @@ from corehq.pillows.mappings.app_mapping import APP_INDEX_INFO
 from corehq.util.doc_processor.couch import CouchDocumentProvider
 from pillowtop.checkpoints.manager import get_checkpoint_for_elasticsearch_pillow
 from pillowtop.pillow.interface import ConstructedPillow
-from pillowtop.processors import ElasticProcessor
+from pillowtop.const import DEFAULT_PROCESSOR_CHUNK_SIZE
+from pillowtop.processors.elastic import BulkElasticProcessor
 from pillowtop.reindexer.reindexer import ResumableBulkElasticPillowReindexer, ReindexerFactory
 
 
@@ -21,7 +22,8 @@ def transform_app_for_es(doc_dict):
 
 
 def get_app_to_elasticsearch_pillow(pillow_id='ApplicationToElasticsearchPillow', num_processes=1,
-                                    process_num=0, **kwargs):
+                                    process_num=0, processor_chunk_size=DEFAULT_PROCESSOR_CHUNK_SIZE,
+                                    **kwargs):
     """App pillow
 
     Processors:
@@ -29,7 +31,7 @@ def get_app_to_elasticsearch_pillow(pillow_id='ApplicationToElasticsearchPillow'
     """
     assert pillow_id == 'ApplicationToElasticsearchPillow', 'Pillow ID is not allowed to change'
     checkpoint = get_checkpoint_for_elasticsearch_pillow(pillow_id, APP_INDEX_INFO, [topics.APP])
-    app_processor = ElasticProcessor(
+    app_processor = BulkElasticProcessor(
         elasticsearch=get_es_new(),
         index_info=APP_INDEX_INFO,
         doc_prep_fn=transform_app_for_es
@@ -45,6 +47,7 @@ def get_app_to_elasticsearch_pillow(pillow_id='ApplicationToElasticsearchPillow'
         change_processed_event_handler=KafkaCheckpointEventHandler(
             checkpoint=checkpoint, checkpoint_frequency=100, change_feed=change_feed
         ),
+        processor_chunk_size=processor_chunk_size,
     )
 
 
@@ -9,7 +9,8 @@ from corehq.util.doc_processor.couch import CouchDocumentProvider
 from django_countries.data import COUNTRIES
 from pillowtop.checkpoints.manager import get_checkpoint_for_elasticsearch_pillow
 from pillowtop.pillow.interface import ConstructedPillow
-from pillowtop.processors import ElasticProcessor
+from pillowtop.const import DEFAULT_PROCESSOR_CHUNK_SIZE
+from pillowtop.processors.elastic import BulkElasticProcessor
 from pillowtop.reindexer.reindexer import ResumableBulkElasticPillowReindexer, ReindexerFactory
 
 
@@ -27,15 +28,16 @@ def transform_domain_for_elasticsearch(doc_dict):
 
 
 def get_domain_kafka_to_elasticsearch_pillow(pillow_id='KafkaDomainPillow', num_processes=1,
-                                             process_num=0, **kwargs):
+                                             process_num=0, processor_chunk_size=DEFAULT_PROCESSOR_CHUNK_SIZE,
+                                             **kwargs):
     """Domain pillow to replicate documents to ES
 
     Processors:
-      - :py:class:`pillowtop.processors.elastic.ElasticProcessor`
+      - :py:class:`pillowtop.processors.elastic.BulkElasticProcessor`
     """
     assert pillow_id == 'KafkaDomainPillow', 'Pillow ID is not allowed to change'
     checkpoint = get_checkpoint_for_elasticsearch_pillow(pillow_id, DOMAIN_INDEX_INFO, [topics.DOMAIN])
-    domain_processor = ElasticProcessor(
+    domain_processor = BulkElasticProcessor(
         elasticsearch=get_es_new(),
         index_info=DOMAIN_INDEX_INFO,
         doc_prep_fn=transform_domain_for_elasticsearch,
@@ -51,6 +53,7 @@ def get_domain_kafka_to_elasticsearch_pillow(pillow_id='KafkaDomainPillow', num_
         change_processed_event_handler=KafkaCheckpointEventHandler(
             checkpoint=checkpoint, checkpoint_frequency=100, change_feed=change_feed
         ),
+        processor_chunk_size=processor_chunk_size,
     )
 
 
@@ -17,7 +17,7 @@ from corehq.util.doc_processor.couch import CouchDocumentProvider
 from pillowtop.checkpoints.manager import get_checkpoint_for_elasticsearch_pillow
 from pillowtop.const import DEFAULT_PROCESSOR_CHUNK_SIZE
 from pillowtop.pillow.interface import ConstructedPillow
-from pillowtop.processors import ElasticProcessor, PillowProcessor
+from pillowtop.processors import PillowProcessor
 from pillowtop.processors.elastic import BulkElasticProcessor
 from pillowtop.reindexer.reindexer import ResumableBulkElasticPillowReindexer
 from pillowtop.reindexer.reindexer import ReindexerFactory
@@ -115,20 +115,17 @@ def get_user_es_processor():
     )
 
 
-def get_user_pillow_old(pillow_id='UserPillow', num_processes=1, process_num=0, **kwargs):
+def get_user_pillow_old(pillow_id='UserPillow', num_processes=1, process_num=0,
+                        processor_chunk_size=DEFAULT_PROCESSOR_CHUNK_SIZE, **kwargs):
     """Processes users and sends them to ES.
 
     Processors:
-      - :py:func:`pillowtop.processors.elastic.ElasticProcessor`
+      - :py:func:`pillowtop.processors.elastic.BulkElasticProcessor`
     """
     # todo; To remove after full rollout of https://github.com/dimagi/commcare-hq/pull/21329/
     assert pillow_id == 'UserPillow', 'Pillow ID is not allowed to change'
     checkpoint = get_checkpoint_for_elasticsearch_pillow(pillow_id, USER_INDEX_INFO, topics.USER_TOPICS)
-    user_processor = ElasticProcessor(
-        elasticsearch=get_es_new(),
-        index_info=USER_INDEX_INFO,
-        doc_prep_fn=transform_user_for_elasticsearch,
-    )
+    user_processor = get_user_es_processor()
     change_feed = KafkaChangeFeed(
         topics=topics.USER_TOPICS, client_id='users-to-es', num_processes=num_processes, process_num=process_num
     )
@@ -140,6 +137,7 @@ def get_user_pillow_old(pillow_id='UserPillow', num_processes=1, process_num=0,
         change_processed_event_handler=KafkaCheckpointEventHandler(
             checkpoint=checkpoint, checkpoint_frequency=100, change_feed=change_feed
         ),
+        processor_chunk_size=processor_chunk_size,
     )
 
 
@@ -54,14 +54,18 @@ class SlidingWindowRateCounter(AbstractRateCounter):
         )
 
     def get(self, scope, timestamp=None):
-        if timestamp is None:
-            timestamp = time.time()
-        counts = [
-            self.grain_counter.get(scope, timestamp - i * self.grain_duration,
-                                   key_is_active=(i is 0))
+        return get_rates([(self, scope)], timestamp=timestamp)[0]
+
+    def _get_grain_keys(self, scope, timestamp):
+        return [
+            (self.grain_counter.counter,
+             self.grain_counter._cache_key(scope, timestamp - i * self.grain_duration),
+             i == 0)
             for i in range(self.grains_per_window + 1)
         ]
-        earliest_grain_count = counts.pop()
+
+    def _get_rate_from_grain_counts(self, counts, timestamp):
+        *counts, earliest_grain_count = counts
         # This is the percentage of the way through the current grain we are
         progress_in_current_grain = (timestamp % self.grain_duration) / self.grain_duration
         # This is the count from the percentage of the earliest grain that should count
@@ -71,13 +75,40 @@ class SlidingWindowRateCounter(AbstractRateCounter):
     def increment(self, scope, delta=1, timestamp=None):
         # this intentionally doesn't return because this is the active grain count,
         # not the total that would be returned by get
-        self.grain_counter.increment(scope, delta, timestamp=timestamp)
+        increment_rates([(self, scope)], delta, timestamp=timestamp)
 
     def increment_and_get(self, scope, delta=1, timestamp=None):
         self.increment(scope, delta, timestamp=timestamp)
         return self.get(scope, timestamp=timestamp)
 
 
+def get_rates(counters_and_scopes, timestamp=None):
+    """Get the current rate for each ``(sliding window rate counter, scope)`` pair
+
+    The grains of all counters are read together: the ones that are not
+    memoized in local memory are fetched from redis in one request.
+    """
+    if timestamp is None:
+        timestamp = time.time()
+    grain_keys = [counter._get_grain_keys(scope, timestamp) for counter, scope in counters_and_scopes]
+    counts = iter(CounterCache.get_many([key for keys in grain_keys for key in keys]))
+    return [
+        counter._get_rate_from_grain_counts([next(counts) for key in keys], timestamp)
+        for (counter, scope), keys in zip(counters_and_scopes, grain_keys)
+    ]
+
+
+def increment_rates(counters_and_scopes, delta=1, timestamp=None):
+    """Increment the active grain of each ``(sliding window rate counter, scope)`` pair
+
+    All counters are incremented in one redis pipeline.
+    """
+    CounterCache.incr_many([
+        (counter.grain_counter.counter, counter.grain_counter._cache_key(scope, timestamp=timestamp), delta)
+        for counter, scope in counters_and_scopes
+    ])
+
+
 class FixedWindowRateCounter(AbstractRateCounter):
     def __init__(self, key, window_duration, window_offset=0, keep_windows=1,
                  memoize_timeout=15.0, _CounterCache=None):
@@ -141,10 +172,68 @@ class CounterCache(object):
         :param key_is_active: Whether you believe the key is being actively updated
             If not, then use the longer timeout for local memory cache as well.
         """
-        local_timeout = self.memoized_timeout if key_is_active else self.timeout
+        local_timeout = self._get_local_timeout(key_is_active)
         value = self.local_cache.get(key, default=None)
         if value is None:
             value = self.shared_cache.get(key, default=0)
             self.local_cache.set(key, value, timeout=local_timeout)
         assert value is not None
         return value
+
+    def _get_local_timeout(self, key_is_active):
+        return self.memoized_timeout if key_is_active else self.timeout
+
+    @staticmethod
+    def _get_caches(counter_caches):
+        caches = {(counter_cache.local_cache, counter_cache.shared_cache) for counter_cache in counter_caches}
+        assert len(caches) == 1, "counters must share the same local and shared caches"
+        return caches.pop()
+
+    @classmethod
+    def get_many(cls, counter_keys):
+        """Like ``get`` for several keys with at most one request to the shared cache
+
+        :param counter_keys: list of ``(counter_cache, key, key_is_active)``
+        :returns: list of values in the same order
+        """
+        if not counter_keys:
+            return []
+        local_cache, shared_cache = cls._get_caches(cache for cache, key, active in counter_keys)
+        values = local_cache.get_many([key for cache, key, active in counter_keys])
+        missing = {key for cache, key, active in counter_keys if values.get(key) is None}
+        if missing:
+            shared_values = shared_cache.get_many(list(missing))
+            for counter_cache, key, key_is_active in counter_keys:
+                if key in missing:
+                    values[key] = shared_values.get(key, 0)
+                    local_cache.set(key, values[key], timeout=counter_cache._get_local_timeout(key_is_active))
+        return [values[key] for cache, key, active in counter_keys]
+
+    @classmethod
+    def incr_many(cls, counter_deltas):
+        """Like ``incr`` for several keys in one redis pipeline
+
+        Keys are only given an expiry when they are created, which takes a
+        second request at most once per key.
+
+        :param counter_deltas: list of ``(counter_cache, key, delta)``
+        :returns: list of the incremented values in the same order
+        """
+        if not counter_deltas:
+            return []
+        local_cache, shared_cache = cls._get_caches(cache for cache, key, delta in counter_deltas)
+        client = shared_cache.client.get_client(write=True)
+        redis_keys = [shared_cache.make_key(key) for cache, key, delta in counter_deltas]
+        pipe = client.pipeline(transaction=False)
+        for redis_key, (counter_cache, key, delta) in zip(redis_keys, counter_deltas):
+            pipe.incr(redis_key, delta)
+        values = pipe.execute()
+
+        pipe = client.pipeline(transaction=False)
+        for redis_key, value, (counter_cache, key, delta) in zip(redis_keys, values, counter_deltas):
+            if value == delta:
+                pipe.expire(redis_key, counter_cache.timeout)
+            local_cache.set(key, value, timeout=counter_cache.memoized_timeout)
+        if len(pipe):
+            pipe.execute()
+        return values
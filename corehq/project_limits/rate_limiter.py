@@ -12,6 +12,10 @@ from corehq.project_limits.rate_counter.presets import (
     second_rate_counter,
     week_rate_counter,
 )
+from corehq.project_limits.rate_counter.rate_counter import (
+    get_rates,
+    increment_rates,
+)
 from corehq.util.quickcache import quickcache
 
 
@@ -46,12 +50,24 @@ class RateLimiter(object):
         return scope
 
     def report_usage(self, scope=None, delta=1):
+        report_usage_many([(self, scope)], delta=delta)
+
+    def _get_counter_scopes(self, scope):
+        """
+        Get list of (rate counter, counter scope, rate limit) as applies to scope
+        """
         scope = self.get_normalized_scope(scope)
-        for rate_counter, limit in self.get_rate_limits(*scope):
-            rate_counter.increment((self.feature_key,) + scope, delta=delta)
+        return [
+            (rate_counter, (self.feature_key,) + scope, limit)
+            for rate_counter, limit in self.get_rate_limits(*scope)
+        ]
 
-    def allow_usage(self, scope=None):
-        return all(current_rate < limit
+    def allow_usage(self, scope=None, delta=1):
+        """
+        Check that ``delta`` more events are allowed, i.e. that each rate
+        would still be under its limit before the last of them
+        """
+        return all(current_rate + delta - 1 < limit
                    for rate_counter_key, current_rate, limit in self.iter_rates(scope))
 
     def iter_rates(self, scope=None):
@@ -64,18 +80,21 @@ class RateLimiter(object):
             ...
 
         """
-        scope = self.get_normalized_scope(scope)
+        counter_scopes = self._get_counter_scopes(scope)
+        current_rates = get_rates([
+            (rate_counter, counter_scope) for rate_counter, counter_scope, limit in counter_scopes
+        ])
         return (
-            (rate_counter.key, rate_counter.get((self.feature_key,) + scope), limit)
-            for rate_counter, limit in self.get_rate_limits(*scope)
+            (rate_counter.key, current_rate, limit)
+            for (rate_counter, counter_scope, limit), current_rate in zip(counter_scopes, current_rates)
         )
 
-    def wait(self, scope, timeout, windows_not_to_wait_on=('hour', 'day', 'week')):
+    def wait(self, scope, timeout, windows_not_to_wait_on=('hour', 'day', 'week'), delta=1):
         start = time.time()
         target_end = start + timeout
         delay = 0
         larger_windows_allow = all(
-            current_rate < limit
+            current_rate + delta - 1 < limit
             for rate_counter_key, current_rate, limit in self.iter_rates(scope)
             if rate_counter_key in windows_not_to_wait_on
         )
@@ -84,7 +103,7 @@ class RateLimiter(object):
             return False
 
         while True:
-            if self.allow_usage(scope):
+            if self.allow_usage(scope, delta=delta):
                 return True
             # add a random amount between 100ms and 500ms to the last delay
             # so that the delays get a bit longer each time
@@ -99,6 +118,40 @@ class RateLimiter(object):
                 time.sleep(delay)
 
 
+def allow_usage_many(rate_limiters_and_scopes):
+    """
+    Check that every rate limiter allows usage for its scope
+
+    The rates for all rate limiters are read with at most one redis round trip.
+    """
+    counter_scopes = [
+        counter_scope
+        for rate_limiter, scope in rate_limiters_and_scopes
+        for counter_scope in rate_limiter._get_counter_scopes(scope)
+    ]
+    current_rates = get_rates([
+        (rate_counter, counter_scope) for rate_counter, counter_scope, limit in counter_scopes
+    ])
+    return all(
+        current_rate < limit
+        for (rate_counter, counter_scope, limit), current_rate in zip(counter_scopes, current_rates)
+    )
+
+
+def report_usage_many(rate_limiters_and_scopes, delta=1):
+    """
+    Report usage to several rate limiters in a single redis round trip
+
+    >>> report_usage_many([(my_feature_rate_limiter, 'my_domain'), (global_rate_limiter, None)])
+
+    """
+    increment_rates([
+        (rate_counter, counter_scope)
+        for rate_limiter, scope in rate_limiters_and_scopes
+        for rate_counter, counter_scope, limit in rate_limiter._get_counter_scopes(scope)
+    ], delta=delta)
+
+
 @quickcache(['domain'], memoize_timeout=60, timeout=60 * 60)
 def get_n_users_for_rate_limiting(domain):
     """
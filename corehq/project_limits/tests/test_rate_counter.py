@@ -3,7 +3,7 @@ from datetime import timedelta
 import testil
 
 from corehq.project_limits.rate_counter.rate_counter import CounterCache, \
-    FixedWindowRateCounter, SlidingWindowRateCounter
+    FixedWindowRateCounter, SlidingWindowRateCounter, get_rates, increment_rates
 
 
 _CounterCache = CounterCache
@@ -74,3 +74,23 @@ def test_sliding_window_with_grains_rate_counter():
 
     float_eq(counter.increment_and_get('alice', timestamp=timestamp + 1 * DAYS), 4)
     float_eq(counter.get('alice', timestamp=timestamp + 2 * DAYS), 3 * 6. / 7 + 1)
+
+
+def test_get_and_increment_many_rates():
+    timestamp = (1000 * 7 * DAYS + 6 * DAYS)
+    week_counter = _SlidingWindowRateCounter('test-many-week', 7 * DAYS, grains_per_window=7)
+    day_counter = _SlidingWindowRateCounter('test-many-day', DAYS, grains_per_window=4)
+    counter_cache = week_counter.grain_counter.counter
+    counter_cache.shared_cache.clear()
+
+    counters_and_scopes = [(week_counter, 'alice'), (day_counter, 'alice'), (week_counter, 'bob')]
+    increment_rates(counters_and_scopes, timestamp=timestamp)
+    increment_rates(counters_and_scopes[:2], delta=2, timestamp=timestamp)
+
+    testil.eq(get_rates(counters_and_scopes, timestamp=timestamp), [3, 3, 1])
+    testil.eq([counter.get(scope, timestamp=timestamp) for counter, scope in counters_and_scopes], [3, 3, 1])
+
+    # values that aren't memoized locally are read from the shared cache
+    counter_cache.local_cache.clear()
+    testil.eq(get_rates(counters_and_scopes, timestamp=timestamp), [3, 3, 1])
+    testil.eq(get_rates(counters_and_scopes, timestamp=timestamp + 8 * DAYS), [0, 0, 0])
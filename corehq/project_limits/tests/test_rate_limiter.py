@@ -1,7 +1,7 @@
 from mock import mock
 
 from corehq.project_limits.rate_limiter import RateLimiter, RateDefinition, \
-    PerUserRateDefinition
+    PerUserRateDefinition, allow_usage_many, report_usage_many
 
 
 @mock.patch('corehq.project_limits.rate_limiter.get_n_users_for_rate_limiting', lambda domain: 10)
@@ -16,3 +16,22 @@ def test_rate_limit_interface():
     if my_feature_rate_limiter.allow_usage('my_domain'):
         # ...do stuff...
         my_feature_rate_limiter.report_usage('my_domain')
+
+
+@mock.patch('corehq.project_limits.rate_limiter.get_n_users_for_rate_limiting', lambda domain: 10)
+def test_multiple_rate_limiters_interface():
+    per_user_rate_def = PerUserRateDefinition(RateDefinition(per_day=13000), RateDefinition(per_second=10))
+    domain_rate_limiter = RateLimiter('my_feature', per_user_rate_def.get_rate_limits)
+    global_rate_limiter = RateLimiter('global_my_feature', RateDefinition(per_minute=100).get_rate_limits,
+                                      scope_length=0)
+    rate_limiters_and_scopes = [(domain_rate_limiter, 'my_domain'), (global_rate_limiter, None)]
+    if allow_usage_many(rate_limiters_and_scopes):
+        report_usage_many(rate_limiters_and_scopes)
+
+
+def test_allow_usage_delta():
+    rate_limiter = RateLimiter('my_feature', RateDefinition(per_minute=10).get_rate_limits, scope_length=0)
+    with mock.patch.object(rate_limiter, 'iter_rates', lambda scope: [('minute', 5, 10)]):
+        assert rate_limiter.allow_usage()
+        assert rate_limiter.allow_usage(delta=5)
+        assert not rate_limiter.allow_usage(delta=6)
@@ -968,6 +968,15 @@ API_BLACKLIST = StaticToggle(
     "immediately.",
 )
 
+BATCH_FORM_SUBMISSIONS = StaticToggle(
+    'batch_form_submissions',
+    'Allow devices to submit many forms in one request',
+    TAG_SOLUTIONS_LIMITED,
+    [NAMESPACE_DOMAIN],
+    description="Enables the receiver's batch endpoint, which processes several forms in one "
+                "request and keeps the cases they touch cached and locked for the whole batch.",
+)
+
 FORM_SUBMISSION_BLACKLIST = StaticToggle(
     'FORM_SUBMISSION_BLACKLIST',
     ("Blacklist form submissions from a domain that spams us"),
@@ -1374,6 +1383,13 @@ PAGINATED_EXPORTS = StaticToggle(
     [NAMESPACE_DOMAIN]
 )
 
+STREAMING_EXCEL_EXPORTS = StaticToggle(
+    'streaming_excel_exports',
+    'Write Excel exports row by row to disk to keep memory use flat for very large exports',
+    TAG_SOLUTIONS_LIMITED,
+    [NAMESPACE_DOMAIN]
+)
+
 INCREMENTAL_EXPORTS = StaticToggle(
     'incremental_exports',
     'Allows sending of incremental CSV exports to a particular endpoint',